@@ -0,0 +1,41 @@
+"""Benchmarks of the time series clustering."""
+
+from ds_lib_template.clustering.dtw import DTWKMedoids
+from ds_lib_template.clustering.features import extract_features
+from ds_lib_template.clustering.kmeans import FeatureKMeans
+
+from .data import N_SERIES, make_panel
+
+
+class FeatureClustering:
+    params = (N_SERIES,)
+    param_names = ["n_series"]
+
+    def setup(self, n_series):
+        self.values = make_panel(n_series).to_numpy()
+
+    def time_extract_features(self, n_series):
+        extract_features(self.values, sp=52)
+
+    def time_feature_kmeans(self, n_series):
+        FeatureKMeans(n_clusters=min(8, n_series), sp=52, random_state=0).fit(
+            self.values
+        )
+
+    def peakmem_feature_kmeans(self, n_series):
+        FeatureKMeans(n_clusters=min(8, n_series), sp=52, random_state=0).fit(
+            self.values
+        )
+
+
+class DTWClustering:
+    params = ([100, 1000], [5, 20])
+    param_names = ["n_series", "window"]
+
+    def setup(self, n_series, window):
+        self.values = make_panel(n_series).to_numpy()
+
+    def time_dtw_kmedoids(self, n_series, window):
+        DTWKMedoids(n_clusters=8, window=window, max_iter=3, random_state=0).fit(
+            self.values
+        )
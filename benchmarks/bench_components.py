@@ -0,0 +1,27 @@
+"""Benchmarks of the component splitters."""
+
+from ds_lib_template.forecasting.components.dummy import DummyForecastingComponent
+from ds_lib_template.forecasting.model.naive import NaiveForecaster
+
+from .data import make_time_series
+
+
+class DummyComponents:
+    params = ([0, 10, 100, 1000], [7, 52, 365])
+    param_names = ["n_drivers", "fh"]
+
+    def setup(self, n_drivers, fh):
+        model = NaiveForecaster().fit(y=make_time_series(10**3))
+        drivers = [f"driver_{i}" for i in range(n_drivers)] or None
+        self.component_splitter = DummyForecastingComponent(
+            model=model, drivers=drivers, holidays=["holiday"]
+        )
+
+    def time_predict(self, n_drivers, fh):
+        self.component_splitter.predict(fh=fh)
+
+    def time_predict_trend(self, n_drivers, fh):
+        self.component_splitter.predict(fh=fh, components=["trend"])
+
+    def peakmem_predict(self, n_drivers, fh):
+        self.component_splitter.predict(fh=fh)
@@ -0,0 +1,20 @@
+"""Benchmarks of the single pass data profiling."""
+
+from ds_lib_template.eda.profile import profile
+
+from .data import SIZES, make_series
+
+
+class Profile:
+    params = (SIZES,)
+    param_names = ["size"]
+    timeout = 600
+
+    def setup(self, size):
+        self.data = make_series(size)
+
+    def time_profile(self, size):
+        profile(self.data, lags=(1, 7))
+
+    def peakmem_profile(self, size):
+        profile(self.data, lags=(1, 7))
@@ -0,0 +1,56 @@
+"""Benchmarks of the naive forecasters."""
+
+from ds_lib_template.forecasting.model.naive import NaiveForecaster
+from ds_lib_template.forecasting.model.panel import PanelNaiveForecaster
+
+from .data import N_SERIES, SIZES, make_panel, make_time_series
+
+STRATEGIES = ["last", "mean", "seasonal_last", "drift"]
+FH = 28
+
+
+class NaiveFit:
+    params = (STRATEGIES, SIZES)
+    param_names = ["strategy", "size"]
+    timeout = 600
+
+    def setup(self, strategy, size):
+        self.data = make_time_series(size)
+        self.forecaster = NaiveForecaster(strategy=strategy, sp=7)
+
+    def time_fit(self, strategy, size):
+        self.forecaster.fit(y=self.data)
+
+    def peakmem_fit(self, strategy, size):
+        self.forecaster.fit(y=self.data)
+
+
+class NaivePredict:
+    params = (STRATEGIES, [7, FH, 365])
+    param_names = ["strategy", "fh"]
+
+    def setup(self, strategy, fh):
+        data = make_time_series(10**3)
+        self.forecaster = NaiveForecaster(strategy=strategy, sp=7).fit(y=data)
+
+    def time_predict(self, strategy, fh):
+        self.forecaster.predict(fh=fh)
+
+
+class PanelNaiveFitPredict:
+    params = (["last", "drift"], N_SERIES)
+    param_names = ["strategy", "n_series"]
+    timeout = 600
+
+    def setup(self, strategy, n_series):
+        self.data = make_panel(n_series)
+        self.forecaster = PanelNaiveForecaster(strategy=strategy).fit(y=self.data)
+
+    def time_fit(self, strategy, n_series):
+        PanelNaiveForecaster(strategy=strategy).fit(y=self.data)
+
+    def time_predict(self, strategy, n_series):
+        self.forecaster.predict(fh=FH)
+
+    def peakmem_fit_predict(self, strategy, n_series):
+        PanelNaiveForecaster(strategy=strategy).fit(y=self.data).predict(fh=FH)
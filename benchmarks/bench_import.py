@@ -0,0 +1,15 @@
+"""Benchmarks of the import (cold start) time of the package."""
+
+
+class Import:
+    def timeraw_import_package(self):
+        return "import ds_lib_template"
+
+    def timeraw_import_subpackages(self):
+        return "import ds_lib_template.outlier, ds_lib_template.forecasting"
+
+    def timeraw_import_detector(self):
+        return "from ds_lib_template.outlier import MADOutlierDetection"
+
+    def timeraw_import_forecaster(self):
+        return "from ds_lib_template.forecasting import NaiveForecaster"
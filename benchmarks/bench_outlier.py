@@ -0,0 +1,65 @@
+"""Benchmarks of the outlier detection workflow."""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from ds_lib_template.outlier.deviation import (
+    MADOutlierDetection,
+    StdDevOutlierDetection,
+)
+from ds_lib_template.utils import kernels
+
+from .data import SIZES, make_series
+
+DETECTORS = {
+    "StdDevOutlierDetection": StdDevOutlierDetection,
+    "MADOutlierDetection": MADOutlierDetection,
+}
+# The detectors log (at warning level) every statistic they compute on demand
+LOGGER = logging.getLogger(__name__)
+LOGGER.setLevel(logging.ERROR)
+
+
+class DeviationWorkflow:
+    params = (list(DETECTORS), SIZES)
+    param_names = ["detector", "size"]
+    timeout = 600
+
+    def setup(self, detector, size):
+        self.data = make_series(size)
+        self.detector_class = DETECTORS[detector]
+
+    def time_run_workflow(self, detector, size):
+        self.detector_class(data=self.data, logger=LOGGER).run_workflow()
+
+    def peakmem_run_workflow(self, detector, size):
+        self.detector_class(data=self.data, logger=LOGGER).run_workflow()
+
+
+class KernelBackends:
+    params = (list(DETECTORS), kernels.available_backends(), SIZES)
+    param_names = ["detector", "backend", "size"]
+    timeout = 600
+
+    def setup(self, detector, backend, size):
+        self.values = make_series(size).to_numpy()
+        self.detector_class = DETECTORS[detector]
+        self.backend = backend
+        # Compiles the kernels outside of the timings
+        with kernels.use_backend(backend):
+            self.detector_class(data=self.values[:100], logger=LOGGER).run_workflow()
+
+    def time_run_workflow(self, detector, backend, size):
+        with kernels.use_backend(self.backend):
+            self.detector_class(data=self.values, logger=LOGGER).run_workflow()
+
+    def time_run_workflow_threads(self, detector, backend, size):
+        # The compiled kernels release the GIL, so the threads run in parallel
+        chunks = np.array_split(self.values, 4)
+        with kernels.use_backend(self.backend), ThreadPoolExecutor(4) as executor:
+            list(executor.map(self._run_workflow, chunks))
+
+    def _run_workflow(self, values):
+        self.detector_class(data=values, logger=LOGGER).run_workflow()
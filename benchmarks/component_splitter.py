@@ -0,0 +1,98 @@
+"""Wall time benchmark of the dummy component splitter.
+
+Compares the current `DummyForecastingComponent` (all the components built as
+one NumPy block) with the previous implementation, which built every component
+separately with pandas and concatenated them.
+
+Usage
+-----
+python benchmarks/component_splitter.py --drivers 10 100 500 --fh 52
+"""
+
+import argparse
+import timeit
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from ds_lib_template.forecasting.components.base import BaseComponentSplitter
+from ds_lib_template.forecasting.components.dummy import DummyForecastingComponent
+from ds_lib_template.forecasting.model.naive import NaiveForecaster
+
+
+class PandasDummyForecastingComponent(BaseComponentSplitter):
+    """Previous implementation of `DummyForecastingComponent`."""
+
+    def _predict(self, fh=None, X=None):
+        self.y_pred = self.model.predict(fh=fh, X=X)
+        return self.y_pred
+
+    def _set_component_trend(self):
+        self.component_trend = self.y_pred / self.total_components
+        self.component_trend.name = "trend"
+
+    def _set_component_seasonality(self):
+        self.component_seasonality = self.y_pred / self.total_components
+        self.component_seasonality.name = "seasonality"
+
+    def _set_component_drivers(self):
+        if self.drivers is not None:
+            shape = (len(self.y_pred), len(self.drivers))
+            self.component_drivers = pd.DataFrame(
+                np.ones(shape), columns=self.drivers, index=self.y_pred.index
+            )
+            component = self.y_pred / self.total_components
+            self.component_drivers.loc[:] = pd.concat(
+                [component] * self.component_drivers.columns.size, axis=1
+            )
+        else:
+            self.component_drivers = pd.DataFrame(index=self.y_pred.index)
+
+    def _set_component_holidays(self):
+        if self.holidays is not None:
+            shape = (len(self.y_pred), len(self.holidays))
+            self.component_holidays = pd.DataFrame(
+                np.ones(shape), columns=self.holidays, index=self.y_pred.index
+            )
+            component = self.y_pred / self.total_components
+            self.component_holidays.loc[:] = pd.concat(
+                [component] * self.component_holidays.columns.size, axis=1
+            )
+        else:
+            self.component_holidays = pd.DataFrame(index=self.y_pred.index)
+
+    def _set_component_others(self):
+        self.component_others = pd.DataFrame(index=self.y_pred.index)
+
+
+def _time(component_splitter: BaseComponentSplitter, fh: int, repeat: int) -> float:
+    """Best time (in ms) of `predict` over `repeat` runs."""
+    timer = timeit.Timer(lambda: component_splitter.predict(fh=fh))
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e3
+
+
+def main(n_drivers: List[int], fh: int, repeat: int):
+    index = pd.period_range(start="2015-01-01", periods=200, freq="W")
+    data = pd.Series(np.random.default_rng(42).normal(size=len(index)), index=index)
+    model = NaiveForecaster().fit(y=data)
+
+    print(f"{'drivers':>8} {'pandas (ms)':>12} {'numpy (ms)':>11} {'speedup':>8}")
+    for n in n_drivers:
+        drivers = [f"driver_{i}" for i in range(n)]
+        holidays = [f"holiday_{i}" for i in range(max(1, n // 10))]
+        kwargs = dict(model=model, drivers=drivers, holidays=holidays)
+
+        before = _time(PandasDummyForecastingComponent(**kwargs), fh, repeat)
+        after = _time(DummyForecastingComponent(**kwargs), fh, repeat)
+        print(f"{n:>8} {before:>12.2f} {after:>11.2f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--drivers", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--fh", type=int, default=52)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    main(args.drivers, args.fh, args.repeat)
@@ -0,0 +1,49 @@
+"""Synthetic data generators shared by the benchmarks.
+
+The scales exercised by default stop at 1e7 points / 1e5 series so that a full
+run fits on a laptop. Set `DS_LIB_BENCHMARK_LARGE=1` to also run the 1e8
+points scale (about 800 MB per copy of the data).
+"""
+
+import os
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+LARGE = os.environ.get("DS_LIB_BENCHMARK_LARGE", "0") == "1"
+
+# Number of points of a single series
+SIZES = [10**3, 10**5, 10**7] + ([10**8] if LARGE else [])
+# Number of series of a panel (of `PANEL_LENGTH` points each)
+N_SERIES = [1, 100, 10**4, 10**5]
+PANEL_LENGTH = 104
+
+
+@lru_cache(maxsize=4)
+def make_series(size: int, outlier_fraction: float = 0.001, seed: int = 42):
+    """Normal noise with a fraction of large outliers, as a float Series."""
+    rng = np.random.default_rng(seed)
+    values = rng.normal(size=size)
+    outliers = rng.random(size) < outlier_fraction
+    values[outliers] += rng.choice([-20.0, 20.0], size=outliers.sum())
+    return pd.Series(values)
+
+
+@lru_cache(maxsize=4)
+def make_time_series(size: int, freq: str = "D", seed: int = 42) -> pd.Series:
+    """Random walk with a period index."""
+    rng = np.random.default_rng(seed)
+    index = pd.period_range(start="2000-01-01", periods=size, freq=freq)
+    return pd.Series(rng.normal(size=size).cumsum(), index=index)
+
+
+@lru_cache(maxsize=4)
+def make_panel(
+    n_series: int, length: int = PANEL_LENGTH, freq: str = "W", seed: int = 42
+) -> pd.DataFrame:
+    """Random walks (one column per series) with a period index."""
+    rng = np.random.default_rng(seed)
+    index = pd.period_range(start="2000-01-01", periods=length, freq=freq)
+    values = rng.normal(size=(length, n_series)).cumsum(axis=0)
+    return pd.DataFrame(values, index=index).add_prefix("series_")
@@ -0,0 +1,103 @@
+"""Peak memory benchmark for the outlier correction modes.
+
+Every mode runs in a fresh interpreter so that peak RSS measurements do not
+leak between runs. Two numbers are reported:
+
+- the growth of the peak RSS over the peak RSS right after the data was
+  created, i.e. the working memory of the whole `run_workflow` (including the
+  statistics passes, which are the same for all modes)
+- the peak memory traced (`tracemalloc`) while detecting and correcting the
+  outliers, i.e. the part of the workflow the modes differ in
+
+Usage
+-----
+python benchmarks/outlier_memory.py --size 10000000
+"""
+
+import argparse
+import resource
+import subprocess
+import sys
+import tracemalloc
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+from ds_lib_template.outlier.deviation import (
+    MADOutlierDetection,
+    StdDevOutlierDetection,
+)
+
+DETECTORS = {
+    "StdDevOutlierDetection": StdDevOutlierDetection,
+    "MADOutlierDetection": MADOutlierDetection,
+}
+MODES = ["copy", "out", "inplace"]
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident set size of the current process (Linux reports KB)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _run(detector: str, mode: str, size: int) -> Tuple[float, float]:
+    """Runs a single benchmark and returns the peak RSS growth of the workflow
+    and the traced peak of the detection / correction stages (MB)."""
+    rng = np.random.default_rng(42)
+    data = pd.Series(rng.normal(size=size))
+    out = np.empty(size) if mode == "out" else None
+    baseline = _peak_rss_mb()
+
+    outlier_detector = DETECTORS[detector](data=data)
+    outlier_detector.set_limits()
+
+    tracemalloc.start()
+    if mode == "copy":
+        outlier_detector.detect_outliers().correct_outliers()
+    else:
+        outlier_detector.detect_outliers(packed=True)
+        outlier_detector.correct_outliers(inplace=mode == "inplace", out=out)
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return _peak_rss_mb() - baseline, traced_peak / 1024**2
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=10_000_000)
+    parser.add_argument("--detector", choices=list(DETECTORS), default=None)
+    parser.add_argument("--mode", choices=MODES, default=None)
+    args = parser.parse_args()
+
+    if args.detector is not None and args.mode is not None:
+        print(*_run(args.detector, args.mode, args.size))
+        return
+
+    data_mb = args.size * 8 / 1024**2
+    print(f"Series of {args.size:,} float64 points ({data_mb:,.0f} MB)")
+    print(
+        f"{'detector':<25}{'mode':<10}{'peak RSS growth (MB)':>22}"
+        f"{'correction peak (MB)':>22}"
+    )
+    for detector in DETECTORS:
+        for mode in MODES:
+            result = subprocess.run(
+                [
+                    sys.executable,
+                    __file__,
+                    f"--size={args.size}",
+                    f"--detector={detector}",
+                    f"--mode={mode}",
+                ],
+                capture_output=True,
+                check=True,
+                text=True,
+            )
+            growth, peak = map(float, result.stdout.split())
+            print(f"{detector:<25}{mode:<10}{growth:>22,.1f}{peak:>22,.1f}")
+
+
+if __name__ == "__main__":
+    main()
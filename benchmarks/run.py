@@ -0,0 +1,189 @@
+"""Runs the benchmark suite and compares results across commits.
+
+The benchmarks (`bench_*.py`) follow the asv conventions, so they can also be
+run with `asv run` (see `asv.conf.json`). This runner does not need asv: it
+runs them in the current environment and records, for every parameter
+combination,
+
+- `time_*` methods: the best wall time (seconds) over `--repeat` runs
+- `timeraw_*` methods: the best wall time (seconds) over `--repeat` runs of
+  the code they return, each in a fresh interpreter (e.g. import times)
+- `peakmem_*` methods: the peak memory (bytes) allocated during one run, as
+  traced by `tracemalloc` (NumPy and pandas allocations included)
+
+Usage
+-----
+python -m benchmarks.run --max-size 100000
+python -m benchmarks.run --bench DeviationWorkflow --output base.json
+python -m benchmarks.run --compare base.json .benchmarks/<commit>.json
+"""
+
+import argparse
+import importlib
+import inspect
+import itertools
+import json
+import platform
+import re
+import subprocess
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+MODULES = [
+    "bench_outlier",
+    "bench_forecasting",
+    "bench_components",
+    "bench_clustering",
+    "bench_eda",
+    "bench_import",
+]
+# Parameters limited by `--max-size`
+SIZE_PARAMS = ("size", "n_series")
+
+
+def _git_commit() -> str:
+    """Current commit of the repository (or "unknown")."""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _iter_benchmarks(
+    pattern: Optional[str], max_size: Optional[int]
+) -> Iterator[Tuple[str, Any, str, Tuple]]:
+    """Yields (name, class, method, params) of every benchmark to run."""
+    for module_name in MODULES:
+        module = importlib.import_module(f"benchmarks.{module_name}")
+        for class_name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module.__name__:
+                continue
+            methods = [
+                name
+                for name in dir(cls)
+                if name.startswith(("time_", "timeraw_", "peakmem_"))
+            ]
+            params = getattr(cls, "params", ())
+            names = getattr(cls, "param_names", [])
+            for values in itertools.product(*params):
+                too_large = max_size is not None and any(
+                    name in SIZE_PARAMS and value > max_size
+                    for name, value in zip(names, values)
+                )
+                if too_large:
+                    continue
+                for method in methods:
+                    label = ", ".join(map(str, values))
+                    name = f"{module_name}.{class_name}.{method}({label})"
+                    if pattern is None or re.search(pattern, name):
+                        yield name, cls, method, values
+
+
+def _run(cls: Any, method: str, params: Tuple, repeat: int) -> Dict[str, float]:
+    """Runs a single benchmark."""
+    instance = cls()
+    if hasattr(instance, "setup"):
+        instance.setup(*params)
+    function = getattr(instance, method)
+    if method.startswith("timeraw_"):
+        # Only the execution of the code is timed, not the interpreter start
+        script = (
+            "import time\n"
+            "start = time.perf_counter()\n"
+            f"exec({function(*params)!r})\n"
+            "print(time.perf_counter() - start)\n"
+        )
+        times = [
+            float(subprocess.check_output([sys.executable, "-c", script], text=True))
+            for _ in range(repeat)
+        ]
+        return {"time": min(times)}
+    if method.startswith("time_"):
+        timer = timeit.Timer(lambda: function(*params))
+        number, _ = timer.autorange()
+        best = min(timer.repeat(repeat=repeat, number=number)) / number
+        return {"time": best}
+
+    tracemalloc.start()
+    try:
+        function(*params)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"peakmem": peak}
+
+
+def _format(result: Dict[str, float]) -> str:
+    """Human readable benchmark result."""
+    if "time" in result:
+        return f"{result['time'] * 1e3:12.3f} ms"
+    return f"{result['peakmem'] / 2**20:12.2f} MB"
+
+
+def run(pattern: Optional[str], max_size: Optional[int], repeat: int, output: str):
+    """Runs the benchmarks and writes the results to a JSON file."""
+    results = {}
+    for name, cls, method, params in _iter_benchmarks(pattern, max_size):
+        results[name] = _run(cls, method, params, repeat)
+        print(f"{name:<80} {_format(results[name])}", flush=True)
+
+    report = {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "results": results,
+    }
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"Results written to {output}")
+
+
+def compare(base: str, new: str, threshold: float) -> int:
+    """Prints the ratio of the results of two runs and returns the number of
+    benchmarks which got slower / used more memory than `threshold`."""
+    with open(base) as file:
+        base_report = json.load(file)
+    with open(new) as file:
+        new_report = json.load(file)
+    print(f"{base_report['commit']} -> {new_report['commit']}")
+
+    regressions = 0
+    for name, result in new_report["results"].items():
+        if name not in base_report["results"]:
+            continue
+        ((key, value),) = result.items()
+        before = base_report["results"][name][key]
+        ratio = value / before if before else float("inf")
+        flag = ""
+        if ratio > threshold:
+            flag, regressions = "  REGRESSION", regressions + 1
+        elif ratio < 1 / threshold:
+            flag = "  improved"
+        print(f"{name:<80} {ratio:8.2f}x{flag}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--bench", help="Regular expression on benchmark names")
+    parser.add_argument("--max-size", type=int, help="Largest size / n_series to run")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Results file (default .benchmarks/<commit>)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"))
+    parser.add_argument("--threshold", type=float, default=1.1)
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare(*args.compare, threshold=args.threshold) else 0)
+    output = args.output or f".benchmarks/{_git_commit()}.json"
+    run(args.bench, args.max_size, args.repeat, output)
@@ -0,0 +1,15 @@
+"""Data Science Library Template.
+
+The subpackages, and the outlier detectors and forecasters they expose, are
+imported on first access, so importing the package is cheap and does not
+import pandas.
+"""
+
+from ds_lib_template import forecasting, outlier
+from ds_lib_template.utils.lazy import attach
+
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    submodules=["clustering", "eda", "segmentation", "utils"],
+    attributes={"forecasting": forecasting.__all__, "outlier": outlier.__all__},
+)
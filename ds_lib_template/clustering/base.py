@@ -0,0 +1,133 @@
+import os
+from abc import ABC, abstractmethod
+from typing import Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from ds_lib_template.forecasting.model.base import NotFittedError
+
+ArrayLike = Union[np.ndarray, pd.DataFrame]
+
+
+class BaseClusterer(ABC):
+    def __init__(
+        self,
+        n_clusters: int = 8,
+        batch_size: int = 1024,
+        n_jobs: int = 1,
+        random_state: Optional[int] = None,
+    ):
+        """Initializes the clustering class.
+
+        Parameters
+        ----------
+        n_clusters : int, optional
+            Number of clusters, by default 8
+        batch_size : int, optional
+            Number of series (or samples) processed at a time, which bounds the
+            memory used on top of the data, by default 1024
+        n_jobs : int, optional
+            Number of workers the batches are spread over, by default 1. Use -1
+            for the number of CPUs.
+        random_state : Optional[int], optional
+            Seed of the random number generator, by default None
+        """
+        if n_clusters < 1:
+            raise ValueError("`n_clusters` must be at least 1.")
+        self.n_clusters = n_clusters
+        self.batch_size = batch_size
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+
+        # Cluster of each series (or sample) seen by `fit`
+        self.labels_: Optional[np.ndarray] = None
+        # Sum of the distances of the series to their cluster
+        self.inertia_: Optional[float] = None
+        self._is_fitted = False
+
+    @property
+    def is_fitted(self) -> bool:
+        """Whether `fit` has been called."""
+        return self._is_fitted
+
+    def fit(self, data: ArrayLike) -> "BaseClusterer":
+        """Clusters the data. Sets the `labels_` and `inertia_` attributes.
+
+        Parameters
+        ----------
+        data : ArrayLike
+            The data to cluster (see the subclass for its layout)
+
+        Returns
+        -------
+        BaseClusterer
+            Class object for chaining
+        """
+        self._fit(data)
+        self._is_fitted = True
+        return self
+
+    @abstractmethod
+    def _fit(self, data: ArrayLike):
+        """Clusters the data. Sets the `labels_` and `inertia_` attributes."""
+
+    def predict(self, data: ArrayLike) -> np.ndarray:
+        """Assigns new data to the closest fitted cluster.
+
+        Parameters
+        ----------
+        data : ArrayLike
+            The data to assign, with the same layout as in `fit`
+
+        Returns
+        -------
+        np.ndarray
+            The cluster of each series (or sample)
+        """
+        self.check_is_fitted()
+        return self._predict(data)
+
+    @abstractmethod
+    def _predict(self, data: ArrayLike) -> np.ndarray:
+        """Assigns new data to the closest fitted cluster."""
+
+    def fit_predict(self, data: ArrayLike) -> np.ndarray:
+        """Clusters the data and returns the cluster of each series (or sample).
+
+        Parameters
+        ----------
+        data : ArrayLike
+            The data to cluster
+
+        Returns
+        -------
+        np.ndarray
+            The cluster of each series (or sample)
+        """
+        return self.fit(data).labels_
+
+    def check_is_fitted(self):
+        """Check if the clusterer has been fitted.
+
+        Raises
+        ------
+        NotFittedError
+            if the clusterer has not been fitted yet.
+        """
+        if not self.is_fitted:
+            raise NotFittedError(
+                f"This instance of {self.__class__.__name__} has not "
+                f"been fitted yet; please call `fit` first."
+            )
+
+    def _get_n_jobs(self) -> int:
+        """Number of workers to use."""
+        return self.n_jobs if self.n_jobs != -1 else os.cpu_count() or 1
+
+    def _get_batches(self, n: int):
+        """(start, stop) bounds of the batches of `n` series (or samples)."""
+        return [
+            (start, min(start + self.batch_size, n))
+            for start in range(0, n, self.batch_size)
+        ]
@@ -0,0 +1,362 @@
+"""Dynamic time warping (DTW) distances and k-medoids clustering.
+
+DTW aligns two series before comparing them, so series with the same shape
+but shifted in time are close. The distances of many pairs of series are
+computed at once, one anti-diagonal of the cost matrix at a time (the cells
+of an anti-diagonal only depend on the two previous ones), so the Python
+overhead does not depend on the number of pairs.
+
+Assigning series to medoids only computes the DTW distances which can change
+the assignment: the LB_Keogh lower bound of the distance to every medoid is
+cheap to compute, and the medoids whose bound exceeds the best distance found
+so far are skipped.
+
+References
+----------
+.. [1] Keogh & Ratanamahatana, Exact indexing of dynamic time warping,
+   Knowledge and Information Systems 7, 358-386 (2005),
+   https://doi.org/10.1007/s10115-004-0154-9
+"""
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from ds_lib_template.clustering.base import ArrayLike, BaseClusterer
+from ds_lib_template.clustering.features import _get_values
+
+
+def dtw_distance(
+    x: np.ndarray, y: np.ndarray, window: Optional[int] = None
+) -> Union[float, np.ndarray]:
+    """DTW distance (square root of the sum of the squared differences of the
+    aligned points) between pairs of series.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        A series, or a (time x pair) array of series
+    y : np.ndarray
+        A series, or a (time x pair) array of series (same number of pairs as
+        `x`, possibly of a different length)
+    window : Optional[int], optional
+        Sakoe-Chiba band: maximum shift (in periods) between aligned points,
+        by default None (any shift). It is widened to the difference of the
+        lengths of the series if needed.
+
+    Returns
+    -------
+    Union[float, np.ndarray]
+        The distance of each pair (a float for a pair of 1-D series)
+    """
+    single = np.ndim(x) == 1 and np.ndim(y) == 1
+    x = np.asarray(x, dtype=float).reshape(len(x), -1)
+    y = np.asarray(y, dtype=float).reshape(len(y), -1)
+    if x.shape[1] != y.shape[1]:
+        raise ValueError(
+            f"`x` and `y` must have the same number of series, got {x.shape[1]} "
+            f"and {y.shape[1]}."
+        )
+    n_x, n_y, n_pairs = len(x), len(y), x.shape[1]
+    window = max(n_x, n_y) if window is None else max(window, abs(n_x - n_y))
+
+    # Cumulative costs of the cells (i, d - i) of the last two anti-diagonals,
+    # indexed by i (the cells outside the matrix or the band are infinite)
+    previous = np.full((n_x + 1, n_pairs), np.inf)
+    before = np.full((n_x + 1, n_pairs), np.inf)
+    current = np.full((n_x + 1, n_pairs), np.inf)
+    before[0] = 0.0
+    for diagonal in range(2, n_x + n_y + 1):
+        low = max(1, diagonal - n_y, math.ceil((diagonal - window) / 2))
+        high = min(n_x, diagonal - 1, (diagonal + window) // 2)
+        current.fill(np.inf)
+        if low <= high:
+            i = np.arange(low, high + 1)
+            cost = (x[i - 1] - y[diagonal - i - 1]) ** 2
+            best = np.minimum(previous[i - 1], previous[i])
+            current[i] = cost + np.minimum(best, before[i - 1])
+        # The buffer of the oldest diagonal is reused for the next one
+        before, previous, current = previous, current, before
+
+    distances = np.sqrt(previous[n_x])
+    return float(distances[0]) if single else distances
+
+
+def envelope(
+    y: np.ndarray, window: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Upper and lower envelopes of series: the maximum and minimum of the
+    points within `window` periods of each point.
+
+    Parameters
+    ----------
+    y : np.ndarray
+        A (time x series) array of series
+    window : Optional[int], optional
+        Half width of the envelope, by default None (the whole series)
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        The upper and lower envelopes, with the same shape as `y`
+    """
+    y = np.asarray(y, dtype=float)
+    window = len(y) if window is None else min(window, len(y))
+    pad = [(window, window)] + [(0, 0)] * (y.ndim - 1)
+    upper = np.pad(y, pad, constant_values=-np.inf)
+    lower = np.pad(y, pad, constant_values=np.inf)
+    size = 2 * window + 1
+    return (
+        sliding_window_view(upper, size, axis=0).max(axis=-1),
+        sliding_window_view(lower, size, axis=0).min(axis=-1),
+    )
+
+
+def lb_keogh(x: np.ndarray, upper: np.ndarray, lower: np.ndarray) -> np.ndarray:
+    """LB_Keogh lower bounds of the DTW distances between series and the
+    series whose envelopes are given (computed with the same `window`).
+
+    Parameters
+    ----------
+    x : np.ndarray
+        A (time x series) array of series
+    upper : np.ndarray
+        The (time x reference) upper envelopes of the reference series
+    lower : np.ndarray
+        The (time x reference) lower envelopes of the reference series
+
+    Returns
+    -------
+    np.ndarray
+        The (series x reference) lower bounds
+    """
+    x = np.asarray(x, dtype=float)[:, :, None]
+    above = np.maximum(x - upper[:, None, :], 0.0)
+    below = np.maximum(lower[:, None, :] - x, 0.0)
+    return np.sqrt((above**2 + below**2).sum(axis=0))
+
+
+def _assign_block(
+    block: np.ndarray,
+    medoids: np.ndarray,
+    upper: np.ndarray,
+    lower: np.ndarray,
+    window: Optional[int],
+) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Closest medoid of each series of a block, its DTW distance and the
+    number of DTW distances computed. The medoids are tried by increasing
+    lower bound, and only for the series whose bound is below their best
+    distance so far."""
+    block = np.asarray(block, dtype=float)
+    if np.isnan(block).any():
+        raise ValueError("DTW can not compare series with missing values.")
+    bounds = lb_keogh(block, upper, lower)
+    order = np.argsort(bounds, axis=1)
+    rows = np.arange(block.shape[1])
+
+    labels = np.full(block.shape[1], -1)
+    distances = np.full(block.shape[1], np.inf)
+    n_computed = 0
+    for rank in range(medoids.shape[1]):
+        candidates = order[:, rank]
+        todo = rows[bounds[rows, candidates] < distances]
+        if len(todo) == 0:
+            break
+        candidate_distances = dtw_distance(
+            block[:, todo], medoids[:, candidates[todo]], window=window
+        )
+        n_computed += len(todo)
+        better = candidate_distances < distances[todo]
+        labels[todo[better]] = candidates[todo[better]]
+        distances[todo[better]] = candidate_distances[better]
+    return labels, distances, n_computed
+
+
+class DTWKMedoids(BaseClusterer):
+    def __init__(
+        self,
+        n_clusters: int = 8,
+        window: Optional[int] = None,
+        max_iter: int = 10,
+        n_candidates: int = 16,
+        n_samples: int = 256,
+        batch_size: int = 1024,
+        n_jobs: int = 1,
+        random_state: Optional[int] = None,
+    ):
+        """Initializes the DTW k-medoids clustering class. The data is wide
+        panel data: a (time x series) array or DataFrame with one column per
+        series, all of the same length and without missing values.
+
+        Parameters
+        ----------
+        n_clusters : int, optional
+            Number of clusters, by default 8
+        window : Optional[int], optional
+            Maximum shift (in periods) between aligned points, by default None
+            (any shift). Small windows make the distances and their lower
+            bounds much cheaper and tighter.
+        max_iter : int, optional
+            Maximum number of assignment / medoid update iterations, by
+            default 10
+        n_candidates : int, optional
+            Number of members of a cluster tried as its new medoid (along with
+            the current medoid) at each iteration, by default 16
+        n_samples : int, optional
+            Number of members of a cluster the candidate medoids are compared
+            to, by default 256
+        batch_size : int, optional
+            Number of series assigned to the medoids at a time, by default 1024
+        n_jobs : int, optional
+            Number of processes the batches are spread over, by default 1. Use
+            -1 for the number of CPUs.
+        random_state : Optional[int], optional
+            Seed of the random number generator, by default None
+        """
+        super().__init__(
+            n_clusters=n_clusters,
+            batch_size=batch_size,
+            n_jobs=n_jobs,
+            random_state=random_state,
+        )
+        self.window = window
+        self.max_iter = max_iter
+        self.n_candidates = n_candidates
+        self.n_samples = n_samples
+
+        # Positions of the medoid series and their (time x cluster) values
+        self.medoid_indices_: Optional[np.ndarray] = None
+        self.medoids_: Optional[np.ndarray] = None
+        # Fraction of the (series, medoid) DTW distances skipped thanks to the
+        # lower bounds in the last assignment
+        self.pruning_rate_: Optional[float] = None
+        self.n_iter_: Optional[int] = None
+
+    def _assign(
+        self, values: np.ndarray, medoids: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Closest medoid of each series and the distance to it, computed in
+        batches (across processes)."""
+        upper, lower = envelope(medoids, self.window)
+        batches = self._get_batches(values.shape[1])
+        arguments = (medoids, upper, lower, self.window)
+        n_jobs = self._get_n_jobs()
+        if n_jobs == 1:
+            results = [
+                _assign_block(values[:, start:stop], *arguments)
+                for start, stop in batches
+            ]
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                futures = [
+                    executor.submit(
+                        _assign_block, np.asarray(values[:, start:stop]), *arguments
+                    )
+                    for start, stop in batches
+                ]
+                results = [future.result() for future in futures]
+
+        n_computed = sum(r[2] for r in results)
+        self.pruning_rate_ = 1 - n_computed / (values.shape[1] * medoids.shape[1])
+        labels = np.concatenate([r[0] for r in results])
+        distances = np.concatenate([r[1] for r in results])
+        return labels, distances
+
+    def _init_medoids(self, values: np.ndarray, rng: np.random.Generator) -> List[int]:
+        """k-means++ like initialization on a sample of the series: each new
+        medoid is drawn with a probability proportional to the squared distance
+        of the series to its closest medoid."""
+        n_series = values.shape[1]
+        size = min(n_series, self.n_samples * self.n_clusters)
+        sample = np.sort(rng.choice(n_series, size, replace=False))
+        sample_values = np.asarray(values[:, sample], dtype=float)
+        if np.isnan(sample_values).any():
+            raise ValueError("DTW can not compare series with missing values.")
+
+        chosen = [rng.integers(size)]
+        closest = np.full(size, np.inf)
+        for _ in range(self.n_clusters):
+            medoid = sample_values[:, chosen[-1]][:, None]
+            distances = dtw_distance(
+                sample_values, np.repeat(medoid, size, axis=1), window=self.window
+            )
+            closest = np.minimum(closest, distances)
+            if len(chosen) == self.n_clusters:
+                break
+            weights = closest**2
+            if weights.sum() == 0:
+                # All the series are duplicates of the medoids
+                weights = np.ones(size)
+                weights[chosen] = 0.0
+            chosen.append(rng.choice(size, p=weights / weights.sum()))
+        return [int(sample[i]) for i in chosen]
+
+    def _update_medoids(
+        self, values: np.ndarray, labels: np.ndarray, rng: np.random.Generator
+    ) -> List[int]:
+        """New medoid of each cluster: the candidate (a sample of the members
+        and the current medoid) with the smallest average distance to a sample
+        of the members."""
+        medoids = []
+        for cluster, current in enumerate(self.medoid_indices_):
+            members = np.flatnonzero(labels == cluster)
+            if len(members) <= 1:
+                medoids.append(int(current))
+                continue
+            others = members[members != current]
+            size = min(self.n_candidates, len(others))
+            candidates = np.concatenate(
+                [[current], rng.choice(others, size, replace=False)]
+            )
+            size = min(self.n_samples, len(members))
+            references = np.sort(rng.choice(members, size, replace=False))
+
+            # All the (candidate, reference) pairs at once
+            pairs = np.asarray(values[:, candidates], dtype=float).repeat(size, axis=1)
+            references = np.asarray(values[:, references], dtype=float)
+            distances = dtw_distance(
+                pairs, np.tile(references, len(candidates)), window=self.window
+            ).reshape(len(candidates), size)
+            best = distances.mean(axis=1).argmin()
+            medoids.append(int(candidates[best]))
+        return medoids
+
+    def _fit(self, data: ArrayLike):
+        """Clusters the series. Sets the `medoid_indices_`, `medoids_`,
+        `labels_` and `inertia_` attributes."""
+        values, _ = _get_values(data)
+        if values.shape[1] < self.n_clusters:
+            raise ValueError(
+                f"At least {self.n_clusters} series are needed, got "
+                f"{values.shape[1]}."
+            )
+        rng = np.random.default_rng(self.random_state)
+        self.medoid_indices_ = np.array(self._init_medoids(values, rng))
+
+        for self.n_iter_ in range(1, self.max_iter + 1):
+            medoids = np.asarray(values[:, self.medoid_indices_], dtype=float)
+            labels, distances = self._assign(values, medoids)
+            new_indices = np.array(self._update_medoids(values, labels, rng))
+            if np.array_equal(new_indices, self.medoid_indices_):
+                break
+            self.medoid_indices_ = new_indices
+        else:
+            medoids = np.asarray(values[:, self.medoid_indices_], dtype=float)
+            labels, distances = self._assign(values, medoids)
+
+        self.medoids_ = medoids
+        self.labels_ = labels
+        self.inertia_ = float(distances.sum())
+
+    def _predict(self, data: ArrayLike) -> np.ndarray:
+        """Closest medoid of each series."""
+        values, _ = _get_values(data)
+        if len(values) != len(self.medoids_):
+            raise ValueError(
+                f"The series must have {len(self.medoids_)} periods, got "
+                f"{len(values)}."
+            )
+        return self._assign(values, self.medoids_)[0]
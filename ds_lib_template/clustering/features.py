@@ -0,0 +1,169 @@
+"""Vectorized feature extraction of many time series.
+
+The series are processed in batches of columns: every feature of a batch is
+computed with a handful of NumPy reductions over a (time x series) block, so
+the memory used on top of the data is bounded by the batch size. NumPy
+releases the GIL in these reductions, so the batches are spread over a pool of
+threads without copying the data to other processes.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ds_lib_template.clustering.base import ArrayLike
+
+# Features extracted by default. "seasonal_acf" (autocorrelation at the
+# seasonal lag) is added when the seasonal periodicity is known.
+FEATURES = (
+    "mean",
+    "std",
+    "min",
+    "max",
+    "skewness",
+    "kurtosis",
+    "trend",
+    "acf_1",
+    "crossing_rate",
+    "missing_rate",
+)
+
+
+def _get_values(data: ArrayLike) -> Tuple[np.ndarray, pd.Index]:
+    """Returns the (time x series) values of panel data and the series ids."""
+    if isinstance(data, pd.DataFrame):
+        return data.to_numpy(dtype=float), data.columns
+    values = np.asarray(data)
+    if values.ndim == 1:
+        values = values.reshape(-1, 1)
+    if values.ndim != 2:
+        raise ValueError(
+            f"Data must be a (time x series) array, got {values.ndim} dimensions."
+        )
+    return values, pd.RangeIndex(values.shape[1])
+
+
+def _autocorrelation(centered: np.ndarray, lag: int) -> np.ndarray:
+    """Autocorrelation of each (centered, missing values set to 0) column."""
+    if lag >= len(centered):
+        return np.full(centered.shape[1], np.nan)
+    return (centered[lag:] * centered[:-lag]).sum(axis=0) / (centered**2).sum(axis=0)
+
+
+def _batch_features(
+    block: np.ndarray, features: Sequence[str], sp: Optional[int]
+) -> np.ndarray:
+    """(series x feature) features of a (time x series) block."""
+    values = np.asarray(block, dtype=float)
+    valid = ~np.isnan(values)
+    count = valid.sum(axis=0)
+    length = len(values)
+
+    result: Dict[str, np.ndarray] = {}
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(valid, values, 0.0).sum(axis=0) / count
+        centered = np.where(valid, values - mean, 0.0)
+        m2 = (centered**2).sum(axis=0) / count
+        std = np.sqrt(m2 * count / (count - 1))
+        result["mean"] = mean
+        result["std"] = std
+        if "min" in features:
+            minimum = np.where(valid, values, np.inf).min(axis=0)
+            result["min"] = np.where(count > 0, minimum, np.nan)
+        if "max" in features:
+            maximum = np.where(valid, values, -np.inf).max(axis=0)
+            result["max"] = np.where(count > 0, maximum, np.nan)
+        if "skewness" in features:
+            result["skewness"] = (centered**3).sum(axis=0) / count / m2**1.5
+        if "kurtosis" in features:
+            result["kurtosis"] = (centered**4).sum(axis=0) / count / m2**2 - 3
+        if "trend" in features:
+            # Least squares slope over the whole series, relative to the std
+            time = np.arange(length, dtype=float)[:, None]
+            time_mean = np.where(valid, time, 0.0).sum(axis=0) / count
+            time_centered = np.where(valid, time - time_mean, 0.0)
+            covariance = (time_centered * centered).sum(axis=0)
+            slope = covariance / (time_centered**2).sum(axis=0)
+            result["trend"] = slope * (length - 1) / std
+        if "acf_1" in features:
+            result["acf_1"] = _autocorrelation(centered, 1)
+        if "seasonal_acf" in features:
+            result["seasonal_acf"] = _autocorrelation(centered, sp)
+        if "crossing_rate" in features:
+            signs = np.sign(centered)
+            crossings = (signs[1:] * signs[:-1] < 0).sum(axis=0)
+            result["crossing_rate"] = crossings / (count - 1)
+        if "missing_rate" in features:
+            result["missing_rate"] = 1 - count / length
+
+    return np.column_stack([result[name] for name in features])
+
+
+def extract_features(
+    data: ArrayLike,
+    features: Optional[Sequence[str]] = None,
+    sp: Optional[int] = None,
+    batch_size: int = 10_000,
+    n_jobs: int = 1,
+) -> pd.DataFrame:
+    """Extracts features describing the shape of many series, ignoring missing
+    values.
+
+    Parameters
+    ----------
+    data : ArrayLike
+        Wide panel data: (time x series) array (e.g. `np.memmap`) or DataFrame
+        with one column per series
+    features : Optional[Sequence[str]], optional
+        Features to extract (see `FEATURES`), by default None (all of them,
+        plus "seasonal_acf" if `sp` is provided)
+    sp : Optional[int], optional
+        Seasonal periodicity, by default None
+    batch_size : int, optional
+        Number of series processed at a time, by default 10_000
+    n_jobs : int, optional
+        Number of threads the batches are spread over, by default 1. Use -1
+        for the number of CPUs.
+
+    Returns
+    -------
+    pd.DataFrame
+        The features (columns) of each series (rows, indexed by the series ids)
+
+    Raises
+    ------
+    ValueError
+        When a feature is unknown or "seasonal_acf" is requested without `sp`
+    """
+    known: List[str] = list(FEATURES) + ["seasonal_acf"]
+    if features is None:
+        features = list(FEATURES) + (["seasonal_acf"] if sp else [])
+    unknown = [name for name in features if name not in known]
+    if unknown:
+        raise ValueError(f"Unknown features {unknown}, expected some of {known}.")
+    if "seasonal_acf" in features and not sp:
+        raise ValueError("The seasonal periodicity `sp` is needed for 'seasonal_acf'.")
+
+    values, ids = _get_values(data)
+    n_series = values.shape[1]
+    batches = [
+        (start, min(start + batch_size, n_series))
+        for start in range(0, n_series, batch_size)
+    ]
+
+    def run(bounds: Tuple[int, int]) -> np.ndarray:
+        return _batch_features(values[:, bounds[0] : bounds[1]], features, sp)
+
+    n_jobs = n_jobs if n_jobs != -1 else os.cpu_count() or 1
+    result = np.empty((n_series, len(features)))
+    if n_jobs == 1:
+        blocks = map(run, batches)
+    else:
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            blocks = list(executor.map(run, batches))
+    for (start, stop), block in zip(batches, blocks):
+        result[start:stop] = block
+    return pd.DataFrame(result, index=ids, columns=list(features))
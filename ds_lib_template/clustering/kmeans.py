@@ -0,0 +1,368 @@
+"""Mini-batch k-means, and its use to cluster many series by their features.
+
+Each step of mini-batch k-means moves the centers towards a random batch of
+samples (each center by a learning rate decreasing with the number of samples
+it has been assigned so far), so the cost of a step does not depend on the
+number of samples and large data sets converge in a few passes.
+
+References
+----------
+.. [1] Sculley, Web-Scale K-Means Clustering, WWW 2010,
+   https://doi.org/10.1145/1772690.1772862
+"""
+
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ds_lib_template.clustering.base import ArrayLike, BaseClusterer
+from ds_lib_template.clustering.features import extract_features
+
+
+def _squared_distances(samples: np.ndarray, centers: np.ndarray) -> np.ndarray:
+    """(sample x center) squared Euclidean distances."""
+    distances = (
+        (samples**2).sum(axis=1)[:, None]
+        - 2 * samples @ centers.T
+        + (centers**2).sum(axis=1)[None, :]
+    )
+    return np.maximum(distances, 0.0)
+
+
+def _as_samples(data: ArrayLike) -> np.ndarray:
+    """Returns the (sample x dimension) array of the data."""
+    values = data.to_numpy(dtype=float) if isinstance(data, pd.DataFrame) else data
+    values = np.asarray(values)
+    if values.ndim != 2:
+        raise ValueError(
+            f"Data must be a (sample x dimension) array, got {values.ndim} "
+            f"dimensions."
+        )
+    return values
+
+
+def _lloyd(
+    samples: np.ndarray, centers: np.ndarray, n_iter: int = 10
+) -> Tuple[np.ndarray, float]:
+    """A few iterations of (full batch) k-means. Returns the centers and their
+    inertia."""
+    for _ in range(n_iter):
+        labels = _squared_distances(samples, centers).argmin(axis=1)
+        counts = np.bincount(labels, minlength=len(centers))
+        assigned = counts > 0
+        sums = np.zeros_like(centers)
+        for dimension in range(samples.shape[1]):
+            sums[:, dimension] = np.bincount(
+                labels, weights=samples[:, dimension], minlength=len(centers)
+            )
+        updated = centers.copy()
+        updated[assigned] = sums[assigned] / counts[assigned, None]
+        if np.array_equal(updated, centers):
+            break
+        centers = updated
+    inertia = _squared_distances(samples, centers).min(axis=1).sum()
+    return centers, inertia
+
+
+def _check_finite(samples: np.ndarray):
+    """Raises an error if some samples have missing values."""
+    if not np.isfinite(samples).all():
+        raise ValueError("K-means can not cluster samples with missing values.")
+
+
+class MiniBatchKMeans(BaseClusterer):
+    def __init__(
+        self,
+        n_clusters: int = 8,
+        batch_size: int = 1024,
+        max_iter: int = 100,
+        max_no_improvement: int = 10,
+        tol: float = 0.0,
+        n_init: int = 3,
+        n_jobs: int = 1,
+        random_state: Optional[int] = None,
+    ):
+        """Initializes the mini-batch k-means clustering class. The data is a
+        (sample x dimension) array or DataFrame (e.g. the output of
+        `extract_features`).
+
+        Parameters
+        ----------
+        n_clusters : int, optional
+            Number of clusters, by default 8
+        batch_size : int, optional
+            Number of samples used by each step, by default 1024
+        max_iter : int, optional
+            Maximum number of passes over the data, by default 100
+        max_no_improvement : int, optional
+            Stop after this many consecutive steps without improving the
+            (smoothed) inertia of the batches, by default 10
+        tol : float, optional
+            Stop when the squared shift of the centers in a step, relative to
+            the variance of the data, is below `tol`, by default 0.0 (disabled,
+            as the shifts shrink with the number of samples seen)
+        n_init : int, optional
+            Number of k-means++ initializations (on a sample of the data), the
+            best one being kept, by default 3
+        n_jobs : int, optional
+            Number of threads used to assign the samples to the final centers,
+            by default 1. Use -1 for the number of CPUs.
+        random_state : Optional[int], optional
+            Seed of the random number generator, by default None
+        """
+        super().__init__(
+            n_clusters=n_clusters,
+            batch_size=batch_size,
+            n_jobs=n_jobs,
+            random_state=random_state,
+        )
+        self.max_iter = max_iter
+        self.max_no_improvement = max_no_improvement
+        self.tol = tol
+        self.n_init = n_init
+
+        self.cluster_centers_: Optional[np.ndarray] = None
+        # Number of mini-batch steps run by `fit`
+        self.n_steps_: Optional[int] = None
+        # Number of samples assigned to each center so far
+        self._counts: Optional[np.ndarray] = None
+        self._rng = np.random.default_rng(random_state)
+
+    def _init_centers(self, samples: np.ndarray) -> np.ndarray:
+        """k-means++ initialization refined by a few Lloyd iterations (on the
+        given samples), keeping the best of `n_init` trials."""
+        if len(samples) < self.n_clusters:
+            raise ValueError(
+                f"At least {self.n_clusters} samples are needed, got {len(samples)}."
+            )
+        best_centers, best_inertia = None, np.inf
+        for _ in range(self.n_init):
+            chosen = [self._rng.integers(len(samples))]
+            closest = _squared_distances(samples, samples[chosen])[:, 0]
+            for _ in range(1, self.n_clusters):
+                total = closest.sum()
+                p = closest / total if total > 0 else None
+                chosen.append(self._rng.choice(len(samples), p=p))
+                distances = _squared_distances(samples, samples[chosen[-1:]])[:, 0]
+                closest = np.minimum(closest, distances)
+            centers, inertia = _lloyd(samples, samples[chosen].astype(float))
+            if inertia < best_inertia:
+                best_centers, best_inertia = centers, inertia
+        return best_centers
+
+    def _step(self, batch: np.ndarray) -> Tuple[float, float]:
+        """Moves the centers towards a batch. Returns the mean squared distance
+        of the batch to the centers and the squared shift of the centers."""
+        distances = _squared_distances(batch, self.cluster_centers_)
+        labels = distances.argmin(axis=1)
+        inertia = distances[np.arange(len(batch)), labels].mean()
+
+        counts = np.bincount(labels, minlength=self.n_clusters)
+        membership = np.zeros((self.n_clusters, len(batch)))
+        membership[labels, np.arange(len(batch))] = 1.0
+        sums = membership @ batch
+        assigned = counts > 0
+        # Running mean of all the samples assigned to each center so far
+        total = self._counts[assigned] + counts[assigned]
+        new_centers = (
+            self.cluster_centers_[assigned] * self._counts[assigned, None]
+            + sums[assigned]
+        ) / total[:, None]
+        shift = ((new_centers - self.cluster_centers_[assigned]) ** 2).sum()
+        self.cluster_centers_[assigned] = new_centers
+        self._counts[assigned] = total
+        return inertia, shift
+
+    def _fit(self, data: ArrayLike):
+        """Clusters the data. Sets the `cluster_centers_`, `labels_` and
+        `inertia_` attributes."""
+        samples = _as_samples(data)
+        n_samples = len(samples)
+        self._rng = np.random.default_rng(self.random_state)
+        batch_size = min(self.batch_size, n_samples)
+
+        init_size = min(n_samples, max(3 * batch_size, 10 * self.n_clusters))
+        init_rows = np.sort(self._rng.choice(n_samples, init_size, replace=False))
+        init_samples = np.asarray(samples[init_rows], dtype=float)
+        _check_finite(init_samples)
+        self.cluster_centers_ = self._init_centers(init_samples)
+        self._counts = np.zeros(self.n_clusters)
+        variance = init_samples.var(axis=0).sum() or 1.0
+
+        # Exponentially weighted average of the inertia of the batches
+        alpha = min(1.0, 2 * batch_size / (n_samples + 1))
+        smoothed, best, no_improvement = None, np.inf, 0
+        n_steps = self.max_iter * math.ceil(n_samples / batch_size)
+        step = 0
+        for step in range(1, n_steps + 1):
+            rows = np.sort(self._rng.integers(0, n_samples, batch_size))
+            batch = np.asarray(samples[rows], dtype=float)
+            _check_finite(batch)
+            inertia, shift = self._step(batch)
+
+            if self.tol > 0 and shift / variance <= self.tol:
+                break
+            smoothed = (
+                inertia
+                if smoothed is None
+                else ((1 - alpha) * smoothed + alpha * inertia)
+            )
+            if smoothed < best:
+                best, no_improvement = smoothed, 0
+            else:
+                no_improvement += 1
+                if no_improvement >= self.max_no_improvement:
+                    break
+        self.n_steps_ = step
+        self.labels_, self.inertia_ = self._assign(samples)
+
+    def partial_fit(self, data: ArrayLike) -> "MiniBatchKMeans":
+        """Updates the centers with a single batch of data (e.g. a chunk of a
+        data set which does not fit in memory). The first batch initializes
+        the centers. The `labels_` and `inertia_` attributes are not set.
+
+        Parameters
+        ----------
+        data : ArrayLike
+            The batch of (sample x dimension) data
+
+        Returns
+        -------
+        MiniBatchKMeans
+            Class object for chaining
+        """
+        batch = np.asarray(_as_samples(data), dtype=float)
+        _check_finite(batch)
+        if self.cluster_centers_ is None:
+            self.cluster_centers_ = self._init_centers(batch)
+            self._counts = np.zeros(self.n_clusters)
+        self._step(batch)
+        self._is_fitted = True
+        return self
+
+    def _assign(self, samples: np.ndarray) -> Tuple[np.ndarray, float]:
+        """Closest center of each sample and the sum of the squared distances,
+        computed in batches (across threads)."""
+
+        def run(bounds: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray]:
+            batch = np.asarray(samples[bounds[0] : bounds[1]], dtype=float)
+            _check_finite(batch)
+            distances = _squared_distances(batch, self.cluster_centers_)
+            labels = distances.argmin(axis=1)
+            return labels, distances[np.arange(len(batch)), labels]
+
+        batches = self._get_batches(len(samples))
+        n_jobs = self._get_n_jobs()
+        if n_jobs == 1:
+            results = list(map(run, batches))
+        else:
+            with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+                results = list(executor.map(run, batches))
+        labels = np.concatenate([r[0] for r in results])
+        inertia = float(sum(r[1].sum() for r in results))
+        return labels, inertia
+
+    def _predict(self, data: ArrayLike) -> np.ndarray:
+        """Closest center of each sample."""
+        return self._assign(_as_samples(data))[0]
+
+
+class FeatureKMeans(BaseClusterer):
+    def __init__(
+        self,
+        n_clusters: int = 8,
+        features: Optional[Sequence[str]] = None,
+        sp: Optional[int] = None,
+        batch_size: int = 1024,
+        max_iter: int = 100,
+        n_jobs: int = 1,
+        random_state: Optional[int] = None,
+    ):
+        """Initializes the feature based clustering class. The features of the
+        series (see `extract_features`) are standardized and clustered with
+        mini-batch k-means, so many series are clustered with memory bounded by
+        the batch size (on top of the data and the features).
+
+        Parameters
+        ----------
+        n_clusters : int, optional
+            Number of clusters, by default 8
+        features : Optional[Sequence[str]], optional
+            Features the series are clustered by, by default None (all of them)
+        sp : Optional[int], optional
+            Seasonal periodicity of the series, by default None
+        batch_size : int, optional
+            Number of series processed at a time, by default 1024
+        max_iter : int, optional
+            Maximum number of passes of k-means over the features, by default 100
+        n_jobs : int, optional
+            Number of threads used, by default 1. Use -1 for the number of CPUs.
+        random_state : Optional[int], optional
+            Seed of the random number generator, by default None
+        """
+        super().__init__(
+            n_clusters=n_clusters,
+            batch_size=batch_size,
+            n_jobs=n_jobs,
+            random_state=random_state,
+        )
+        self.features = features
+        self.sp = sp
+        self.max_iter = max_iter
+
+        # (series x feature) features of the fitted series
+        self.features_: Optional[pd.DataFrame] = None
+        self._mean: Optional[pd.Series] = None
+        self._scale: Optional[pd.Series] = None
+        self._kmeans: Optional[MiniBatchKMeans] = None
+
+    def _get_scaled_features(self, data: ArrayLike) -> Tuple[pd.DataFrame, np.ndarray]:
+        """Features of the series, raw and standardized (missing values,
+        e.g. the skewness of constant series, set to the average)."""
+        features = extract_features(
+            data,
+            features=self.features,
+            sp=self.sp,
+            batch_size=self.batch_size,
+            n_jobs=self._get_n_jobs(),
+        )
+        if self._mean is None:
+            self._mean = features.mean()
+            self._scale = features.std().replace(0.0, 1.0).fillna(1.0)
+        scaled = ((features - self._mean) / self._scale).fillna(0.0)
+        return features, scaled.to_numpy()
+
+    def _fit(self, data: ArrayLike):
+        """Clusters the series. Sets the `features_`, `labels_` and `inertia_`
+        attributes."""
+        self._mean = self._scale = None
+        self.features_, scaled = self._get_scaled_features(data)
+        self._kmeans = MiniBatchKMeans(
+            n_clusters=self.n_clusters,
+            batch_size=self.batch_size,
+            max_iter=self.max_iter,
+            n_jobs=self.n_jobs,
+            random_state=self.random_state,
+        ).fit(scaled)
+        self.labels_ = self._kmeans.labels_
+        self.inertia_ = self._kmeans.inertia_
+
+    def _predict(self, data: ArrayLike) -> np.ndarray:
+        """Closest cluster of each series."""
+        return self._kmeans.predict(self._get_scaled_features(data)[1])
+
+    def get_cluster_centers(self) -> pd.DataFrame:
+        """Returns the (unscaled) features of the center of each cluster.
+
+        Returns
+        -------
+        pd.DataFrame
+            The features (columns) of each cluster center (rows)
+        """
+        self.check_is_fitted()
+        columns: List[str] = list(self.features_.columns)
+        centers = pd.DataFrame(self._kmeans.cluster_centers_, columns=columns)
+        return centers * self._scale + self._mean
@@ -0,0 +1,610 @@
+"""Single pass profiling of data which may not fit in memory.
+
+All the statistics of a column (counts, extrema, moments, quantiles, distinct
+values, autocorrelations and outlier rates) are accumulated chunk by chunk in
+a `ColumnProfile`, with bounded memory: moments are merged with Chan /
+Pébay's parallel formulas, quantiles are summarized by a t-digest and
+distinct values by a HyperLogLog sketch. Profiles of consecutive partitions
+of the data can be merged, so the chunks can be profiled in parallel.
+"""
+
+import math
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Hashable, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from ds_lib_template.utils.io import _import_parquet, _suffix
+from ds_lib_template.utils.sketches import HyperLogLog, TDigest
+
+ProfileSource = Union[str, os.PathLike, np.ndarray, pd.Series, pd.DataFrame]
+
+# Quantiles reported in the summaries
+QUANTILES = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+
+class ColumnProfile:
+    def __init__(
+        self,
+        lags: Sequence[int] = (1,),
+        numeric: bool = True,
+        compression: int = 200,
+        precision: int = 12,
+    ):
+        """Mergeable profile of a single column, updated chunk by chunk.
+
+        Parameters
+        ----------
+        lags : Sequence[int], optional
+            Lags of the autocorrelations, by default (1,)
+        numeric : bool, optional
+            Whether the values are numeric. Only the counts and the distinct
+            values of non numeric columns are profiled, by default True
+        compression : int, optional
+            Compression of the t-digest of the quantiles, by default 200
+        precision : int, optional
+            Precision of the HyperLogLog sketch of the distinct values, by
+            default 12
+        """
+        self.lags = tuple(sorted(set(int(lag) for lag in lags)))
+        if self.lags and self.lags[0] < 1:
+            raise ValueError("`lags` must be at least 1.")
+        self.numeric = numeric
+        self.compression = compression
+        self.precision = precision
+
+        # Number of points, of non missing values and their moments (sums of
+        # powers of the differences from the mean)
+        self.length = 0
+        self.count = 0
+        self.mean = np.nan
+        self._m2 = 0.0
+        self._m3 = 0.0
+        self._m4 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.digest = TDigest(compression=compression)
+        self.distinct = HyperLogLog(precision=precision)
+
+        # Number of pairs of non missing values `lag` points apart, and sums of
+        # their products and of each side, relative to `_shift`. The first and
+        # last `max(lags)` values are kept to pair values across partitions.
+        self._shift = 0.0
+        self._pairs = np.zeros((4, len(self.lags)))
+        self._head = np.empty(0)
+        self._tail = np.empty(0)
+
+    def _new(self, numeric: Optional[bool] = None) -> "ColumnProfile":
+        """Empty profile with the same parameters (and type, unless `numeric`
+        is given)."""
+        return ColumnProfile(
+            lags=self.lags,
+            numeric=self.numeric if numeric is None else numeric,
+            compression=self.compression,
+            precision=self.precision,
+        )
+
+    def _convert(self, numeric: bool) -> "ColumnProfile":
+        """Profile of the same partition with another type. Only the counts
+        and the distinct values are kept: profiles only become numeric when
+        they have no values, and lose their numeric statistics otherwise."""
+        profile = self._new(numeric=numeric)
+        profile.length, profile.count = self.length, self.count
+        profile.distinct.merge(self.distinct)
+        if numeric and self.lags:
+            # Missing values, to pair the values across partitions
+            profile._head = np.full(min(self.length, self.lags[-1]), np.nan)
+            profile._tail = profile._head.copy()
+        return profile
+
+    def _set_values(self, values: np.ndarray):
+        """Profiles the values of a single chunk (in an empty profile)."""
+        self.length = len(values)
+        if not self.numeric:
+            self.distinct.update(values)
+            self.count = int(np.count_nonzero(pd.notna(values)))
+            return
+
+        values = np.asarray(values, dtype=float)
+        self.distinct.update(values)
+        if self.lags:
+            max_lag = self.lags[-1]
+            self._head = values[:max_lag].copy()
+            self._tail = values[max(len(values) - max_lag, 0) :].copy()
+        valid = ~np.isnan(values)
+        finite = values[valid]
+        self.count = len(finite)
+        if not self.count:
+            return
+        self.mean = finite.mean()
+        centered = finite - self.mean
+        squares = centered**2
+        self._m2 = squares.sum()
+        self._m3 = (squares * centered).sum()
+        self._m4 = (squares**2).sum()
+        self.min, self.max = finite.min(), finite.max()
+        self.digest.update(finite)
+
+        if self.lags:
+            self._shift = self.mean
+            self._pairs = _lag_sums(values, self._shift, self.lags)
+
+    def update(
+        self, values: Union[np.ndarray, pd.Series], numeric: Optional[bool] = None
+    ) -> "ColumnProfile":
+        """Profiles the next chunk of the column.
+
+        Parameters
+        ----------
+        values : Union[np.ndarray, pd.Series]
+            Values of the chunk (following the values profiled so far)
+        numeric : Optional[bool], optional
+            Whether the values of the chunk are numeric, see `merge`, by
+            default None (same as the profile)
+
+        Returns
+        -------
+        ColumnProfile
+            Class object for chaining
+        """
+        chunk = self._new(numeric=numeric)
+        chunk._set_values(np.asarray(values).ravel())
+        return self.merge(chunk)
+
+    def merge(self, other: "ColumnProfile") -> "ColumnProfile":
+        """Adds the profile of the partition of the column following the
+        partition of this profile. The type of the column is only known from
+        the partitions with values (e.g. a text column is read as floats from
+        the chunks of a CSV file where it is missing): a profile without values
+        takes the type of the other one, and the profiles of numeric and non
+        numeric values merge into a non numeric profile.
+
+        Parameters
+        ----------
+        other : ColumnProfile
+            Profile of the next partition, with the same parameters
+
+        Returns
+        -------
+        ColumnProfile
+            Class object for chaining
+        """
+        if other.lags != self.lags:
+            raise ValueError("Only profiles with the same parameters can be merged.")
+        if other.numeric != self.numeric:
+            numeric = (
+                other.numeric if not self.count else self.numeric and not other.count
+            )
+            if self.numeric != numeric:
+                self.__dict__.update(self._convert(numeric).__dict__)
+            if other.numeric != numeric:
+                other = other._convert(numeric)
+        self.distinct.merge(other.distinct)
+        if not self.numeric or not other.count:
+            if self.numeric and self.lags:
+                self._extend_ends(other)
+            self.length += other.length
+            self.count += other.count
+            return self
+
+        if self.lags:
+            # Pairs split between the partitions, then all the sums relative to
+            # a common shift
+            shift = self._shift if self.count else other._shift
+            self._pairs = _reshift(self._pairs, self._shift - shift)
+            self._pairs += _reshift(other._pairs, other._shift - shift)
+            ends = np.concatenate([self._tail, other._head])
+            self._pairs += _lag_sums(ends, shift, self.lags, split=len(self._tail))
+            self._shift = shift
+            self._extend_ends(other)
+
+        if not self.count:
+            self.mean, self._m2, self._m3, self._m4 = (
+                other.mean,
+                other._m2,
+                other._m3,
+                other._m4,
+            )
+        else:
+            self._merge_moments(other)
+        self.length += other.length
+        self.count += other.count
+        self.min, self.max = min(self.min, other.min), max(self.max, other.max)
+        self.digest.merge(other.digest)
+        return self
+
+    def _extend_ends(self, other: "ColumnProfile"):
+        """Keeps the first and last values of the merged partitions."""
+        max_lag = self.lags[-1]
+        if len(self._head) < max_lag:
+            self._head = np.concatenate([self._head, other._head])[:max_lag]
+        tail = np.concatenate([self._tail, other._tail])
+        self._tail = tail[max(len(tail) - max_lag, 0) :]
+
+    def _merge_moments(self, other: "ColumnProfile"):
+        """Merges the moments of another (non empty) partition."""
+        n_a, n_b = self.count, other.count
+        n = n_a + n_b
+        delta = other.mean - self.mean
+        m2_a, m2_b, m3_a, m3_b = self._m2, other._m2, self._m3, other._m3
+
+        self.mean += delta * n_b / n
+        self._m2 = m2_a + m2_b + delta**2 * n_a * n_b / n
+        self._m3 = (
+            m3_a
+            + m3_b
+            + delta**3 * n_a * n_b * (n_a - n_b) / n**2
+            + 3 * delta * (n_a * m2_b - n_b * m2_a) / n
+        )
+        self._m4 = (
+            self._m4
+            + other._m4
+            + delta**4 * n_a * n_b * (n_a**2 - n_a * n_b + n_b**2) / n**3
+            + 6 * delta**2 * (n_a**2 * m2_b + n_b**2 * m2_a) / n**2
+            + 4 * delta * (n_a * m3_b - n_b * m3_a) / n
+        )
+
+    def get_std(self) -> float:
+        """Standard deviation (ddof=1, as pandas) of the values."""
+        return math.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else np.nan
+
+    def get_acf(self) -> pd.Series:
+        """Returns the autocorrelation at each lag.
+
+        Returns
+        -------
+        pd.Series
+            The autocorrelations, indexed by lag. The sum of the products of
+            the centered pairs of values is divided by the sum of the squares
+            of all the centered values.
+        """
+        n_pairs, products, left, right = self._pairs
+        # Mean relative to the shift of the sums
+        mean = self.mean - self._shift
+        covariances = products - mean * (left + right) + n_pairs * mean**2
+        with np.errstate(invalid="ignore", divide="ignore"):
+            acf = np.where(n_pairs > 0, covariances / self._m2, np.nan)
+        return pd.Series(acf, index=pd.Index(self.lags, name="lag"), dtype=float)
+
+    def get_outlier_rate(self, method: str = "std", multiplier: float = 3) -> float:
+        """Returns the approximate fraction of outliers, i.e. of values outside
+        the limits of `StdDevOutlierDetection` ("std") or of
+        `MADOutlierDetection` ("mad"). As the limits are only known after the
+        pass over the data, the fractions come from the t-digest, which is
+        most accurate in the tails.
+
+        Parameters
+        ----------
+        method : str, optional
+            "std" (mean +/- multiplier * std) or "mad" (median +/- multiplier
+            * median absolute deviation), by default "std"
+        multiplier : float, optional
+            Multiplier of the deviation, by default 3
+
+        Returns
+        -------
+        float
+            The approximate fraction of outliers among the non missing values
+        """
+        if method not in ("std", "mad"):
+            raise ValueError(f"Unknown method '{method}', expected 'std' or 'mad'.")
+        if self.count < 2:
+            return np.nan
+        if method == "std":
+            center, deviation = self.mean, self.get_std()
+        else:
+            center, deviation = self.digest.quantile(0.5), self._get_mad()
+        lower, upper = center - multiplier * deviation, center + multiplier * deviation
+        below = self.digest.cdf(lower) if lower > self.min else 0.0
+        above = 1 - self.digest.cdf(upper) if upper < self.max else 0.0
+        return float(below + above)
+
+    def _get_mad(self) -> float:
+        """Approximate median absolute deviation from the median, by bisection
+        on the fraction of values within the deviation of the median."""
+        if not self.count:
+            return np.nan
+        median = self.digest.quantile(0.5)
+        low, high = 0.0, max(self.max - median, median - self.min)
+        for _ in range(60):
+            middle = (low + high) / 2
+            inside = self.digest.cdf(median + middle) - self.digest.cdf(median - middle)
+            low, high = (middle, high) if inside < 0.5 else (low, middle)
+        return (low + high) / 2
+
+    def get_summary(self, multiplier: float = 3) -> pd.Series:
+        """Returns the summary statistics of the column.
+
+        Parameters
+        ----------
+        multiplier : float, optional
+            Multiplier of the deviation of the outlier rates, by default 3
+
+        Returns
+        -------
+        pd.Series
+            count, missing, missing_rate, distinct and, for numeric columns,
+            min, max, mean, std, skewness, kurtosis (excess), the `QUANTILES`
+            (p1, p5, ...), the autocorrelations (acf_1, ...) and the outlier
+            rates (outlier_rate_std, outlier_rate_mad)
+        """
+        missing = self.length - self.count
+        summary = {
+            "count": self.count,
+            "missing": missing,
+            "missing_rate": missing / self.length if self.length else np.nan,
+            "distinct": round(self.distinct.count()),
+        }
+        if self.numeric:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                skewness = math.sqrt(self.count) * self._m3 / self._m2**1.5
+                kurtosis = self.count * self._m4 / self._m2**2 - 3
+            summary.update(
+                {
+                    "min": self.min if self.count else np.nan,
+                    "max": self.max if self.count else np.nan,
+                    "mean": self.mean,
+                    "std": self.get_std(),
+                    "skewness": skewness if self._m2 > 0 else np.nan,
+                    "kurtosis": kurtosis if self._m2 > 0 else np.nan,
+                }
+            )
+            quantiles = self.digest.quantile(np.array(QUANTILES))
+            summary.update(
+                {
+                    f"p{round(q * 100):g}": value
+                    for q, value in zip(QUANTILES, quantiles)
+                }
+            )
+            summary.update(
+                {f"acf_{lag}": value for lag, value in self.get_acf().items()}
+            )
+            for method in ("std", "mad"):
+                summary[f"outlier_rate_{method}"] = self.get_outlier_rate(
+                    method=method, multiplier=multiplier
+                )
+        return pd.Series(summary, dtype=float)
+
+
+class DataProfile:
+    def __init__(
+        self, lags: Sequence[int] = (1,), compression: int = 200, precision: int = 12
+    ):
+        """Mergeable profile of all the columns of tabular data, updated chunk
+        by chunk.
+
+        Parameters
+        ----------
+        lags : Sequence[int], optional
+            Lags of the autocorrelations, by default (1,)
+        compression : int, optional
+            Compression of the t-digests of the quantiles, by default 200
+        precision : int, optional
+            Precision of the HyperLogLog sketches of the distinct values, by
+            default 12
+        """
+        self.lags = lags
+        self.compression = compression
+        self.precision = precision
+        self.profiles: Dict[Hashable, ColumnProfile] = {}
+
+    def _get_profile(self, column: Hashable, numeric: bool) -> ColumnProfile:
+        """Returns (and creates on first use) the profile of a column."""
+        if column not in self.profiles:
+            self.profiles[column] = ColumnProfile(
+                lags=self.lags,
+                numeric=numeric,
+                compression=self.compression,
+                precision=self.precision,
+            )
+        return self.profiles[column]
+
+    def update(self, data: Union[pd.DataFrame, pd.Series]) -> "DataProfile":
+        """Profiles the next chunk of the data.
+
+        Parameters
+        ----------
+        data : Union[pd.DataFrame, pd.Series]
+            The chunk (following the chunks profiled so far)
+
+        Returns
+        -------
+        DataProfile
+            Class object for chaining
+        """
+        if isinstance(data, pd.Series):
+            data = data.to_frame()
+        for column, values in data.items():
+            numeric = pd.api.types.is_numeric_dtype(values.dtype)
+            if numeric:
+                values = values.to_numpy(dtype=float, na_value=np.nan)
+            self._get_profile(column, numeric).update(values, numeric=numeric)
+        return self
+
+    def merge(self, other: "DataProfile") -> "DataProfile":
+        """Adds the profile of the partition of the data following the
+        partition of this profile.
+
+        Parameters
+        ----------
+        other : DataProfile
+            Profile of the next partition, with the same parameters
+
+        Returns
+        -------
+        DataProfile
+            Class object for chaining
+        """
+        for column, profile in other.profiles.items():
+            self._get_profile(column, profile.numeric).merge(profile)
+        return self
+
+    def get_summary(self, multiplier: float = 3) -> pd.DataFrame:
+        """Returns the summary statistics of each column.
+
+        Parameters
+        ----------
+        multiplier : float, optional
+            Multiplier of the deviation of the outlier rates, by default 3
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per column, with the statistics of
+            `ColumnProfile.get_summary` (NaN when they do not apply)
+        """
+        summaries = [
+            profile.get_summary(multiplier=multiplier).rename(column)
+            for column, profile in self.profiles.items()
+        ]
+        if not summaries:
+            return pd.DataFrame()
+        # The statistics of the numeric columns include those of the others
+        statistics = max((s.index for s in summaries), key=len)
+        return pd.DataFrame(summaries).reindex(columns=statistics)
+
+
+def _lag_sums(
+    values: np.ndarray,
+    shift: float,
+    lags: Sequence[int],
+    split: Optional[int] = None,
+) -> np.ndarray:
+    """(4 x lag) number of pairs of non missing values `lag` points apart and
+    sums of their products, of their first values and of their second values
+    (relative to `shift`). Only the pairs across `split` (first value before
+    it, second value after it) are summed when it is given."""
+    valid = ~np.isnan(values)
+    weights = valid.astype(float)
+    centered = np.where(valid, values - shift, 0.0)
+    n_values = len(values)
+    sums = np.zeros((4, len(lags)))
+    for i, lag in enumerate(lags):
+        # Range of the first values of the pairs
+        start, stop = 0, n_values - lag
+        if split is not None:
+            start, stop = max(split - lag, 0), min(split, stop)
+        if start >= stop:
+            continue
+        x, y = centered[start:stop], centered[start + lag : stop + lag]
+        w_x, w_y = weights[start:stop], weights[start + lag : stop + lag]
+        sums[:, i] = w_x @ w_y, x @ y, x @ w_y, w_x @ y
+    return sums
+
+
+def _reshift(sums: np.ndarray, delta: float) -> np.ndarray:
+    """Lag sums relative to `shift - delta` instead of `shift`."""
+    n_pairs, products, left, right = sums
+    return np.stack(
+        [
+            n_pairs,
+            products + delta * (left + right) + n_pairs * delta**2,
+            left + n_pairs * delta,
+            right + n_pairs * delta,
+        ]
+    )
+
+
+def _iter_frames(
+    source: ProfileSource, chunksize: int, columns: Optional[List[str]]
+) -> Iterator[pd.DataFrame]:
+    """Iterates over consecutive chunks of tabular data as DataFrames."""
+    if isinstance(source, pd.Series):
+        source = source.to_frame()
+    if isinstance(source, pd.DataFrame):
+        frame = source[columns] if columns is not None else source
+        for start in range(0, len(frame), chunksize):
+            yield frame.iloc[start : start + chunksize]
+        return
+
+    if not isinstance(source, np.ndarray):
+        suffix = _suffix(source)
+        if suffix == ".parquet":
+            _, pq = _import_parquet()
+            parquet_file = pq.ParquetFile(source)
+            for batch in parquet_file.iter_batches(
+                batch_size=chunksize, columns=columns
+            ):
+                yield batch.to_pandas()
+            return
+        if suffix == ".csv":
+            yield from pd.read_csv(source, usecols=columns, chunksize=chunksize)
+            return
+        source = np.load(source, mmap_mode="r")
+
+    if source.ndim > 2:
+        raise ValueError(f"Expected 1-D or 2-D data, got {source.ndim} dimensions.")
+    for start in range(0, len(source), chunksize):
+        chunk = pd.DataFrame(np.asarray(source[start : start + chunksize]))
+        yield chunk[columns] if columns is not None else chunk
+
+
+def _profile_chunk(
+    chunk: pd.DataFrame, lags: Sequence[int], compression: int, precision: int
+) -> DataProfile:
+    """Profile of a single chunk (run in the worker processes)."""
+    return DataProfile(lags=lags, compression=compression, precision=precision).update(
+        chunk
+    )
+
+
+def profile(
+    source: ProfileSource,
+    lags: Sequence[int] = (1,),
+    chunksize: int = 1_000_000,
+    columns: Optional[List[str]] = None,
+    compression: int = 200,
+    precision: int = 12,
+    n_jobs: int = 1,
+) -> DataProfile:
+    """Profiles tabular data in a single pass, one chunk at a time.
+
+    Parameters
+    ----------
+    source : ProfileSource
+        DataFrame, Series, array (1-D or 2-D, e.g. `np.memmap`) or path to a
+        `.npy`, `.parquet` or `.csv` file
+    lags : Sequence[int], optional
+        Lags of the autocorrelations, by default (1,)
+    chunksize : int, optional
+        Maximum number of rows held in memory per chunk, by default 1_000_000
+    columns : Optional[List[str]], optional
+        Columns to profile, by default None (all of them)
+    compression : int, optional
+        Compression of the t-digests of the quantiles, by default 200
+    precision : int, optional
+        Precision of the HyperLogLog sketches of the distinct values, by
+        default 12
+    n_jobs : int, optional
+        Number of processes the chunks are profiled in. If 1, the chunks are
+        profiled in the main process, by default 1. Use -1 for the number of
+        CPUs. At most 2 chunks per process are in flight at a time.
+
+    Returns
+    -------
+    DataProfile
+        The profile of the data, see `DataProfile.get_summary`
+    """
+    result = DataProfile(lags=lags, compression=compression, precision=precision)
+    chunks = _iter_frames(source, chunksize=chunksize, columns=columns)
+    n_jobs = n_jobs if n_jobs != -1 else os.cpu_count() or 1
+    if n_jobs == 1:
+        for chunk in chunks:
+            result.update(chunk)
+        return result
+
+    # Profiles are merged in the order of the chunks, as the autocorrelations
+    # pair the values across consecutive chunks
+    pending: List[Future] = []
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        for chunk in chunks:
+            if len(pending) >= 2 * n_jobs:
+                result.merge(pending.pop(0).result())
+            pending.append(
+                executor.submit(_profile_chunk, chunk, lags, compression, precision)
+            )
+        for future in pending:
+            result.merge(future.result())
+    return result
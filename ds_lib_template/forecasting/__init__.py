@@ -0,0 +1,20 @@
+"""Forecasting. The forecasters are imported on first access."""
+
+from ds_lib_template.utils.lazy import attach
+
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    attributes={
+        "components.dummy": ["DummyForecastingComponent"],
+        "components.linear": ["LinearForecastingComponent"],
+        "components.panel": ["PanelComponentSplitter"],
+        "evaluation.backtest": ["backtest"],
+        "evaluation.splitters": ["ExpandingWindowSplitter", "SlidingWindowSplitter"],
+        "model.base": ["BaseForecaster", "NotFittedError"],
+        "model.linear": ["LinearAdditiveForecaster"],
+        "model.naive": ["NaiveForecaster"],
+        "model.panel": ["PanelNaiveForecaster"],
+        "model.store": ["ModelStore"],
+        "serving": ["PredictionServer"],
+    },
+)
@@ -1,9 +1,17 @@
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, List, Optional, Tuple
+from typing import Any, List, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
+from ds_lib_template.utils.instrumentation import instrument_methods
+
+# Names of the groups of components, in the order they are returned
+COMPONENTS = ("trend", "seasonality", "drivers", "holidays", "others")
+# Stages timed when the instrumentation is enabled
+STAGES = ("_predict",) + tuple(f"_set_component_{name}" for name in COMPONENTS)
+
 
 class BaseComponentSplitter(ABC):
     def __init__(
@@ -42,14 +50,24 @@ class BaseComponentSplitter(ABC):
         self.component_drivers: Optional[pd.DataFrame] = None
         self.component_holidays: Optional[pd.DataFrame] = None
         self.component_others: Optional[pd.DataFrame] = None
+        # Whether `predict` has been called (the components are then computed
+        # on demand and cached until the next `predict`)
+        self._predicted = False
 
         total_drivers = len(drivers) if drivers is not None else 0
         total_holidays = len(holidays) if holidays is not None else 0
         # Trend + Seasonality + Drivers + Holidays + Others
         self.total_components = 2 + total_drivers + total_holidays
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        instrument_methods(cls, STAGES)
+
     def predict(
-        self, fh: Optional[int] = None, X: Optional[pd.DataFrame] = None
+        self,
+        fh: Optional[int] = None,
+        X: Optional[pd.DataFrame] = None,
+        components: Optional[List[str]] = None,
     ) -> Tuple[pd.Series, pd.DataFrame]:
         """Predicts the future values of the target variable along with its constituent components.
 
@@ -59,23 +77,70 @@ class BaseComponentSplitter(ABC):
             The forecasters horizon with the steps ahead to to predict, by default None
         X : Optional[pd.DataFrame]
             Exogenous variables, by default None
+        components : Optional[List[str]], optional
+            The components to compute and return, among "trend", "seasonality",
+            "drivers", "holidays" and "others", by default None (all of them).
+            The other components are only computed if they are fetched later.
 
         Returns
         -------
         pd.Series
             The predictions
         """
+        if components is not None:
+            unknown = set(components) - set(COMPONENTS)
+            if unknown:
+                raise ValueError(
+                    f"Unknown components {sorted(unknown)}. Valid components are "
+                    f"{list(COMPONENTS)}."
+                )
+
         y_pred = self._predict(fh=fh, X=X)
 
-        self._set_component_trend()
-        self._set_component_seasonality()
-        self._set_component_drivers()
-        self._set_component_holidays()
-        self._set_component_others()
+        # Invalidate the components of the previous prediction
+        self.component_trend = None
+        self.component_seasonality = None
+        self.component_drivers = None
+        self.component_holidays = None
+        self.component_others = None
+        self._predicted = True
+
+        if components is None:
+            return y_pred, self.get_all_components()
+        return y_pred, self.get_components(components)
+
+    @classmethod
+    def _predict_panel(
+        cls, splitters: List["BaseComponentSplitter"], fh: int
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, List[pd.Index]]]:
+        """Predicts many splitters (of this class) at once. Splitters able to
+        vectorize their predictions should override it.
+
+        Parameters
+        ----------
+        splitters : List[BaseComponentSplitter]
+            The splitters to predict, all with the same components
+        fh : int
+            The forecasters horizon with the steps ahead to to predict
 
-        components = self.get_all_components()
+        Returns
+        -------
+        Optional[Tuple[np.ndarray, np.ndarray, List[pd.Index]]]
+            The (series x horizon) predictions, the (series x horizon x
+            component) components and the index of each series, or None if the
+            splitters can not be predicted together
+        """
+        return None
+
+    def get_component_names(self) -> List[str]:
+        """Returns the names of the columns of all the components
 
-        return y_pred, components
+        Returns
+        -------
+        List[str]
+            The component names
+        """
+        return ["trend", "seasonality"] + (self.drivers or []) + (self.holidays or [])
 
     @abstractmethod
     def _predict(
@@ -125,6 +190,8 @@ class BaseComponentSplitter(ABC):
         pd.Series
             The trend component
         """
+        if self.component_trend is None and self._predicted:
+            self._set_component_trend()
         if self.component_trend is None:
             raise ValueError(
                 "Trend component has not been set. Please run `predict` before "
@@ -141,6 +208,8 @@ class BaseComponentSplitter(ABC):
         pd.Series
             The seasonal component
         """
+        if self.component_seasonality is None and self._predicted:
+            self._set_component_seasonality()
         if self.component_seasonality is None:
             raise ValueError(
                 "Seasonality component has not been set. Please run `predict` "
@@ -157,6 +226,8 @@ class BaseComponentSplitter(ABC):
         pd.DataFrame
             The driver components
         """
+        if self.component_drivers is None and self._predicted:
+            self._set_component_drivers()
         if self.component_drivers is None:
             raise ValueError(
                 "Driver components have not been set. Please run `predict` "
@@ -173,6 +244,8 @@ class BaseComponentSplitter(ABC):
         pd.DataFrame
             The holiday components
         """
+        if self.component_holidays is None and self._predicted:
+            self._set_component_holidays()
         if self.component_holidays is None:
             raise ValueError(
                 "Holiday components have not been set. Please run `predict` "
@@ -190,6 +263,8 @@ class BaseComponentSplitter(ABC):
         pd.DataFrame
             The other components
         """
+        if self.component_others is None and self._predicted:
+            self._set_component_others()
         if self.component_others is None:
             raise ValueError(
                 "Other components have not been set. Please run `predict` "
@@ -198,7 +273,42 @@ class BaseComponentSplitter(ABC):
 
         return self.component_others
 
-    def get_all_components(self):
+    def get_components(self, components: List[str]) -> pd.DataFrame:
+        """Returns the selected components of the forecast, computing the ones
+        which have not been fetched since the last `predict`
+
+        Parameters
+        ----------
+        components : List[str]
+            The components to return, among "trend", "seasonality", "drivers",
+            "holidays" and "others"
+
+        Returns
+        -------
+        pd.DataFrame
+            The selected components (in the order of `COMPONENTS`)
+        """
+        getters = {
+            "trend": self.get_component_trend,
+            "seasonality": self.get_component_seasonality,
+            "drivers": self.get_component_drivers,
+            "holidays": self.get_component_holidays,
+            "others": self.get_component_others,
+        }
+        selected: List[Union[pd.Series, pd.DataFrame]] = [
+            getters[name]() for name in COMPONENTS if name in components
+        ]
+        if not selected:
+            return pd.DataFrame()
+        if len(selected) == 1:
+            # A single component does not need the (slow) concatenation
+            component = selected[0]
+            return (
+                component.to_frame() if isinstance(component, pd.Series) else component
+            )
+        return pd.concat(selected, axis=1)
+
+    def get_all_components(self) -> pd.DataFrame:
         """Returns all the components of the forecast
 
         Returns
@@ -206,13 +316,7 @@ class BaseComponentSplitter(ABC):
         pd.DataFrame
             All the components
         """
-        return pd.concat(
-            [
-                self.get_component_trend(),
-                self.get_component_seasonality(),
-                self.get_component_drivers(),
-                self.get_component_holidays(),
-                self.get_component_others(),
-            ],
-            axis=1,
-        )
+        return self.get_components(list(COMPONENTS))
+
+
+instrument_methods(BaseComponentSplitter, STAGES)
@@ -1,14 +1,50 @@
-from typing import Optional
+from typing import List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
 from ds_lib_template.forecasting.components.base import BaseComponentSplitter
+from ds_lib_template.forecasting.model.naive import (
+    NaiveForecaster,
+    _forecast_naive_models,
+)
 
 
 class DummyForecastingComponent(BaseComponentSplitter):
     """Equally splits the forecast into the components."""
 
+    @classmethod
+    def _predict_panel(
+        cls, splitters: List[BaseComponentSplitter], fh: int
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, List[pd.Index]]]:
+        """Predicts many splitters at once when all their models are fitted
+        naive forecasters: the forecasts are computed as a single panel and
+        broadcast into the components.
+
+        Parameters
+        ----------
+        splitters : List[BaseComponentSplitter]
+            The splitters to predict, all with the same components
+        fh : int
+            The forecasters horizon with the steps ahead to to predict
+
+        Returns
+        -------
+        Optional[Tuple[np.ndarray, np.ndarray, List[pd.Index]]]
+            The (series x horizon) predictions, the (series x horizon x
+            component) components and the index of each series, or None if the
+            splitters can not be predicted together
+        """
+        models = [splitter.model for splitter in splitters]
+        if not all(type(m) is NaiveForecaster and m.is_fitted for m in models):
+            return None
+        y_pred = _forecast_naive_models(models, fh).T
+        total_components = splitters[0].total_components
+        values = np.empty(y_pred.shape + (total_components,))
+        values[:] = (y_pred / total_components)[:, :, None]
+        indexes = [model._get_future_index(fh) for model in models]
+        return y_pred, values, indexes
+
     def _predict(
         self, fh: Optional[int] = None, X: Optional[pd.DataFrame] = None
     ) -> pd.Series:
@@ -27,47 +63,81 @@ class DummyForecastingComponent(BaseComponentSplitter):
             The predictions
         """
         self.y_pred = self.model.predict(fh=fh, X=X)
+        # Share of the forecast of every component. The components themselves
+        # are only built when they are fetched.
+        self._share = self.y_pred.to_numpy(dtype=float) / self.total_components
+        self._component_values = None
         return self.y_pred
 
+    def _get_component_values(self, start: int, stop: int) -> np.ndarray:
+        """Values of the components `start` to `stop` (excluded), as a view of
+        the block of all the components if it has already been built."""
+        if self._component_values is not None:
+            return self._component_values[:, start:stop]
+        values = np.empty((len(self._share), stop - start))
+        values[:] = self._share[:, None]
+        return values
+
+    def _get_component_frame(self, start: int, names: Optional[List[str]]):
+        """Wraps the values of the components starting at `start` in a
+        DataFrame (without copying)."""
+        if names is None:
+            return pd.DataFrame(index=self.y_pred.index)
+        return pd.DataFrame(
+            self._get_component_values(start, start + len(names)),
+            index=self.y_pred.index,
+            columns=names,
+            copy=False,
+        )
+
     def _set_component_trend(self):
         """Sets the trend component of the forecast (self.component_trend)"""
-        self.component_trend = self.y_pred / self.total_components
-        self.component_trend.name = "trend"
+        self.component_trend = pd.Series(
+            self._get_component_values(0, 1)[:, 0],
+            index=self.y_pred.index,
+            name="trend",
+        )
 
     def _set_component_seasonality(self):
         """Sets the seasonal component of the forecast (self.component_seasonality)"""
-        self.component_seasonality = self.y_pred / self.total_components
-        self.component_seasonality.name = "seasonality"
+        self.component_seasonality = pd.Series(
+            self._get_component_values(1, 2)[:, 0],
+            index=self.y_pred.index,
+            name="seasonality",
+        )
 
     def _set_component_drivers(self):
         """Sets the driver components of the forecast (self.component_drivers)"""
-        if self.drivers is not None:
-            shape = (len(self.y_pred), len(self.drivers))
-            self.component_drivers = pd.DataFrame(
-                np.ones(shape), columns=self.drivers, index=self.y_pred.index
-            )
-            component = self.y_pred / self.total_components
-            self.component_drivers.loc[:] = pd.concat(
-                [component] * self.component_drivers.columns.size, axis=1
-            )
-        else:
-            self.component_drivers = pd.DataFrame(index=self.y_pred.index)
+        self.component_drivers = self._get_component_frame(2, self.drivers)
 
     def _set_component_holidays(self):
         """Sets the holiday components of the forecast (self.component_holidays)"""
-        if self.holidays is not None:
-            shape = (len(self.y_pred), len(self.holidays))
-            self.component_holidays = pd.DataFrame(
-                np.ones(shape), columns=self.holidays, index=self.y_pred.index
-            )
-            component = self.y_pred / self.total_components
-            self.component_holidays.loc[:] = pd.concat(
-                [component] * self.component_holidays.columns.size, axis=1
-            )
-        else:
-            self.component_holidays = pd.DataFrame(index=self.y_pred.index)
+        start = 2 + (len(self.drivers) if self.drivers is not None else 0)
+        self.component_holidays = self._get_component_frame(start, self.holidays)
 
     def _set_component_others(self):
         """Sets the other (unknown and/or model specific) components of the
         forecast (self.component_others)"""
         self.component_others = pd.DataFrame(index=self.y_pred.index)
+
+    def get_all_components(self) -> pd.DataFrame:
+        """Returns all the components of the forecast
+
+        Returns
+        -------
+        pd.DataFrame
+            All the components
+        """
+        # Raises if `predict` has not been called yet
+        self.get_component_trend()
+        if self._component_values is None:
+            # All the components as a single (time x component) block
+            self._component_values = self._get_component_values(
+                0, self.total_components
+            )
+        return pd.DataFrame(
+            self._component_values,
+            index=self.y_pred.index,
+            columns=self.get_component_names(),
+            copy=False,
+        )
@@ -0,0 +1,151 @@
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ds_lib_template.forecasting.components.base import BaseComponentSplitter
+from ds_lib_template.forecasting.model.linear import LinearAdditiveForecaster
+
+
+class LinearForecastingComponent(BaseComponentSplitter):
+    """Splits the forecast of a `LinearAdditiveForecaster` (fitted on a single
+    series) into the contributions of its terms: the polynomial trend, the
+    Fourier seasonality and each driver / holiday regressor. Regressors which
+    are neither drivers nor holidays go to the other components."""
+
+    def _predict(
+        self, fh: Optional[int] = None, X: Optional[pd.DataFrame] = None
+    ) -> pd.Series:
+        """Predicts the future values of the target variable.
+
+        Parameters
+        ----------
+        fh : Optional[int], optional
+            The forecasters horizon with the steps ahead to to predict, by default None
+        X : Optional[pd.DataFrame]
+            Future values of the regressors, by default None
+
+        Returns
+        -------
+        pd.Series
+            The predictions
+        """
+        self._check_model()
+        # (horizon x term) contributions of the terms of the model
+        self._contributions = self.model._predict_terms(fh, X)[:, :, 0]
+        self.y_pred = pd.Series(
+            self._contributions.sum(axis=1), index=self.model._get_future_index(fh)
+        )
+        return self.y_pred
+
+    @classmethod
+    def _predict_panel(
+        cls, splitters: List[BaseComponentSplitter], fh: int
+    ) -> Optional[Tuple[np.ndarray, np.ndarray, List[pd.Index]]]:
+        """Predicts many splitters at once when their models share the same
+        design matrix (same terms and training length, without regressors):
+        the contributions of all the series are a single product of the design
+        matrix with the stacked coefficients.
+
+        Parameters
+        ----------
+        splitters : List[BaseComponentSplitter]
+            The splitters to predict, all with the same components
+        fh : int
+            The forecasters horizon with the steps ahead to to predict
+
+        Returns
+        -------
+        Optional[Tuple[np.ndarray, np.ndarray, List[pd.Index]]]
+            The (series x horizon) predictions, the (series x horizon x
+            component) components and the index of each series, or None if the
+            splitters can not be predicted together
+        """
+        for splitter in splitters:
+            splitter._check_model()
+        models = [splitter.model for splitter in splitters]
+        settings = {
+            (m._n_obs, m.trend_degree, m.sp, m.n_harmonics, tuple(m._regressors))
+            for m in models
+        }
+        if len(settings) > 1 or models[0]._regressors:
+            return None
+
+        model = models[0]
+        design = model._get_design_matrix(
+            np.arange(model._n_obs, model._n_obs + fh), None
+        )
+        coef = np.concatenate([m.coef_ for m in models], axis=1)
+        mapping = splitters[0]._get_component_mapping(model.get_terms())
+        values = np.einsum("ht,ts,tc->shc", design, coef, mapping)
+        y_pred = values.sum(axis=2)
+        indexes = [m._get_future_index(fh) for m in models]
+        return y_pred, values, indexes
+
+    def _check_model(self):
+        """Checks that the model is a fitted single series linear forecaster."""
+        if not isinstance(self.model, LinearAdditiveForecaster):
+            raise TypeError(
+                f"The model must be a LinearAdditiveForecaster, got "
+                f"{self.model.__class__.__name__}."
+            )
+        self.model.check_is_fitted()
+        if self.model._columns is not None:
+            raise ValueError("The model must be fitted on a single series.")
+
+    def _get_component_mapping(self, terms: List[str]) -> np.ndarray:
+        """(term x component) indicator matrix of the component each term of
+        the model contributes to (trend, seasonality, drivers and holidays)."""
+        names = self.get_component_names()
+        positions = {name: i for i, name in enumerate(names)}
+        mapping = np.zeros((len(terms), len(names)))
+        for t, term in enumerate(terms):
+            if term in positions:
+                mapping[t, positions[term]] = 1.0
+        return mapping
+
+    def _get_components(self, names: List[str]) -> np.ndarray:
+        """(horizon x name) contributions of the terms of each component."""
+        terms = self.model.get_terms()
+        mapping = np.array([[term == name for name in names] for term in terms])
+        return self._contributions @ mapping.astype(float)
+
+    def _set_component_trend(self):
+        """Sets the trend component of the forecast (self.component_trend)"""
+        self.component_trend = pd.Series(
+            self._get_components(["trend"])[:, 0], index=self.y_pred.index, name="trend"
+        )
+
+    def _set_component_seasonality(self):
+        """Sets the seasonal component of the forecast (self.component_seasonality)"""
+        self.component_seasonality = pd.Series(
+            self._get_components(["seasonality"])[:, 0],
+            index=self.y_pred.index,
+            name="seasonality",
+        )
+
+    def _set_component_drivers(self):
+        """Sets the driver components of the forecast (self.component_drivers)"""
+        self.component_drivers = pd.DataFrame(
+            self._get_components(self.drivers or []),
+            index=self.y_pred.index,
+            columns=self.drivers or [],
+        )
+
+    def _set_component_holidays(self):
+        """Sets the holiday components of the forecast (self.component_holidays)"""
+        self.component_holidays = pd.DataFrame(
+            self._get_components(self.holidays or []),
+            index=self.y_pred.index,
+            columns=self.holidays or [],
+        )
+
+    def _set_component_others(self):
+        """Sets the other (unknown and/or model specific) components of the
+        forecast (self.component_others), i.e. the regressors which are neither
+        drivers nor holidays"""
+        known = set(self.get_component_names())
+        others = [name for name in self.model._regressors if name not in known]
+        self.component_others = pd.DataFrame(
+            self._get_components(others), index=self.y_pred.index, columns=others
+        )
@@ -0,0 +1,209 @@
+"""Component splitting of many series at once.
+
+The components of all the series are returned as a single (series x horizon x
+component) array. Splitters able to vectorize their predictions (see
+`BaseComponentSplitter._predict_panel`) are predicted in bulk; the others are
+predicted one at a time, optionally across a pool of processes.
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Hashable, List, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ds_lib_template.forecasting.components.base import BaseComponentSplitter
+
+
+class PanelComponents:
+    def __init__(
+        self,
+        series: pd.Index,
+        components: pd.Index,
+        y_pred: np.ndarray,
+        values: np.ndarray,
+        indexes: List[pd.Index],
+    ):
+        """Components of the forecasts of many series
+
+        Parameters
+        ----------
+        series : pd.Index
+            Ids of the series
+        components : pd.Index
+            Names of the components
+        y_pred : np.ndarray
+            The (series x horizon) predictions
+        values : np.ndarray
+            The (series x horizon x component) components
+        indexes : List[pd.Index]
+            The future index of each series
+        """
+        self.series = series
+        self.components = components
+        self.y_pred = y_pred
+        self.values = values
+        self.indexes = indexes
+
+    def __len__(self) -> int:
+        return len(self.series)
+
+    def get_series(self, series_id: Hashable) -> Tuple[pd.Series, pd.DataFrame]:
+        """Returns the prediction and components of a single series, as returned
+        by `BaseComponentSplitter.predict`.
+
+        Parameters
+        ----------
+        series_id : Hashable
+            Id of the series
+
+        Returns
+        -------
+        Tuple[pd.Series, pd.DataFrame]
+            The predictions and the components
+        """
+        i = self.series.get_loc(series_id)
+        index = self.indexes[i]
+        return (
+            pd.Series(self.y_pred[i], index=index),
+            pd.DataFrame(self.values[i], index=index, columns=self.components),
+        )
+
+    def to_long(self) -> pd.DataFrame:
+        """Returns the predictions and components of all the series in long
+        format (one row per series and period).
+
+        Returns
+        -------
+        pd.DataFrame
+            The "series", "period", "horizon" and "y_pred" columns, followed by
+            one column per component
+        """
+        n_series, fh = self.y_pred.shape
+        data = {
+            "series": np.repeat(self.series.to_numpy(), fh),
+            "period": np.concatenate([np.asarray(index) for index in self.indexes]),
+            "horizon": np.tile(np.arange(1, fh + 1), n_series),
+            "y_pred": self.y_pred.ravel(),
+        }
+        long_data = pd.DataFrame(data)
+        components = pd.DataFrame(
+            self.values.reshape(n_series * fh, -1), columns=self.components
+        )
+        return pd.concat([long_data, components], axis=1)
+
+
+class PanelComponentSplitter:
+    def __init__(
+        self,
+        splitters: Mapping[Hashable, BaseComponentSplitter],
+        n_jobs: int = 1,
+        batch_size: Optional[int] = None,
+    ):
+        """Splits the forecasts of many series into their components
+
+        Parameters
+        ----------
+        splitters : Mapping[Hashable, BaseComponentSplitter]
+            Component splitters (wrapping fitted models) by series id. All the
+            splitters must have the same components.
+        n_jobs : int, optional
+            Number of processes used for the splitters which can not be
+            predicted in bulk. If 1, they are predicted in the main process,
+            by default 1. Use -1 for the number of CPUs.
+        batch_size : Optional[int], optional
+            Number of splitters sent to a process per task, by default None
+            (about 4 tasks per process)
+        """
+        self.splitters = splitters
+        self.n_jobs = n_jobs
+        self.batch_size = batch_size
+
+    def predict(self, fh: int) -> PanelComponents:
+        """Predicts the future values of all the series along with their
+        components.
+
+        Parameters
+        ----------
+        fh : int
+            The forecasters horizon with the steps ahead to to predict
+
+        Returns
+        -------
+        PanelComponents
+            The predictions and components of all the series
+
+        Raises
+        ------
+        ValueError
+            If the splitters do not all have the same components
+        """
+        series = pd.Index(list(self.splitters))
+        splitters = [self.splitters[series_id] for series_id in series]
+        if not splitters:
+            raise ValueError("At least one splitter is needed.")
+        names = splitters[0].get_component_names()
+        for series_id, splitter in zip(series, splitters):
+            if splitter.get_component_names() != names:
+                raise ValueError(
+                    f"All the splitters must have the same components; the "
+                    f"components of series '{series_id}' differ from {names}."
+                )
+
+        result = None
+        if len({type(splitter) for splitter in splitters}) == 1:
+            result = type(splitters[0])._predict_panel(splitters, fh)
+        if result is None:
+            # The components may include model specific ("others") columns
+            y_pred, values, indexes, names = self._predict_each(splitters, fh)
+        else:
+            y_pred, values, indexes = result
+        return PanelComponents(series, pd.Index(names), y_pred, values, indexes)
+
+    def _predict_each(
+        self, splitters: List[BaseComponentSplitter], fh: int
+    ) -> Tuple[np.ndarray, np.ndarray, List[pd.Index], List[str]]:
+        """Predicts the splitters one at a time (across processes if needed)."""
+        n_jobs = self.n_jobs if self.n_jobs != -1 else os.cpu_count() or 1
+        if n_jobs == 1:
+            results = _predict_batch(splitters, fh)
+        else:
+            batch_size = self.batch_size or max(
+                1, math.ceil(len(splitters) / (n_jobs * 4))
+            )
+            batches = [
+                splitters[i : i + batch_size]
+                for i in range(0, len(splitters), batch_size)
+            ]
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                futures = [executor.submit(_predict_batch, b, fh) for b in batches]
+                results = [r for future in futures for r in future.result()]
+
+        names = results[0][3]
+        if any(r[3] != names for r in results):
+            raise ValueError("All the splitters must return the same components.")
+        y_pred = np.stack([r[0] for r in results])
+        values = np.stack([r[1] for r in results])
+        indexes = [r[2] for r in results]
+        return y_pred, values, indexes, names
+
+
+def _predict_batch(
+    splitters: List[BaseComponentSplitter], fh: int
+) -> List[Tuple[np.ndarray, np.ndarray, pd.Index, List[str]]]:
+    """Predicts a batch of splitters, returning the predictions, components,
+    index and component names of each one."""
+    results = []
+    for splitter in splitters:
+        y_pred, components = splitter.predict(fh=fh)
+        results.append(
+            (
+                y_pred.to_numpy(dtype=float),
+                components.to_numpy(dtype=float),
+                y_pred.index,
+                components.columns.tolist(),
+            )
+        )
+    return results
@@ -0,0 +1,173 @@
+"""Rolling origin evaluation (backtesting) of forecasters.
+
+The forecaster is trained on each window of a splitter and evaluated on the
+observations following the cutoff. When consecutive windows share their start
+(expanding windows) and the forecaster can update its fitted state
+incrementally, it is fitted once and then updated with the observations between
+the cutoffs instead of being refitted on the full window. The cutoffs can be
+processed in parallel, each process handling a contiguous block of cutoffs.
+"""
+
+import copy
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from ds_lib_template.forecasting.evaluation.metrics import METRICS
+from ds_lib_template.forecasting.evaluation.splitters import (
+    BaseWindowSplitter,
+    Window,
+)
+from ds_lib_template.forecasting.model.base import BaseForecaster
+
+Target = Union[pd.Series, pd.DataFrame]
+
+
+def backtest(
+    forecaster: BaseForecaster,
+    y: Target,
+    splitter: BaseWindowSplitter,
+    X: Optional[pd.DataFrame] = None,
+    metrics: Sequence[str] = ("mae", "mape", "smape", "rmse"),
+    n_jobs: int = 1,
+    return_predictions: bool = False,
+) -> Union[pd.DataFrame, Tuple[pd.DataFrame, pd.DataFrame]]:
+    """Evaluates a forecaster on all the windows of a splitter.
+
+    Parameters
+    ----------
+    forecaster : BaseForecaster
+        The forecaster to evaluate (copied for each block of cutoffs, it is
+        not fitted by the backtest)
+    y : Target
+        The target time series, or a DataFrame with one column per series for
+        forecasters predicting many series at once (e.g. PanelNaiveForecaster)
+    splitter : BaseWindowSplitter
+        Defines the training windows and the horizon
+    X : Optional[pd.DataFrame], optional
+        Exogenous variables (aligned with `y`), by default None
+    metrics : Sequence[str], optional
+        Metrics to compute, among "mae", "mape", "smape" and "rmse",
+        by default all of them
+    n_jobs : int, optional
+        Number of processes used to run the cutoffs. If 1, everything runs in
+        the main process, by default 1. Use -1 for the number of CPUs.
+    return_predictions : bool, optional
+        Whether to also return the predictions, by default False
+
+    Returns
+    -------
+    Union[pd.DataFrame, Tuple[pd.DataFrame, pd.DataFrame]]
+        The errors, indexed by series and horizon (step ahead) with one column
+        per metric. If `return_predictions` is True, also the predictions
+        indexed by cutoff (last training period) and horizon, with one column
+        per series.
+
+    Raises
+    ------
+    ValueError
+        If a metric is unknown or the series is too short for the splitter
+    """
+    unknown = set(metrics) - set(METRICS)
+    if unknown:
+        raise ValueError(
+            f"Unknown metrics {sorted(unknown)}. Valid metrics are {list(METRICS)}."
+        )
+    windows = splitter.split(len(y))
+    if not windows:
+        raise ValueError(
+            f"The series is too short for the splitter: at least "
+            f"{splitter.min_train_length + splitter.fh} observations are needed, "
+            f"got {len(y)}."
+        )
+
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+    n_jobs = max(1, min(n_jobs, len(windows)))
+    blocks = [list(b) for b in np.array_split(np.arange(len(windows)), n_jobs)]
+    args = (forecaster, y, X, splitter.fh)
+    if n_jobs == 1:
+        y_pred = _run_windows(*args, windows)
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            futures = [
+                executor.submit(_run_windows, *args, [windows[i] for i in block])
+                for block in blocks
+            ]
+            y_pred = np.concatenate([future.result() for future in futures])
+
+    # Test windows as a (cutoff x horizon x series) block
+    values = _as_2d(y)
+    positions = np.array([cutoff for _, cutoff in windows])[:, None]
+    y_true = values[positions + np.arange(splitter.fh)]
+
+    columns = y.columns if isinstance(y, pd.DataFrame) else pd.Index([y.name])
+    horizons = np.arange(1, splitter.fh + 1)
+    errors = pd.DataFrame(
+        {name: METRICS[name](y_true, y_pred, axis=0).T.ravel() for name in metrics},
+        index=pd.MultiIndex.from_product(
+            [columns, horizons], names=["series", "horizon"]
+        ),
+    )
+    if not return_predictions:
+        return errors
+
+    cutoffs = y.index[positions[:, 0] - 1]
+    predictions = pd.DataFrame(
+        y_pred.reshape(-1, y_pred.shape[-1]),
+        index=pd.MultiIndex.from_product(
+            [cutoffs, horizons], names=["cutoff", "horizon"]
+        ),
+        columns=columns,
+    )
+    return errors, predictions
+
+
+def _as_2d(y: Target) -> np.ndarray:
+    """Values of the target as a (time x series) float array."""
+    return np.asarray(y, dtype=float).reshape(len(y), -1)
+
+
+def _supports_update(forecaster: BaseForecaster) -> bool:
+    """Whether the forecaster updates its fitted state incrementally (instead
+    of refitting on the full history)."""
+    return type(forecaster)._update is not BaseForecaster._update
+
+
+def _run_windows(
+    forecaster: BaseForecaster,
+    y: Target,
+    X: Optional[pd.DataFrame],
+    fh: int,
+    windows: List[Window],
+) -> np.ndarray:
+    """Predicts the `fh` observations after each cutoff of a block of windows.
+    Returns a (cutoff x horizon x series) array."""
+    incremental = _supports_update(forecaster)
+    n_series = _as_2d(y[:1]).shape[1]
+    y_pred = np.empty((len(windows), fh, n_series))
+
+    model, previous = None, None
+    for i, (start, cutoff) in enumerate(windows):
+        if model is not None and incremental and start == previous[0]:
+            model.update(
+                y.iloc[previous[1] : cutoff],
+                X_new=None if X is None else X.iloc[previous[1] : cutoff],
+            )
+        else:
+            model = copy.deepcopy(forecaster)
+            # The history is not needed when the model is updated incrementally
+            if incremental:
+                model.store_history = False
+            model.fit(
+                y=y.iloc[start:cutoff],
+                X=None if X is None else X.iloc[start:cutoff],
+                fh=fh,
+            )
+        X_future = None if X is None else X.iloc[cutoff : cutoff + fh]
+        y_pred[i] = _as_2d(model.predict(fh=fh, X=X_future))
+        previous = (start, cutoff)
+    return y_pred
@@ -0,0 +1,136 @@
+"""Vectorized forecast error metrics.
+
+All the metrics ignore pairs where the true or predicted value is missing and
+reduce along a single axis, so that the errors of many series and horizons are
+computed in one call.
+"""
+
+from typing import Callable, Dict, Optional, Union
+
+import numpy as np
+
+ArrayOrFloat = Union[float, np.ndarray]
+
+
+def _mean(values: np.ndarray, axis: Optional[int]) -> ArrayOrFloat:
+    """Mean ignoring missing values (NaN if there are no values)."""
+    valid = ~np.isnan(values)
+    total = np.where(valid, values, 0.0).sum(axis=axis)
+    count = valid.sum(axis=axis)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (total / np.where(count > 0, count, np.nan))[()]
+
+
+def _errors(y_true: np.ndarray, y_pred: np.ndarray):
+    """Float arrays of the true values and the prediction errors."""
+    y_true = np.asarray(y_true, dtype=float)
+    y_pred = np.asarray(y_pred, dtype=float)
+    return y_true, y_pred, y_pred - y_true
+
+
+def mean_absolute_error(
+    y_true: np.ndarray, y_pred: np.ndarray, axis: Optional[int] = None
+) -> ArrayOrFloat:
+    """Mean absolute error (MAE).
+
+    Parameters
+    ----------
+    y_true : np.ndarray
+        True values
+    y_pred : np.ndarray
+        Predicted values (same shape as `y_true`)
+    axis : Optional[int], optional
+        Axis along which the errors are averaged, by default None (all)
+
+    Returns
+    -------
+    ArrayOrFloat
+        The mean absolute error
+    """
+    _, _, errors = _errors(y_true, y_pred)
+    return _mean(np.abs(errors), axis)
+
+
+def mean_absolute_percentage_error(
+    y_true: np.ndarray, y_pred: np.ndarray, axis: Optional[int] = None
+) -> ArrayOrFloat:
+    """Mean absolute percentage error (MAPE), as a fraction. Zero true values
+    give an infinite error, unless they are predicted exactly.
+
+    Parameters
+    ----------
+    y_true : np.ndarray
+        True values
+    y_pred : np.ndarray
+        Predicted values (same shape as `y_true`)
+    axis : Optional[int], optional
+        Axis along which the errors are averaged, by default None (all)
+
+    Returns
+    -------
+    ArrayOrFloat
+        The mean absolute percentage error
+    """
+    y_true, _, errors = _errors(y_true, y_pred)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ratios = np.where(errors == 0, 0.0, np.abs(errors) / np.abs(y_true))
+    return _mean(ratios, axis)
+
+
+def symmetric_mean_absolute_percentage_error(
+    y_true: np.ndarray, y_pred: np.ndarray, axis: Optional[int] = None
+) -> ArrayOrFloat:
+    """Symmetric mean absolute percentage error (sMAPE), as a fraction between
+    0 and 2. Pairs where both values are zero have no error.
+
+    Parameters
+    ----------
+    y_true : np.ndarray
+        True values
+    y_pred : np.ndarray
+        Predicted values (same shape as `y_true`)
+    axis : Optional[int], optional
+        Axis along which the errors are averaged, by default None (all)
+
+    Returns
+    -------
+    ArrayOrFloat
+        The symmetric mean absolute percentage error
+    """
+    y_true, y_pred, errors = _errors(y_true, y_pred)
+    scale = np.abs(y_true) + np.abs(y_pred)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ratios = np.where(scale > 0, 2 * np.abs(errors) / scale, 0.0)
+    ratios[np.isnan(errors)] = np.nan
+    return _mean(ratios, axis)
+
+
+def root_mean_squared_error(
+    y_true: np.ndarray, y_pred: np.ndarray, axis: Optional[int] = None
+) -> ArrayOrFloat:
+    """Root mean squared error (RMSE).
+
+    Parameters
+    ----------
+    y_true : np.ndarray
+        True values
+    y_pred : np.ndarray
+        Predicted values (same shape as `y_true`)
+    axis : Optional[int], optional
+        Axis along which the errors are averaged, by default None (all)
+
+    Returns
+    -------
+    ArrayOrFloat
+        The root mean squared error
+    """
+    _, _, errors = _errors(y_true, y_pred)
+    return np.sqrt(_mean(errors**2, axis))
+
+
+METRICS: Dict[str, Callable[..., ArrayOrFloat]] = {
+    "mae": mean_absolute_error,
+    "mape": mean_absolute_percentage_error,
+    "smape": symmetric_mean_absolute_percentage_error,
+    "rmse": root_mean_squared_error,
+}
@@ -0,0 +1,104 @@
+"""Rolling origin splitters defining the training windows of a backtest.
+
+The windows are given by positions: for a cutoff `c`, the forecaster is trained
+on `y[start:c]` and evaluated on the next `fh` observations `y[c:c + fh]`.
+"""
+
+from abc import ABC, abstractmethod
+from typing import List, Tuple
+
+Window = Tuple[int, int]
+
+
+class BaseWindowSplitter(ABC):
+    def __init__(self, fh: int = 1, step_length: int = 1):
+        """Initializes the splitter
+
+        Parameters
+        ----------
+        fh : int, optional
+            The forecasters horizon with the steps ahead to to predict,
+            by default 1
+        step_length : int, optional
+            Number of observations between consecutive cutoffs, by default 1
+        """
+        if fh < 1 or step_length < 1:
+            raise ValueError("`fh` and `step_length` must be positive.")
+        self.fh = fh
+        self.step_length = step_length
+
+    @property
+    @abstractmethod
+    def min_train_length(self) -> int:
+        """Number of observations before the first cutoff."""
+
+    @abstractmethod
+    def _get_start(self, cutoff: int) -> int:
+        """Position of the first training observation for a cutoff."""
+
+    def split(self, n_obs: int) -> List[Window]:
+        """Returns the training windows of a series.
+
+        Parameters
+        ----------
+        n_obs : int
+            Length of the series
+
+        Returns
+        -------
+        List[Window]
+            The (start, cutoff) positions of each training window, such that
+            every test window `[cutoff, cutoff + fh)` is within the series
+        """
+        cutoffs = range(self.min_train_length, n_obs - self.fh + 1, self.step_length)
+        return [(self._get_start(cutoff), cutoff) for cutoff in cutoffs]
+
+
+class ExpandingWindowSplitter(BaseWindowSplitter):
+    def __init__(self, fh: int = 1, initial_window: int = 10, step_length: int = 1):
+        """Splitter whose training windows all start at the first observation
+
+        Parameters
+        ----------
+        fh : int, optional
+            The forecasters horizon with the steps ahead to to predict,
+            by default 1
+        initial_window : int, optional
+            Length of the first training window, by default 10
+        step_length : int, optional
+            Number of observations between consecutive cutoffs, by default 1
+        """
+        self.initial_window = initial_window
+        super(ExpandingWindowSplitter, self).__init__(fh=fh, step_length=step_length)
+
+    @property
+    def min_train_length(self) -> int:
+        return self.initial_window
+
+    def _get_start(self, cutoff: int) -> int:
+        return 0
+
+
+class SlidingWindowSplitter(BaseWindowSplitter):
+    def __init__(self, fh: int = 1, window_length: int = 10, step_length: int = 1):
+        """Splitter whose training windows all have the same length
+
+        Parameters
+        ----------
+        fh : int, optional
+            The forecasters horizon with the steps ahead to to predict,
+            by default 1
+        window_length : int, optional
+            Length of the training windows, by default 10
+        step_length : int, optional
+            Number of observations between consecutive cutoffs, by default 1
+        """
+        self.window_length = window_length
+        super(SlidingWindowSplitter, self).__init__(fh=fh, step_length=step_length)
+
+    @property
+    def min_train_length(self) -> int:
+        return self.window_length
+
+    def _get_start(self, cutoff: int) -> int:
+        return cutoff - self.window_length
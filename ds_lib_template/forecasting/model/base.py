@@ -7,18 +7,44 @@ from typing import Optional
 
 import pandas as pd
 
+from ds_lib_template.utils.cache import LRUCache
+from ds_lib_template.utils.instrumentation import instrument_methods
+
+# Stages timed when the instrumentation is enabled
+STAGES = ("_fit", "_predict", "_update")
+
 
 class BaseForecaster(ABC):
-    def __init__(self):
+    # Future indexes shared by all the forecasters, keyed by the last training
+    # period, its frequency and the horizon
+    _future_index_cache = LRUCache(maxsize=1024)
+
+    def __init__(self, store_history: bool = True):
+        """Initializes the forecaster
+
+        Parameters
+        ----------
+        store_history : bool, optional
+            Whether to keep the training data (and the data passed to
+            `update`) in memory, by default True. Forecasters that do not
+            implement `_update` need the history to be updated.
+        """
         self.model = None
         self._is_fitted = False
+        self.store_history = store_history
 
         self._y = None
         self._X = None
+        # Last time period seen in the training data
+        self._cutoff = None
 
         # forecasting horizon
         self._fh = None
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        instrument_methods(cls, STAGES)
+
     @property
     def is_fitted(self):
         """Whether `fit` has been called.
@@ -45,15 +71,88 @@ class BaseForecaster(ABC):
         BaseForecaster
             returns an instance of self for chaining
         """
-        self._y = y
-        self._X = X
+        self._y = y if self.store_history else None
+        self._X = X if self.store_history else None
         self._fh = fh
+        self._cutoff = y.index[-1]
 
         self._fit(y, X, fh)
 
         self._is_fitted = True
         return self
 
+    def update(
+        self, y_new: pd.Series, X_new: Optional[pd.DataFrame] = None
+    ) -> "BaseForecaster":
+        """Update the fitted forecaster with new data following the training
+        data, without refitting on the full history when the forecaster
+        supports it.
+
+        Parameters
+        ----------
+        y_new : pd.Series
+            New observations of the target time series (after the cutoff).
+        X_new : pd.DataFrame, optional
+            New observations of the exogenous variables, by default None
+
+        Returns
+        -------
+        BaseForecaster
+            returns an instance of self for chaining
+
+        Raises
+        ------
+        ValueError
+            If the new data does not start after the last training period
+        """
+        self.check_is_fitted()
+        if len(y_new) == 0:
+            return self
+        if y_new.index[0] <= self._cutoff:
+            raise ValueError(
+                f"The new data must start after the last training period "
+                f"({self._cutoff}), got {y_new.index[0]}."
+            )
+
+        if self.store_history:
+            self._y = pd.concat([self._y, y_new])
+            if self._X is not None and X_new is not None:
+                self._X = pd.concat([self._X, X_new])
+        self._update(y_new, X_new)
+        self._cutoff = y_new.index[-1]
+        return self
+
+    def _update(
+        self, y_new: pd.Series, X_new: Optional[pd.DataFrame] = None
+    ) -> "BaseForecaster":
+        """Update the fitted forecaster with new data. Refits on the full
+        history by default; forecasters able to update their fitted state
+        incrementally should override it.
+
+        Parameters
+        ----------
+        y_new : pd.Series
+            New observations of the target time series.
+        X_new : pd.DataFrame, optional
+            New observations of the exogenous variables, by default None
+
+        Returns
+        -------
+        BaseForecaster
+            Returns an instance of self for chaining
+
+        Raises
+        ------
+        NotImplementedError
+            If the history is not stored
+        """
+        if not self.store_history:
+            raise NotImplementedError(
+                f"{self.__class__.__name__} can not be updated incrementally; "
+                f"use `store_history=True` to refit on the full history."
+            )
+        return self._fit(self._y, self._X, self._fh)
+
     @abstractmethod
     def _fit(
         self, y: pd.Series, X: Optional[pd.DataFrame] = None, fh=None
@@ -108,6 +207,33 @@ class BaseForecaster(ABC):
             Exogenous variables, by default None
         """
 
+    def _get_future_index(self, fh: int) -> pd.PeriodIndex:
+        """Returns the index of the `fh` periods following the training data.
+        Indexes are cached (and shared) across all the forecasters.
+
+        Parameters
+        ----------
+        fh : int
+            The forecasters horizon with the steps ahead to to predict
+
+        Returns
+        -------
+        pd.PeriodIndex
+            The future time periods
+        """
+        last = self._cutoff
+        key = (last, getattr(last, "freqstr", None), fh)
+        future_index = self._future_index_cache.get(key)
+        if future_index is None:
+            future_index = pd.period_range(start=last, periods=fh + 1)[1:]
+            self._future_index_cache.put(key, future_index)
+        return future_index
+
+    @classmethod
+    def clear_future_index_cache(cls):
+        """Removes all the cached future indexes."""
+        cls._future_index_cache.clear()
+
     def check_is_fitted(self):
         """Check if the estimator has been fitted.
         Raises
@@ -122,6 +248,9 @@ class BaseForecaster(ABC):
             )
 
 
+instrument_methods(BaseForecaster, STAGES)
+
+
 class NotFittedError(ValueError, AttributeError):
     """Exception class to raise if estimator is used before fitting.
     This class inherits from both ValueError and AttributeError to help with
@@ -0,0 +1,187 @@
+"""Linear additive forecaster: polynomial trend + Fourier seasonality +
+exogenous regressors (drivers, holidays), fitted by least squares.
+
+Several series (the columns of a DataFrame) sharing the same regressors are
+fitted together: they share the design matrix, which is factorized once for
+all the series with the same missing observations.
+"""
+
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from ds_lib_template.forecasting.model.base import BaseForecaster
+
+Target = Union[pd.Series, pd.DataFrame]
+
+
+class LinearAdditiveForecaster(BaseForecaster):
+    def __init__(
+        self,
+        trend_degree: int = 1,
+        sp: Optional[int] = None,
+        n_harmonics: Optional[int] = None,
+        store_history: bool = True,
+    ):
+        """Initializes the Linear Additive Forecaster
+
+        Parameters
+        ----------
+        trend_degree : int, optional
+            Degree of the polynomial trend (0 for a constant level), by default 1
+        sp : Optional[int], optional
+            Seasonal periodicity, by default None (no seasonality)
+        n_harmonics : Optional[int], optional
+            Number of Fourier harmonics of the seasonality, by default None
+            (sp // 2, i.e. any seasonal pattern)
+        store_history : bool, optional
+            Whether to keep the training data in memory, by default True
+        """
+        if trend_degree < 0:
+            raise ValueError("`trend_degree` must be non-negative.")
+        self.trend_degree = trend_degree
+        self.sp = sp
+        self.n_harmonics = n_harmonics
+
+        # Number of training observations, regressors and the (term x series)
+        # coefficients
+        self._n_obs: Optional[int] = None
+        self._regressors: Optional[List[str]] = None
+        self._columns: Optional[pd.Index] = None
+        self.coef_: Optional[np.ndarray] = None
+
+        super(LinearAdditiveForecaster, self).__init__(store_history=store_history)
+
+    def get_terms(self) -> List[str]:
+        """Returns the component each term (column of the design matrix and row
+        of `coef_`) belongs to: "trend", "seasonality" or the name of a
+        regressor.
+
+        Returns
+        -------
+        List[str]
+            The component of each term
+        """
+        return (
+            ["trend"] * (self.trend_degree + 1)
+            + ["seasonality"] * len(self._get_harmonics())
+            + list(self._regressors or [])
+        )
+
+    def _get_harmonics(self) -> List[Tuple[str, int]]:
+        """Fourier terms as (function, harmonic) pairs. The sine of the
+        Nyquist harmonic (always zero) is left out."""
+        if not self.sp or self.sp < 2:
+            return []
+        n_harmonics = self.n_harmonics or self.sp // 2
+        harmonics = []
+        for k in range(1, n_harmonics + 1):
+            harmonics.append(("cos", k))
+            if 2 * k != self.sp:
+                harmonics.append(("sin", k))
+        return harmonics
+
+    def _get_design_matrix(
+        self, positions: np.ndarray, X: Optional[pd.DataFrame]
+    ) -> np.ndarray:
+        """Design matrix of the given time positions (0 being the first
+        training observation)."""
+        # Positions are scaled to [0, 1] over the training data to keep the
+        # polynomial terms well conditioned
+        t = positions / max(self._n_obs - 1, 1)
+        columns = [t**degree for degree in range(self.trend_degree + 1)]
+        for function, k in self._get_harmonics():
+            angle = 2 * np.pi * k * positions / self.sp
+            columns.append(np.cos(angle) if function == "cos" else np.sin(angle))
+        if self._regressors:
+            if X is None or len(X) != len(positions):
+                raise ValueError(
+                    f"The regressors {self._regressors} are needed for all the "
+                    f"{len(positions)} periods."
+                )
+            columns.extend(X[self._regressors].to_numpy(dtype=float).T)
+        return np.column_stack(columns)
+
+    def _fit(
+        self, y: Target, X: Optional[pd.DataFrame] = None, fh: Optional[int] = None
+    ) -> "BaseForecaster":
+        """Fit to training data.
+
+        Parameters
+        ----------
+        y : Target
+            Target time series to which to fit the forecaster, or a DataFrame
+            with one column per series (missing observations as NaN).
+        X : pd.DataFrame, optional
+            Regressors (e.g. drivers and holidays), shared by all the series,
+            by default None
+        fh : Optional[int], optional
+            The forecasters horizon with the steps ahead to to predict, by default None
+
+        Returns
+        -------
+        BaseForecaster
+            Returns an instance of self for chaining
+        """
+        self._n_obs = len(y)
+        self._regressors = list(X.columns) if X is not None else []
+        self._columns = y.columns if isinstance(y, pd.DataFrame) else None
+
+        design = self._get_design_matrix(np.arange(self._n_obs), X)
+        values = np.asarray(y, dtype=float).reshape(self._n_obs, -1)
+        self.coef_ = _batched_lstsq(design, values)
+        return self
+
+    def _predict_terms(self, fh: int, X: Optional[pd.DataFrame] = None) -> np.ndarray:
+        """Contribution of each term to the forecasts, as a (horizon x term x
+        series) array."""
+        positions = np.arange(self._n_obs, self._n_obs + fh)
+        design = self._get_design_matrix(positions, X)
+        return design[:, :, None] * self.coef_[None, :, :]
+
+    def _predict(
+        self, fh: Optional[int] = None, X: Optional[pd.DataFrame] = None
+    ) -> Target:
+        """Forecast time series at future horizon.
+
+        Parameters
+        ----------
+        fh : Optional[int], optional
+            The forecasters horizon with the steps ahead to to predict, by default None
+        X : Optional[pd.DataFrame], optional
+            Future values of the regressors, by default None
+
+        Returns
+        -------
+        Target
+            Returns the predicted values (one column per series if the
+            forecaster was fitted on a DataFrame)
+        """
+        y_pred = self._predict_terms(fh, X).sum(axis=1)
+        index = self._get_future_index(fh)
+        if self._columns is None:
+            return pd.Series(y_pred[:, 0], index=index)
+        return pd.DataFrame(y_pred, index=index, columns=self._columns)
+
+
+def _batched_lstsq(design: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Least squares coefficients of many series sharing a design matrix,
+    ignoring missing values. The series with the same missing observations
+    are solved together with a single factorization. Returns a (term x
+    series) array (NaN for series whose observations do not determine the
+    coefficients, i.e. fewer observations than terms or collinear terms)."""
+    valid = ~np.isnan(values)
+    coef = np.full((design.shape[1], values.shape[1]), np.nan)
+    patterns, groups = np.unique(valid.T, axis=0, return_inverse=True)
+    for pattern, rows in enumerate(patterns):
+        columns = np.flatnonzero(groups.ravel() == pattern)
+        if rows.sum() < design.shape[1]:
+            continue
+        solution, _, rank, _ = np.linalg.lstsq(
+            design[rows], values[np.ix_(rows, columns)], rcond=None
+        )
+        # A rank deficient system has infinitely many (minimum-norm) solutions
+        if rank == design.shape[1]:
+            coef[:, columns] = solution
+    return coef
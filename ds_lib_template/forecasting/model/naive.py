@@ -1,12 +1,17 @@
-from typing import Optional
+from collections import defaultdict
+from typing import Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 
 from ds_lib_template.forecasting.model.base import BaseForecaster
+from ds_lib_template.utils import kernels
+
+STRATEGIES = ("last", "mean", "seasonal_last", "drift")
 
 
 class NaiveForecaster(BaseForecaster):
-    def __init__(self, strategy: str = "last"):
+    def __init__(self, strategy: str = "last", sp: int = 1, store_history: bool = True):
         """Initializes the Naive Forecaster
 
         Parameters
@@ -15,10 +20,25 @@ class NaiveForecaster(BaseForecaster):
             The strategy to use for the Naive Forecaster, by default "last"
             "last": Forecast = last known value for all period
             "mean": Forecast = mean for all historical data
+            "seasonal_last": Forecast = last known value of the same season
+            "drift": Forecast = line through the first and last known values
+        sp : int, optional
+            Seasonal periodicity (only used with "seasonal_last"), by default 1
+        store_history : bool, optional
+            Whether to keep the training data in memory, by default True. The
+            forecaster can be updated without it.
         """
+        if strategy not in STRATEGIES:
+            raise ValueError(
+                f"Unknown strategy '{strategy}'. Valid strategies are {STRATEGIES}."
+            )
         self.strategy = strategy
+        self.sp = sp
+
+        # Sufficient statistics of the training data (per series arrays)
+        self._state: Optional[Dict[str, np.ndarray]] = None
 
-        super(NaiveForecaster, self).__init__()
+        super(NaiveForecaster, self).__init__(store_history=store_history)
 
     def _fit(
         self, y: pd.Series, X: Optional[pd.DataFrame] = None, fh: Optional[int] = None
@@ -39,7 +59,29 @@ class NaiveForecaster(BaseForecaster):
         BaseForecaster
             Returns an instance of self for chaining
         """
+        self._state = _naive_state(y.to_numpy(dtype=float)[:, None], self.sp)
+        return self
 
+    def _update(
+        self, y_new: pd.Series, X_new: Optional[pd.DataFrame] = None
+    ) -> "BaseForecaster":
+        """Update the sufficient statistics with new data.
+
+        Parameters
+        ----------
+        y_new : pd.Series
+            New observations of the target time series.
+        X_new : pd.DataFrame, optional
+            New observations of the exogenous variables, by default None
+
+        Returns
+        -------
+        BaseForecaster
+            Returns an instance of self for chaining
+        """
+        self._state = _update_naive_state(
+            self._state, y_new.to_numpy(dtype=float)[:, None], self.sp
+        )
         return self
 
     def _predict(
@@ -59,11 +101,101 @@ class NaiveForecaster(BaseForecaster):
         pd.Series
             Returns an predicted values
         """
-        future_time_periods = pd.period_range(start=self._y.index[-1], periods=fh + 1)[
-            1:
-        ]
-        if self.strategy == "last":
-            y_pred = pd.Series([self._y[-1]] * fh, index=future_time_periods)
-        elif self.strategy == "mean":
-            y_pred = pd.Series([self._y.mean()] * fh, index=future_time_periods)
-        return y_pred
+        y_pred = _naive_forecast(self._state, self.strategy, self.sp, fh)
+        return pd.Series(y_pred[:, 0], index=self._get_future_index(fh))
+
+
+def _naive_statistics(values: np.ndarray) -> Dict[str, np.ndarray]:
+    """Sufficient statistics of the non seasonal naive strategies for a 2-D
+    (time x series) array. Missing values are ignored. Computed in a single
+    pass when the compiled kernels are enabled (see `utils.kernels`)."""
+    return {"n_obs": np.array(values.shape[0]), **kernels.naive_statistics(values)}
+
+
+def _naive_state(values: np.ndarray, sp: int) -> Dict[str, np.ndarray]:
+    """Sufficient statistics of the naive strategies for a 2-D (time x series)
+    array. Missing values are ignored."""
+    n_obs = values.shape[0]
+    if n_obs < sp:
+        raise ValueError(
+            f"At least sp={sp} observations are needed, got {n_obs} observations."
+        )
+    state = _naive_statistics(values)
+    state["season"] = values[n_obs - sp :].copy()
+    return state
+
+
+def _update_naive_state(
+    state: Dict[str, np.ndarray], values: np.ndarray, sp: int
+) -> Dict[str, np.ndarray]:
+    """Merges the sufficient statistics of new observations (2-D time x
+    series array following the data `state` was computed on) into `state`."""
+    new = _naive_statistics(values)
+    n_obs = state["n_obs"]
+    seen = state["count"] > 0
+    has_values = new["count"] > 0
+    return {
+        "n_obs": n_obs + new["n_obs"],
+        "count": state["count"] + new["count"],
+        "sum": state["sum"] + new["sum"],
+        "first": np.where(seen, state["first"], new["first"]),
+        "first_pos": np.where(seen, state["first_pos"], n_obs + new["first_pos"]),
+        "last": np.where(has_values, new["last"], state["last"]),
+        "last_pos": np.where(has_values, n_obs + new["last_pos"], state["last_pos"]),
+        "season": np.concatenate([state["season"], values])[-sp:],
+    }
+
+
+def _naive_forecast(
+    state: Dict[str, np.ndarray], strategy: str, sp: int, fh: int
+) -> np.ndarray:
+    """Forecasts all the series at once from their sufficient statistics.
+    Returns a 2-D (horizon x series) array."""
+    n_series = state["last"].shape[0]
+    y_pred = np.empty((fh, n_series))
+    if strategy == "last":
+        y_pred[:] = state["last"]
+    elif strategy == "mean":
+        with np.errstate(invalid="ignore", divide="ignore"):
+            y_pred[:] = state["sum"] / state["count"]
+    elif strategy == "seasonal_last":
+        y_pred[:] = state["season"][np.arange(fh) % sp]
+    elif strategy == "drift":
+        steps = state["last_pos"] - state["first_pos"]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            slope = np.where(steps > 0, (state["last"] - state["first"]) / steps, 0.0)
+        # The forecast starts from the end of the data, even if the last
+        # values of a series are missing
+        offset = state["n_obs"] - 1 - state["last_pos"]
+        horizon = np.arange(1, fh + 1)[:, None]
+        y_pred[:] = state["last"] + (horizon + offset) * slope
+    return y_pred
+
+
+def _stack_naive_states(states: List[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    """Sufficient statistics of many series (possibly of different lengths)
+    as a single panel state, one column per state."""
+    stacked = {
+        name: np.concatenate([state[name] for state in states])
+        for name in ("count", "sum", "first", "first_pos", "last", "last_pos")
+    }
+    stacked["n_obs"] = np.concatenate(
+        [np.broadcast_to(state["n_obs"], state["last"].shape) for state in states]
+    )
+    stacked["season"] = np.concatenate([state["season"] for state in states], axis=1)
+    return stacked
+
+
+def _forecast_naive_models(models: List["NaiveForecaster"], fh: int) -> np.ndarray:
+    """Forecasts many fitted naive forecasters at once, the ones sharing a
+    strategy and seasonal periodicity being forecasted as a single panel.
+    Returns a 2-D (horizon x model) array."""
+    groups = defaultdict(list)
+    for j, model in enumerate(models):
+        groups[(model.strategy, model.sp)].append(j)
+
+    y_pred = np.empty((fh, len(models)))
+    for (strategy, sp), columns in groups.items():
+        state = _stack_naive_states([models[j]._state for j in columns])
+        y_pred[:, columns] = _naive_forecast(state, strategy, sp, fh)
+    return y_pred
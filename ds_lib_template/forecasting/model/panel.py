@@ -0,0 +1,155 @@
+"""Batched (panel) version of the naive forecaster.
+
+All the series (columns of a wide DataFrame) are fitted and forecasted at once:
+the forecasts are produced as a single 2-D NumPy block and the future index is
+built once and shared by all the series.
+"""
+
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from ds_lib_template.forecasting.model.base import BaseForecaster
+from ds_lib_template.forecasting.model.naive import (
+    STRATEGIES,
+    _naive_forecast,
+    _naive_state,
+    _update_naive_state,
+)
+from ds_lib_template.utils.panel import long_to_wide
+
+
+class PanelNaiveForecaster(BaseForecaster):
+    def __init__(self, strategy: str = "last", sp: int = 1, store_history: bool = True):
+        """Initializes the Panel Naive Forecaster
+
+        Parameters
+        ----------
+        strategy : str, optional
+            The strategy to use for the Naive Forecaster, by default "last"
+            "last": Forecast = last known value for all period
+            "mean": Forecast = mean for all historical data
+            "seasonal_last": Forecast = last known value of the same season
+            "drift": Forecast = line through the first and last known values
+        sp : int, optional
+            Seasonal periodicity (only used with "seasonal_last"), by default 1
+        store_history : bool, optional
+            Whether to keep the training data in memory, by default True. The
+            forecaster can be updated without it.
+        """
+        if strategy not in STRATEGIES:
+            raise ValueError(
+                f"Unknown strategy '{strategy}'. Valid strategies are {STRATEGIES}."
+            )
+        self.strategy = strategy
+        self.sp = sp
+
+        # Sufficient statistics of the training data (per series arrays)
+        self._state: Optional[Dict[str, np.ndarray]] = None
+        self._columns: Optional[pd.Index] = None
+
+        super(PanelNaiveForecaster, self).__init__(store_history=store_history)
+
+    def fit_long(
+        self,
+        data: pd.DataFrame,
+        group_col: str,
+        value_col: str,
+        index_col: str,
+        **kwargs: Any,
+    ) -> "BaseForecaster":
+        """Fit to training data in long format (one row per series and time).
+
+        Parameters
+        ----------
+        data : pd.DataFrame
+            Long training data
+        group_col : str
+            Column identifying the series each row belongs to
+        value_col : str
+            Column containing the target values
+        index_col : str
+            Column containing the time (period) of each observation
+        **kwargs : Any
+            Additional arguments passed to `fit`
+
+        Returns
+        -------
+        BaseForecaster
+            returns an instance of self for chaining
+        """
+        wide, _, _ = long_to_wide(data, group_col, value_col, index_col)
+        return self.fit(y=wide, **kwargs)
+
+    def _fit(
+        self,
+        y: pd.DataFrame,
+        X: Optional[pd.DataFrame] = None,
+        fh: Optional[int] = None,
+    ) -> "BaseForecaster":
+        """Fit to training data.
+
+        Parameters
+        ----------
+        y : pd.DataFrame
+            Target time series to which to fit the forecaster (one column per
+            series, missing observations as NaN).
+        X : pd.DataFrame, optional
+            Exogenous variables, by default None
+        fh : Optional[int], optional
+            The forecasters horizon with the steps ahead to to predict, by default None
+
+        Returns
+        -------
+        BaseForecaster
+            Returns an instance of self for chaining
+        """
+        self._state = _naive_state(y.to_numpy(dtype=float), self.sp)
+        self._columns = y.columns
+        return self
+
+    def _update(
+        self, y_new: pd.DataFrame, X_new: Optional[pd.DataFrame] = None
+    ) -> "BaseForecaster":
+        """Update the sufficient statistics of all the series with new data.
+
+        Parameters
+        ----------
+        y_new : pd.DataFrame
+            New observations of the target time series. Series missing from
+            `y_new` are treated as missing observations and series not seen
+            during `fit` are ignored.
+        X_new : pd.DataFrame, optional
+            New observations of the exogenous variables, by default None
+
+        Returns
+        -------
+        BaseForecaster
+            Returns an instance of self for chaining
+        """
+        values = y_new.reindex(columns=self._columns).to_numpy(dtype=float)
+        self._state = _update_naive_state(self._state, values, self.sp)
+        return self
+
+    def _predict(
+        self, fh: Optional[int] = None, X: Optional[pd.DataFrame] = None
+    ) -> pd.DataFrame:
+        """Forecast all the time series at future horizon.
+
+        Parameters
+        ----------
+        fh : Optional[int], optional
+            The forecasters horizon with the steps ahead to to predict, by default None
+        X : Optional[pd.DataFrame], optional
+            Exogenous variables, by default None
+
+        Returns
+        -------
+        pd.DataFrame
+            Returns the predicted values (one column per series)
+        """
+        y_pred = _naive_forecast(self._state, self.strategy, self.sp, fh)
+        return pd.DataFrame(
+            y_pred, index=self._get_future_index(fh), columns=self._columns
+        )
@@ -0,0 +1,251 @@
+"""Compact storage of many fitted naive forecasters.
+
+Only the sufficient state of each forecaster (strategy, seasonal periodicity,
+cutoff and the statistics used to forecast) is written, never the training
+data. The store is a directory with one `.npy` file per field, each holding the
+values of all the models, plus a small JSON file with the series ids and the
+frequencies. The arrays are memory-mapped when the store is opened, so a model
+is only read from disk when it is requested.
+
+Store layout
+------------
+models.json        series ids, frequencies and number of models (tuple ids
+                   are stored as {"tuple": [...]} to be read back as tuples)
+strategy.npy       (n_models,) index into `STRATEGIES`
+sp.npy             (n_models,) seasonal periodicities
+freq.npy           (n_models,) index into the frequencies
+cutoff.npy         (n_models,) ordinal of the last training period
+<statistic>.npy    (n_models,) one file per sufficient statistic
+season.npy         (sum(sp),) last season of all the models, concatenated
+season_start.npy   (n_models + 1,) offsets of each model in `season.npy`
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Hashable, Iterable, Iterator, List, Mapping, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from ds_lib_template.forecasting.model.naive import STRATEGIES, NaiveForecaster
+
+StorePath = Union[str, os.PathLike]
+
+# Per model scalar statistics of `_naive_state`
+_STATISTICS = (
+    "n_obs",
+    "count",
+    "sum",
+    "first",
+    "first_pos",
+    "last",
+    "last_pos",
+)
+_METADATA_FILE = "models.json"
+
+
+def _encode_id(series_id: Hashable):
+    """Converts a series id to a JSON value which is decoded back to an equal
+    id of the same type (NumPy scalars are stored as Python scalars)."""
+    if isinstance(series_id, np.generic):
+        series_id = series_id.item()
+    if isinstance(series_id, tuple):
+        return {"tuple": [_encode_id(value) for value in series_id]}
+    if series_id is None or isinstance(series_id, (str, bool, int, float)):
+        return series_id
+    raise TypeError(
+        f"Series ids must be strings, numbers or tuples of them, got "
+        f"{series_id!r} of type {series_id.__class__.__name__}."
+    )
+
+
+def _decode_id(value) -> Hashable:
+    """Inverse of `_encode_id`."""
+    if isinstance(value, dict):
+        return tuple(_decode_id(item) for item in value["tuple"])
+    return value
+
+
+def save_models(models: Mapping[Hashable, NaiveForecaster], path: StorePath):
+    """Writes the state of fitted naive forecasters to a model store.
+
+    Parameters
+    ----------
+    models : Mapping[Hashable, NaiveForecaster]
+        Fitted forecasters by series id. The ids must be strings, numbers
+        (including NumPy scalars, read back as Python scalars) or tuples of
+        them.
+    path : StorePath
+        Directory of the store (created if needed, existing files are
+        overwritten)
+
+    Raises
+    ------
+    TypeError
+        If a series id is not supported, or a model is not a `NaiveForecaster`
+        or was not fitted on data with a period index
+    """
+    ids = list(models)
+    encoded_ids = [_encode_id(series_id) for series_id in ids]
+    n_models = len(ids)
+    columns: Dict[str, np.ndarray] = {
+        "strategy": np.empty(n_models, dtype=np.int8),
+        "sp": np.empty(n_models, dtype=np.int64),
+        "freq": np.empty(n_models, dtype=np.int32),
+        "cutoff": np.empty(n_models, dtype=np.int64),
+    }
+    for name in _STATISTICS:
+        dtype = np.float64 if name in ("sum", "first", "last") else np.int64
+        columns[name] = np.empty(n_models, dtype=dtype)
+    seasons: List[np.ndarray] = []
+    frequencies: Dict[str, int] = {}
+
+    for i, series_id in enumerate(ids):
+        model = models[series_id]
+        if not isinstance(model, NaiveForecaster):
+            raise TypeError(
+                f"Only NaiveForecaster models can be stored, got "
+                f"{model.__class__.__name__} for series '{series_id}'."
+            )
+        model.check_is_fitted()
+        if not isinstance(model._cutoff, pd.Period):
+            raise TypeError(
+                f"The model of series '{series_id}' must be fitted on data with "
+                f"a period index."
+            )
+        freq = model._cutoff.freqstr
+        columns["strategy"][i] = STRATEGIES.index(model.strategy)
+        columns["sp"][i] = model.sp
+        columns["freq"][i] = frequencies.setdefault(freq, len(frequencies))
+        columns["cutoff"][i] = model._cutoff.ordinal
+        for name in _STATISTICS:
+            columns[name][i] = model._state[name].ravel()[0]
+        seasons.append(model._state["season"].ravel())
+
+    columns["season"] = np.concatenate(seasons) if seasons else np.empty(0)
+    columns["season_start"] = np.concatenate([[0], np.cumsum(columns["sp"])]).astype(
+        np.int64
+    )
+
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    for name, values in columns.items():
+        np.save(path / f"{name}.npy", values)
+    metadata = {
+        "n_models": n_models,
+        "ids": encoded_ids,
+        "frequencies": list(frequencies),
+    }
+    with open(path / _METADATA_FILE, "w") as file:
+        json.dump(metadata, file)
+
+
+class ModelStore:
+    def __init__(self, path: StorePath, mmap: bool = True):
+        """Opens a model store written by `save_models`. Models are built on
+        demand (by series id or in bulk).
+
+        Parameters
+        ----------
+        path : StorePath
+            Directory of the store
+        mmap : bool, optional
+            Whether to memory-map the arrays (only the requested models are
+            read from disk) instead of loading them in memory, by default True
+        """
+        self.path = Path(path)
+        with open(self.path / _METADATA_FILE) as file:
+            metadata = json.load(file)
+        self.ids: List[Hashable] = [_decode_id(value) for value in metadata["ids"]]
+        self._frequencies: List[str] = metadata["frequencies"]
+        self._positions = {series_id: i for i, series_id in enumerate(self.ids)}
+
+        mmap_mode = "r" if mmap else None
+        names = ("strategy", "sp", "freq", "cutoff", "season", "season_start")
+        self._columns = {
+            name: np.load(self.path / f"{name}.npy", mmap_mode=mmap_mode)
+            for name in names + _STATISTICS
+        }
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, series_id: Hashable) -> bool:
+        return series_id in self._positions
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self.ids)
+
+    def __getitem__(self, series_id: Hashable) -> NaiveForecaster:
+        """Returns the fitted forecaster of a series.
+
+        Parameters
+        ----------
+        series_id : Hashable
+            Id of the series
+
+        Returns
+        -------
+        NaiveForecaster
+            The fitted forecaster (without training history)
+
+        Raises
+        ------
+        KeyError
+            If there is no model for the series
+        """
+        return self.load([series_id])[series_id]
+
+    def load(
+        self, ids: Optional[Iterable[Hashable]] = None
+    ) -> Dict[Hashable, NaiveForecaster]:
+        """Builds the fitted forecasters of many series at once.
+
+        Parameters
+        ----------
+        ids : Optional[Iterable[Hashable]], optional
+            Ids of the series to load, by default None (all the series)
+
+        Returns
+        -------
+        Dict[Hashable, NaiveForecaster]
+            The fitted forecasters (without training history) by series id
+
+        Raises
+        ------
+        KeyError
+            If there is no model for one of the series
+        """
+        if ids is None:
+            ids = self.ids
+            positions = np.arange(len(self.ids))
+        else:
+            ids = list(ids)
+            positions = np.array([self._positions[i] for i in ids], dtype=np.int64)
+
+        # Gather the rows of all the requested models (a single read per file)
+        rows = {
+            name: np.asarray(self._columns[name][positions])
+            for name in ("strategy", "sp", "freq", "cutoff") + _STATISTICS
+        }
+        starts = np.asarray(self._columns["season_start"][positions])
+        season = self._columns["season"]
+
+        models = {}
+        for j, series_id in enumerate(ids):
+            sp = int(rows["sp"][j])
+            model = NaiveForecaster(
+                strategy=STRATEGIES[rows["strategy"][j]], sp=sp, store_history=False
+            )
+            state = {name: rows[name][j : j + 1] for name in _STATISTICS}
+            state["n_obs"] = np.array(rows["n_obs"][j])
+            state["season"] = np.array(season[starts[j] : starts[j] + sp])[:, None]
+            model._state = state
+            model._cutoff = pd.Period(
+                ordinal=int(rows["cutoff"][j]),
+                freq=self._frequencies[rows["freq"][j]],
+            )
+            model._is_fitted = True
+            models[series_id] = model
+        return models
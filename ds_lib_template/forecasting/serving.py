@@ -0,0 +1,359 @@
+"""Serving of fitted forecasters and component splitters with micro-batching.
+
+Concurrent prediction requests are queued and executed together: the server
+waits for at most `max_wait` seconds after the first request of a batch,
+groups the requests by model and runs a single prediction per model at the
+largest requested horizon (shorter horizons are prefixes of it). The
+`NaiveForecaster` models of a batch sharing a strategy and seasonal periodicity
+are further forecasted together as one NumPy block.
+
+Example
+-------
+>>> async def main():
+...     async with PredictionServer(models) as server:
+...         client = LocalClient(server)
+...         return await client.predict_many([("sku_1", 3), ("sku_2", 6)])
+>>> results = asyncio.run(main())
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+import pandas as pd
+
+from ds_lib_template.forecasting.components.base import BaseComponentSplitter
+from ds_lib_template.forecasting.model.base import BaseForecaster
+from ds_lib_template.forecasting.model.naive import (
+    NaiveForecaster,
+    _forecast_naive_models,
+)
+
+Model = Union[BaseForecaster, BaseComponentSplitter]
+Request = Tuple[Hashable, int]
+# Result (or exception) of each request of a batch
+Outcome = Tuple[Any, Optional[BaseException]]
+
+
+class _PendingRequest:
+    __slots__ = ("model_id", "fh", "future", "start")
+
+    def __init__(self, model_id: Hashable, fh: int, future: asyncio.Future):
+        self.model_id = model_id
+        self.fh = fh
+        self.future = future
+        self.start = time.perf_counter()
+
+
+class PredictionServer:
+    def __init__(
+        self,
+        models: Mapping[Hashable, Model],
+        max_batch_size: int = 256,
+        max_wait: float = 0.002,
+        latency_window: int = 10_000,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """Initializes the prediction server
+
+        Parameters
+        ----------
+        models : Mapping[Hashable, Model]
+            Fitted forecasters and/or component splitters by model id
+        max_batch_size : int, optional
+            Maximum number of requests executed together, by default 256
+        max_wait : float, optional
+            Maximum time (in seconds) to wait for more requests after the first
+            request of a batch, by default 0.002
+        latency_window : int, optional
+            Number of most recent requests used for the latency metrics,
+            by default 10_000
+        logger : Optional[logging.Logger], optional
+            Logger object, by default None
+        """
+        self.models = models
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.logger = logger or logging.getLogger()
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+        self._n_requests = 0
+        self._n_batches = 0
+        self._max_queue_depth = 0
+        self._latencies: Deque[float] = deque(maxlen=latency_window)
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the server is accepting requests."""
+        return self._worker is not None
+
+    async def start(self) -> "PredictionServer":
+        """Starts the batching loop (in the running event loop).
+
+        Returns
+        -------
+        PredictionServer
+            Returns an instance of self for chaining
+        """
+        if not self.is_running:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+        return self
+
+    async def stop(self):
+        """Stops the server once all the queued requests have been served."""
+        if self.is_running:
+            worker, self._worker = self._worker, None
+            self._queue.put_nowait(None)
+            await worker
+
+    async def __aenter__(self) -> "PredictionServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    async def predict(self, model_id: Hashable, fh: int) -> Any:
+        """Forecasts the `fh` steps ahead with a model. The request is executed
+        together with the other requests received in the meantime.
+
+        Parameters
+        ----------
+        model_id : Hashable
+            Id of the model
+        fh : int
+            The forecasters horizon with the steps ahead to to predict
+
+        Returns
+        -------
+        Any
+            The same result as `model.predict(fh=fh)`
+
+        Raises
+        ------
+        RuntimeError
+            If the server is not running
+        KeyError
+            If there is no model with this id
+        ValueError
+            If the horizon is not a positive integer
+        """
+        if not self.is_running:
+            raise RuntimeError("The server is not running; please call `start` first.")
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(_PendingRequest(model_id, fh, future))
+        self._max_queue_depth = max(self._max_queue_depth, self._queue.qsize())
+        return await future
+
+    def get_metrics(self) -> Dict[str, float]:
+        """Returns the queue depth, throughput and latency (in seconds) metrics.
+
+        Returns
+        -------
+        Dict[str, float]
+            The metrics
+        """
+        latencies = np.array(self._latencies)
+        if len(latencies):
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+            mean = latencies.mean()
+        else:
+            p50 = p95 = p99 = mean = np.nan
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue_depth": self._max_queue_depth,
+            "n_requests": self._n_requests,
+            "n_batches": self._n_batches,
+            "mean_batch_size": self._n_requests / max(self._n_batches, 1),
+            "latency_mean": mean,
+            "latency_p50": p50,
+            "latency_p95": p95,
+            "latency_p99": p99,
+        }
+
+    async def _run(self):
+        """Collects and executes the batches until the stop sentinel."""
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            request = await self._queue.get()
+            if request is None:
+                break
+            batch = [request]
+            if self.max_wait > 0 and self._queue.qsize() < self.max_batch_size - 1:
+                await asyncio.sleep(self.max_wait)
+            while len(batch) < self.max_batch_size and not self._queue.empty():
+                request = self._queue.get_nowait()
+                if request is None:
+                    stopping = True
+                    break
+                batch.append(request)
+
+            # The models run in a thread so that the event loop keeps queuing
+            # requests in the meantime
+            requests = [(r.model_id, r.fh) for r in batch]
+            try:
+                outcomes = await loop.run_in_executor(None, self._execute, requests)
+            except Exception as error:
+                self.logger.exception("Failed to serve a batch of predictions.")
+                outcomes = [(None, error)] * len(batch)
+
+            end = time.perf_counter()
+            for r, (result, error) in zip(batch, outcomes):
+                if r.future.done():
+                    continue
+                if error is None:
+                    r.future.set_result(result)
+                else:
+                    r.future.set_exception(error)
+                self._latencies.append(end - r.start)
+            self._n_requests += len(batch)
+            self._n_batches += 1
+            self.logger.debug(f"Served a batch of {len(batch)} prediction requests.")
+
+    def _execute(self, requests: List[Request]) -> List[Outcome]:
+        """Executes a batch of requests with one prediction per model."""
+        horizons: Dict[Hashable, int] = {}
+        outcomes: List[Outcome] = [(None, None)] * len(requests)
+        for i, (model_id, fh) in enumerate(requests):
+            if model_id not in self.models:
+                outcomes[i] = (None, KeyError(f"Unknown model '{model_id}'."))
+            elif not _is_horizon(fh):
+                message = f"The horizon must be a positive integer, got {fh!r}."
+                outcomes[i] = (None, ValueError(message))
+            else:
+                horizons[model_id] = max(fh, horizons.get(model_id, fh))
+
+        predictions = self._predict_models(horizons)
+        for i, (model_id, fh) in enumerate(requests):
+            if model_id in predictions and outcomes[i][1] is None:
+                result, error = predictions[model_id]
+                outcomes[i] = (
+                    (None, error) if error is not None else (_head(result, fh), None)
+                )
+        return outcomes
+
+    def _predict_models(self, horizons: Dict[Hashable, int]) -> Dict[Hashable, Outcome]:
+        """Predicts each model at its horizon, stacking the naive forecasters."""
+        predictions: Dict[Hashable, Outcome] = {}
+        naive_ids = []
+        for model_id in horizons:
+            model = self.models[model_id]
+            if type(model) is NaiveForecaster and model.is_fitted:
+                naive_ids.append(model_id)
+                continue
+            predictions[model_id] = self._predict_model(model_id, horizons[model_id])
+
+        if naive_ids:
+            models = [self.models[model_id] for model_id in naive_ids]
+            fh = max(horizons[model_id] for model_id in naive_ids)
+            try:
+                y_pred = _forecast_naive_models(models, fh)
+            except Exception:
+                # Predicts the models one at a time so that only the failing
+                # ones get an error
+                self.logger.warning(
+                    "Failed to forecast the naive models together, predicting "
+                    "them one at a time.",
+                    exc_info=True,
+                )
+                for model_id in naive_ids:
+                    predictions[model_id] = self._predict_model(
+                        model_id, horizons[model_id]
+                    )
+                return predictions
+            for j, (model_id, model) in enumerate(zip(naive_ids, models)):
+                index = model._get_future_index(horizons[model_id])
+                values = y_pred[: horizons[model_id], j]
+                predictions[model_id] = (pd.Series(values, index=index), None)
+        return predictions
+
+    def _predict_model(self, model_id: Hashable, fh: int) -> Outcome:
+        """Predicts a single model, catching its error."""
+        try:
+            return self.models[model_id].predict(fh=fh), None
+        except Exception as error:
+            return None, error
+
+
+class LocalClient:
+    def __init__(self, server: PredictionServer):
+        """In-process client of a prediction server (same event loop)
+
+        Parameters
+        ----------
+        server : PredictionServer
+            A running prediction server
+        """
+        self.server = server
+
+    async def predict(self, model_id: Hashable, fh: int) -> Any:
+        """Forecasts the `fh` steps ahead with a model.
+
+        Parameters
+        ----------
+        model_id : Hashable
+            Id of the model
+        fh : int
+            The forecasters horizon with the steps ahead to to predict
+
+        Returns
+        -------
+        Any
+            The same result as `model.predict(fh=fh)`
+        """
+        return await self.server.predict(model_id, fh)
+
+    async def predict_many(
+        self, requests: Iterable[Request], return_exceptions: bool = False
+    ) -> List[Any]:
+        """Sends many concurrent requests.
+
+        Parameters
+        ----------
+        requests : Iterable[Request]
+            The (model id, horizon) of each request
+        return_exceptions : bool, optional
+            Whether to return the exceptions of the failed requests instead of
+            raising the first one, by default False
+
+        Returns
+        -------
+        List[Any]
+            The result of each request, in order
+        """
+        return await asyncio.gather(
+            *(self.predict(model_id, fh) for model_id, fh in requests),
+            return_exceptions=return_exceptions,
+        )
+
+
+def _is_horizon(fh: Any) -> bool:
+    """Whether a requested horizon is a positive integer."""
+    return isinstance(fh, (int, np.integer)) and not isinstance(fh, bool) and fh > 0
+
+
+def _head(result: Any, fh: int) -> Any:
+    """First `fh` steps of a prediction (or of each element of a tuple of
+    predictions, e.g. the forecast and its components)."""
+    if isinstance(result, tuple):
+        return tuple(_head(r, fh) for r in result)
+    if len(result) == fh:
+        return result
+    return result.iloc[:fh]
@@ -0,0 +1,24 @@
+"""Outlier detection. The detectors are imported on first access."""
+
+from ds_lib_template.utils.lazy import attach
+
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    attributes={
+        "base": ["BaseOutlierDetection"],
+        "cache": ["StatisticsCache"],
+        "chunked": ["ChunkedMADOutlierDetection", "ChunkedStdDevOutlierDetection"],
+        "deviation": [
+            "BaseDeviationDetection",
+            "MADOutlierDetection",
+            "StdDevOutlierDetection",
+        ],
+        "panel": ["MADPanelOutlierDetection", "StdDevPanelOutlierDetection"],
+        "parallel": ["run_workflow_parallel"],
+        "rolling": ["RollingMADOutlierDetection", "RollingStdDevOutlierDetection"],
+        "streaming": [
+            "StreamingMADOutlierDetection",
+            "StreamingStdDevOutlierDetection",
+        ],
+    },
+)
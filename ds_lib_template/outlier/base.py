@@ -1,8 +1,26 @@
+from __future__ import annotations
+
 import logging
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+from ds_lib_template.utils.instrumentation import instrument_methods
+from ds_lib_template.utils.lazy import LazyModule
 
-import pandas as pd
+# Not needed (so not imported) when the data is a NumPy array
+pd = LazyModule("pandas")
+
+# Stages of the workflow timed when the instrumentation is enabled
+STAGES = (
+    "set_center",
+    "set_deviation",
+    "set_limits",
+    "detect_outliers",
+    "correct_outliers",
+    "run_workflow",
+)
 
 
 class BaseOutlierDetection(ABC):
@@ -23,6 +41,10 @@ class BaseOutlierDetection(ABC):
         self.outliers: Optional[pd.Series] = None
         self.corrected: Optional[pd.Series] = None
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        instrument_methods(cls, STAGES)
+
     @abstractmethod
     def set_limits(self) -> "BaseOutlierDetection":
         """Detect the outlier limits. Sets the `ul` and `ll` attribute.
@@ -33,9 +55,16 @@ class BaseOutlierDetection(ABC):
             Class object for chaining
         """
 
-    def detect_outliers(self) -> "BaseOutlierDetection":
+    def detect_outliers(self, packed: bool = False) -> "BaseOutlierDetection":
         """Detect outliers in the data. Sets the `outliers` attribute.
 
+        Parameters
+        ----------
+        packed : bool, optional
+            If True, the outlier mask is stored as a packed bit array (8 points
+            per byte, see `np.packbits`) instead of a boolean Series, by
+            default False
+
         Returns
         -------
         BaseOutlierDetection
@@ -45,28 +74,67 @@ class BaseOutlierDetection(ABC):
             self.logger.warning("Limits have not been set. Setting them now.")
             self.set_limits()
 
-        self.outlier = (self.data > self.ul) | (self.data < self.ll)
+        values = self._get_values()
+        ll, ul = self._get_limit_values()
+        with np.errstate(invalid="ignore"):
+            mask = np.greater(values, ul)
+            mask |= np.less(values, ll)
+
+        if packed:
+            self.outlier = np.packbits(mask, axis=0)
+        else:
+            self.outlier = self._wrap(mask)
         return self
 
     @abstractmethod
-    def correct_outliers(self) -> "BaseOutlierDetection":
+    def correct_outliers(
+        self, inplace: bool = False, out: Optional[np.ndarray] = None
+    ) -> "BaseOutlierDetection":
         """Corrects outliers in the data. Sets the `corrected` attribute.
 
+        Parameters
+        ----------
+        inplace : bool, optional
+            If True, outliers are corrected directly in the buffer backing
+            `data` (which must be a writable float array), by default False
+        out : Optional[np.ndarray], optional
+            Caller provided buffer (same shape as `data`) to write the
+            corrected data into, by default None
+
         Returns
         -------
         BaseOutlierDetection
             Class object for chaining
         """
 
-    def run_workflow(self) -> "BaseOutlierDetection":
+    def run_workflow(
+        self,
+        inplace: bool = False,
+        out: Optional[np.ndarray] = None,
+        packed: bool = False,
+    ) -> "BaseOutlierDetection":
         """Runs the entire workflow.
 
+        Parameters
+        ----------
+        inplace : bool, optional
+            Correct outliers in place, see `correct_outliers`, by default False
+        out : Optional[np.ndarray], optional
+            Buffer to write the corrected data into, see `correct_outliers`,
+            by default None
+        packed : bool, optional
+            Store the outlier mask as a packed bit array, see
+            `detect_outliers`, by default False
+
         Returns
         -------
         BaseOutlierDetection
             Class object for chaining
         """
-        self.set_limits().detect_outliers().correct_outliers()
+        self.set_limits()
+        if not self._fuse_outliers(inplace=inplace, out=out, packed=packed):
+            self.detect_outliers(packed=packed)
+            self.correct_outliers(inplace=inplace, out=out)
         return self
 
     def get_corrected_data(self) -> pd.Series:
@@ -87,3 +155,35 @@ class BaseOutlierDetection(ABC):
                 "Corrected data not available. Please run `correct_outliers` first."
             )
         return self.corrected
+
+    def _fuse_outliers(
+        self, inplace: bool, out: Optional[np.ndarray], packed: bool
+    ) -> bool:
+        """Detects and corrects the outliers in a single fused pass (same
+        arguments as `run_workflow`) when supported. Returns whether it did, if
+        not the workflow runs `detect_outliers` and `correct_outliers`."""
+        return False
+
+    def _get_values(self) -> np.ndarray:
+        """Returns the array backing `data` (without copying when possible)."""
+        return np.asarray(self.data)
+
+    def _wrap(self, values: np.ndarray) -> Union[pd.Series, np.ndarray]:
+        """Wraps an array of per point results in the same structure as `data`."""
+        if isinstance(self.data, np.ndarray):
+            return values
+        return pd.Series(values, index=self.data.index, name=self.data.name)
+
+    def _get_limit_values(
+        self,
+    ) -> Tuple[Union[float, np.ndarray], Union[float, np.ndarray]]:
+        """Returns the lower and upper limits as scalars or arrays which
+        broadcast against `_get_values()`. Missing limits are replaced with
+        -inf / +inf so that they never flag or clip any point.
+        """
+        ll = np.asarray(self.ll, dtype=float)
+        ul = np.asarray(self.ul, dtype=float)
+        return np.where(np.isnan(ll), -np.inf, ll), np.where(np.isnan(ul), np.inf, ul)
+
+
+instrument_methods(BaseOutlierDetection, STAGES)
@@ -0,0 +1,161 @@
+"""Cache of the fitted statistics (center and deviation) of the deviation
+based detectors.
+
+Running a detector repeatedly on the same data (e.g. to tune `multiplier`)
+recomputes the same center and deviation every time. Once a cache is set
+(see `BaseDeviationDetection.set_statistics_cache`), the statistics are looked
+up by a fingerprint of the data content, the detector type and its
+parameters, so only the (cheap) limits are recomputed.
+
+Entries are kept in memory (least recently used ones evicted first) and,
+optionally, in a directory as `.npy` files shared across processes and runs.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Hashable, Optional, Tuple, Union
+
+import numpy as np
+
+from ds_lib_template.utils.cache import LRUCache
+from ds_lib_template.utils.lazy import LazyModule, lazy_isinstance
+
+# Not needed (so not imported) when the data is a NumPy array
+pd = LazyModule("pandas")
+
+Statistics = Tuple[np.ndarray, np.ndarray]
+
+
+def fingerprint(data: Union[pd.Series, pd.DataFrame, np.ndarray]) -> Optional[str]:
+    """Fast fingerprint of the content of in-memory data: a 128 bit BLAKE2
+    hash of the raw values, their dtype and shape. The index is not part of
+    the fingerprint as the statistics do not depend on it.
+
+    Parameters
+    ----------
+    data : Union[pd.Series, pd.DataFrame, np.ndarray]
+        The data
+
+    Returns
+    -------
+    Optional[str]
+        The fingerprint, or None for data which is not held in memory (e.g.
+        files and memory-mapped arrays)
+    """
+    if lazy_isinstance(data, "pandas", ["Series", "DataFrame"]):
+        values = data.to_numpy()
+    elif isinstance(data, np.ndarray) and not isinstance(data, np.memmap):
+        values = data
+    else:
+        return None
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{values.dtype.str}{values.shape}".encode())
+    if values.dtype.kind == "O":
+        # Object arrays hold pointers: hash the values themselves
+        values = pd.util.hash_array(values.ravel())
+    digest.update(np.ascontiguousarray(values).data)
+    return digest.hexdigest()
+
+
+class StatisticsCache:
+    def __init__(
+        self, maxsize: int = 128, path: Optional[Union[str, os.PathLike]] = None
+    ):
+        """Initializes an empty statistics cache.
+
+        Parameters
+        ----------
+        maxsize : int, optional
+            Maximum number of entries kept in memory, by default 128
+        path : Optional[Union[str, os.PathLike]], optional
+            Directory where the entries are also persisted, by default None
+            (memory only). It is created if needed.
+        """
+        self._memory = LRUCache(maxsize=maxsize)
+        self.path = Path(path) if path is not None else None
+        if self.path is not None:
+            self.path.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def hits(self) -> int:
+        """Number of lookups which found the statistics (in memory or on disk)."""
+        return self._memory.hits
+
+    @property
+    def misses(self) -> int:
+        """Number of lookups which did not find the statistics."""
+        return self._memory.misses
+
+    def _get_file(self, key: Hashable) -> Path:
+        """File persisting the entry of `key`."""
+        name = hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+        return self.path / f"{name}.npy"
+
+    def get(self, key: Hashable) -> Optional[Statistics]:
+        """Returns the center and deviation stored for `key`, if any.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key of the entry (see `BaseDeviationDetection._get_statistics_key`)
+
+        Returns
+        -------
+        Optional[Statistics]
+            Copies of the center and deviation arrays, or None
+        """
+        statistics = self._memory.get(key)
+        if statistics is None and self.path is not None:
+            file = self._get_file(key)
+            if not file.exists():
+                return None
+            stacked = np.load(file, allow_pickle=False)
+            statistics = (stacked[0], stacked[1])
+            # Count the disk hit as a hit rather than the memory miss
+            self._memory.misses -= 1
+            self._memory.hits += 1
+            self._memory.put(key, statistics)
+        if statistics is None:
+            return None
+        # Copies, so that the detectors can not modify the cached entries
+        return statistics[0].copy(), statistics[1].copy()
+
+    def put(self, key: Hashable, statistics: Statistics):
+        """Stores the center and deviation of `key`.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key of the entry
+        statistics : Statistics
+            The center and deviation arrays (with the same shape)
+        """
+        center, deviation = (np.array(s, dtype=float) for s in statistics)
+        self._memory.put(key, (center, deviation))
+        if self.path is not None:
+            file = self._get_file(key)
+            # Write to a temporary file first so that concurrent readers never
+            # see a partially written entry
+            temp = file.with_suffix(f".{os.getpid()}.tmp")
+            with open(temp, "wb") as handle:
+                np.save(handle, np.stack([center, deviation]), allow_pickle=False)
+            os.replace(temp, file)
+
+    def clear(self):
+        """Removes all the entries (including the persisted ones)."""
+        self._memory.clear()
+        if self.path is not None:
+            for file in self.path.glob("*.npy"):
+                file.unlink()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._memory or (
+            self.path is not None and self._get_file(key).exists()
+        )
+
+    def __len__(self) -> int:
+        return len(self._memory)
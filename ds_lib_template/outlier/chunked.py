@@ -0,0 +1,488 @@
+"""Out-of-core versions of the deviation based outlier detectors.
+
+The data is never fully materialized: statistics are computed with streaming
+passes over chunks of a (memory-mapped) array or file, and the corrected data
+is written chunk by chunk to an output array or file, so the working memory
+is bounded by the chunk size.
+"""
+
+import logging
+from typing import Callable, Dict, Iterator, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ds_lib_template.outlier.base import BaseOutlierDetection
+from ds_lib_template.outlier.deviation import BaseDeviationDetection
+from ds_lib_template.utils.io import ChunkSource, ChunkWriter, _suffix, iter_chunks
+from ds_lib_template.utils.sketches import TDigest
+
+ChunkFactory = Callable[[], Iterator[np.ndarray]]
+
+
+class BaseChunkedDeviationDetection(BaseDeviationDetection):
+    def __init__(
+        self,
+        data: ChunkSource,
+        multiplier: int = 3,
+        chunksize: int = 1_000_000,
+        column: Optional[str] = None,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """Initializes the out-of-core outlier detection class.
+
+        Parameters
+        ----------
+        data : ChunkSource
+            Array (e.g. `np.memmap`) or path to a `.npy`, `.parquet` or `.csv`
+            file containing the data whose outliers needed to be detected
+        multiplier : int, optional
+            Multiplier for deviation calculations, by default 3
+        chunksize : int, optional
+            Maximum number of points held in memory at a time, by default
+            1_000_000
+        column : Optional[str], optional
+            Column to read from `.parquet` / `.csv` files, by default None
+            (first column)
+        logger : Optional[logging.Logger], optional
+            Logger object, by default None
+        """
+        super().__init__(data=data, multiplier=multiplier, logger=logger)
+        self.chunksize = chunksize
+        self.column = column
+        self.n_outliers: Optional[int] = None
+        self._moments: Optional[Tuple[int, int, float, float, float, float]] = None
+
+    def _get_statistics_params(self) -> Tuple:
+        """Parameters (other than `multiplier`) the statistics depend on. Only
+        in-memory arrays are cached (see `fingerprint`), whose statistics can
+        still depend on how they are chunked."""
+        return self.chunksize, self.column
+
+    def _iter_chunks(self) -> Iterator[np.ndarray]:
+        """Iterates over the chunks of the data."""
+        return iter_chunks(self.data, chunksize=self.chunksize, column=self.column)
+
+    def _get_moments(self) -> Tuple[int, int, float, float, float, float]:
+        """Returns (and caches) the number of points, count of non missing
+        points, mean, sum of squared differences from the mean, minimum and
+        maximum of the data."""
+        if self._moments is None:
+            self._moments = _chunked_moments(self._iter_chunks())
+        return self._moments
+
+    def _iter_outlier_masks(self) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """Iterates over the chunks of the data and their outlier masks."""
+        ll, ul = self._get_limit_values()
+        for chunk in self._iter_chunks():
+            with np.errstate(invalid="ignore"):
+                mask = np.greater(chunk, ul)
+                mask |= np.less(chunk, ll)
+            yield chunk, mask
+
+    def detect_outliers(self, packed: bool = False) -> "BaseOutlierDetection":
+        """Counts the outliers in the data. Sets the `n_outliers` attribute.
+
+        Parameters
+        ----------
+        packed : bool, optional
+            If True, the outlier mask is also stored in the `outlier` attribute
+            as a packed bit array (8 points per byte, see `np.packbits`),
+            otherwise it is not materialized, by default False
+
+        Returns
+        -------
+        BaseOutlierDetection
+            Class object for chaining
+        """
+        if self.ul is None or self.ll is None:
+            self.logger.warning("Limits have not been set. Setting them now.")
+            self.set_limits()
+
+        length = self._get_moments()[0] if packed else 0
+        self.outlier = np.zeros((length + 7) // 8, dtype=np.uint8) if packed else None
+        self.n_outliers = 0
+
+        # Bits left over from the previous chunk when its length is not a
+        # multiple of 8 are carried into the next chunk
+        position, carry = 0, np.empty(0, dtype=bool)
+        for _, mask in self._iter_outlier_masks():
+            self.n_outliers += int(mask.sum())
+            if not packed:
+                continue
+            bits = np.concatenate([carry, mask])
+            full = len(bits) - len(bits) % 8
+            packed_bits = np.packbits(bits[:full])
+            self.outlier[position : position + len(packed_bits)] = packed_bits
+            position += len(packed_bits)
+            carry = bits[full:]
+        if packed and len(carry):
+            self.outlier[position] = np.packbits(carry)[0]
+
+        return self
+
+    def correct_outliers(
+        self,
+        inplace: bool = False,
+        out: Optional[Union[str, np.ndarray]] = None,
+    ) -> "BaseOutlierDetection":
+        """Corrects outliers in the data chunk by chunk and writes the result.
+        Sets the `corrected` and `n_outliers` attributes.
+
+        Parameters
+        ----------
+        inplace : bool, optional
+            If True, outliers are corrected directly in `data`, which must be a
+            writable array or a `.npy` file, by default False
+        out : Optional[Union[str, np.ndarray]], optional
+            Array or path of the `.npy`, `.parquet` or `.csv` file to write the
+            corrected data to, by default None
+
+        Returns
+        -------
+        BaseOutlierDetection
+            Class object for chaining
+
+        Raises
+        ------
+        ValueError
+            When method is called before `set_limits` method, or when exactly
+            one of `inplace` and `out` is not provided
+        """
+        if self.ul is None or self.ll is None:
+            raise ValueError(
+                "Upper and Lower limits not available. Please run `set_limits` first."
+            )
+        if inplace == (out is not None):
+            raise ValueError(
+                "Exactly one of `inplace` and `out` must be provided to correct "
+                "outliers out-of-core."
+            )
+        if inplace:
+            out = self._open_inplace_target()
+
+        ll, ul = self._get_limit_values()
+        self.n_outliers = 0
+        with ChunkWriter(out, length=self._get_moments()[0]) as writer:
+            for chunk, mask in self._iter_outlier_masks():
+                self.n_outliers += int(mask.sum())
+                writer.write(np.clip(chunk, ll, ul))
+        self.corrected = out
+
+        return self
+
+    def _open_inplace_target(self) -> np.ndarray:
+        """Returns a writable view of the data to correct it in place."""
+        if isinstance(self.data, np.ndarray):
+            target = self.data
+        elif _suffix(self.data) == ".npy":
+            target = np.load(self.data, mmap_mode="r+")
+        else:
+            raise ValueError(
+                "Outliers can only be corrected in place in arrays or `.npy` files."
+            )
+        if target.dtype.kind != "f" or not target.flags.writeable:
+            raise ValueError(
+                "Outliers can only be corrected into a writable float array, "
+                f"got dtype {target.dtype} (writeable={target.flags.writeable})."
+            )
+        return target
+
+    def sweep(
+        self,
+        multipliers: Sequence[float],
+        out: Optional[Mapping[float, Union[str, np.ndarray]]] = None,
+    ) -> Dict[float, Union[str, np.ndarray]]:
+        """Corrects the outliers of the data for several multipliers, writing
+        the corrected data of each multiplier to its own output. The center
+        and deviation are computed (or looked up in the statistics cache) only
+        once. The `multiplier`, limits, outlier count and corrected data of the
+        detector are left unchanged.
+
+        Parameters
+        ----------
+        multipliers : Sequence[float]
+            Multipliers for deviation calculations
+        out : Optional[Mapping[float, Union[str, np.ndarray]]], optional
+            Array or path of the file to write the corrected data to, by
+            multiplier (see `correct_outliers`), by default None
+
+        Returns
+        -------
+        Dict[float, Union[str, np.ndarray]]
+            The outputs holding the corrected data, by multiplier
+
+        Raises
+        ------
+        ValueError
+            When `out` has no output for one of the multipliers
+        """
+        missing = [m for m in multipliers if out is None or m not in out]
+        if missing:
+            raise ValueError(
+                "The corrected data is written out-of-core: `out` must map each "
+                f"multiplier to an array or a file path, missing {missing}."
+            )
+        state = (self.multiplier, self.ll, self.ul, self.corrected, self.n_outliers)
+        corrected = {}
+        try:
+            for multiplier in multipliers:
+                self.multiplier = multiplier
+                corrected[multiplier] = (
+                    self.set_limits()
+                    .correct_outliers(out=out[multiplier])
+                    .get_corrected_data()
+                )
+        finally:
+            self.multiplier, self.ll, self.ul, self.corrected, self.n_outliers = state
+        return corrected
+
+    def run_workflow(
+        self,
+        inplace: bool = False,
+        out: Optional[Union[str, np.ndarray]] = None,
+        packed: bool = False,
+    ) -> "BaseOutlierDetection":
+        """Runs the entire workflow. Outliers are counted while they are
+        corrected, so a separate detection pass is only made when the packed
+        outlier mask is requested.
+
+        Parameters
+        ----------
+        inplace : bool, optional
+            Correct outliers in place, see `correct_outliers`, by default False
+        out : Optional[Union[str, np.ndarray]], optional
+            Where to write the corrected data, see `correct_outliers`, by
+            default None
+        packed : bool, optional
+            Store the outlier mask as a packed bit array, see
+            `detect_outliers`, by default False
+
+        Returns
+        -------
+        BaseOutlierDetection
+            Class object for chaining
+        """
+        self.set_limits()
+        if packed:
+            self.detect_outliers(packed=True)
+        self.correct_outliers(inplace=inplace, out=out)
+        return self
+
+
+class ChunkedStdDevOutlierDetection(BaseChunkedDeviationDetection):
+    def set_center(self) -> "BaseOutlierDetection":
+        """Sets the center of the data. Sets the `center` attribute.
+
+        Returns
+        -------
+        BaseOutlierDetection
+            Class object for chaining
+        """
+        self.center = self._get_moments()[2]
+        return self
+
+    def set_deviation(self) -> "BaseOutlierDetection":
+        """Sets the deviation of the data. Sets the `deviation` attribute.
+
+        Returns
+        -------
+        BaseOutlierDetection
+            Class object for chaining
+        """
+        _, count, _, m2, _, _ = self._get_moments()
+        self.deviation = np.sqrt(m2 / (count - 1)) if count > 1 else np.nan
+        return self
+
+
+class ChunkedMADOutlierDetection(BaseChunkedDeviationDetection):
+    def __init__(
+        self,
+        data: ChunkSource,
+        multiplier: int = 3,
+        chunksize: int = 1_000_000,
+        column: Optional[str] = None,
+        median_method: str = "exact",
+        compression: int = 200,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """Initializes the out-of-core outlier detection class.
+
+        Parameters
+        ----------
+        data : ChunkSource
+            Array (e.g. `np.memmap`) or path to a `.npy`, `.parquet` or `.csv`
+            file containing the data whose outliers needed to be detected
+        multiplier : int, optional
+            Multiplier for deviation calculations, by default 3
+        chunksize : int, optional
+            Maximum number of points held in memory at a time, by default
+            1_000_000
+        column : Optional[str], optional
+            Column to read from `.parquet` / `.csv` files, by default None
+            (first column)
+        median_method : str, optional
+            How the median is computed, by default "exact"
+            "exact": Exact median, using a few histogram refinement passes
+            "tdigest": Approximate median, using a t-digest in a single pass
+        compression : int, optional
+            Compression of the t-digest (only used with `median_method`
+            "tdigest"), by default 200
+        logger : Optional[logging.Logger], optional
+            Logger object, by default None
+        """
+        if median_method not in ("exact", "tdigest"):
+            raise ValueError(
+                f"Unknown median_method '{median_method}'. "
+                "Valid values are 'exact' and 'tdigest'."
+            )
+        self.median_method = median_method
+        self.compression = compression
+        super().__init__(
+            data=data,
+            multiplier=multiplier,
+            chunksize=chunksize,
+            column=column,
+            logger=logger,
+        )
+
+    def _get_statistics_params(self) -> Tuple:
+        """Parameters (other than `multiplier`) the statistics depend on."""
+        return (*super()._get_statistics_params(), self.median_method, self.compression)
+
+    def _median(self, chunks: ChunkFactory, low: float, high: float) -> float:
+        """Median of chunked data (with values in [low, high]) using the
+        configured method."""
+        if self.median_method == "tdigest":
+            digest = TDigest(compression=self.compression)
+            for chunk in chunks():
+                digest.update(chunk)
+            return float(digest.quantile(0.5))
+        count = self._get_moments()[1]
+        return _chunked_median(chunks, count, low, high, self.chunksize)
+
+    def set_center(self) -> "BaseOutlierDetection":
+        """Sets the center of the data. Sets the `center` attribute.
+
+        Returns
+        -------
+        BaseOutlierDetection
+            Class object for chaining
+        """
+        _, _, _, _, low, high = self._get_moments()
+        self.center = self._median(self._iter_chunks, low, high)
+        return self
+
+    def set_deviation(self) -> "BaseOutlierDetection":
+        """Sets the deviation of the data (median absolute deviation from the
+        median, same as `MADOutlierDetection`). Sets the `deviation` attribute.
+
+        Returns
+        -------
+        BaseOutlierDetection
+            Class object for chaining
+        """
+        if self.center is None:
+            self.set_center()
+        center = self.center
+        _, _, _, _, low, high = self._get_moments()
+
+        def abs_deviations() -> Iterator[np.ndarray]:
+            return (np.abs(chunk - center) for chunk in self._iter_chunks())
+
+        self.deviation = self._median(
+            abs_deviations, 0.0, max(high - center, center - low)
+        )
+        return self
+
+
+def _chunked_moments(
+    chunks: Iterator[np.ndarray],
+) -> Tuple[int, int, float, float, float, float]:
+    """Number of points, and count, mean, sum of squared differences from the
+    mean, minimum and maximum of the non missing values, merging the per chunk
+    moments with Chan et al.'s parallel algorithm."""
+    length, count, mean, m2 = 0, 0, np.nan, 0.0
+    low, high = np.inf, -np.inf
+    for chunk in chunks:
+        length += len(chunk)
+        chunk = chunk[~np.isnan(chunk)]
+        if not len(chunk):
+            continue
+        chunk_count, chunk_mean = len(chunk), chunk.mean()
+        chunk_m2 = np.sum((chunk - chunk_mean) ** 2)
+        if count == 0:
+            mean, m2 = chunk_mean, chunk_m2
+        else:
+            delta = chunk_mean - mean
+            total = count + chunk_count
+            mean += delta * chunk_count / total
+            m2 += chunk_m2 + delta**2 * count * chunk_count / total
+        count += chunk_count
+        low, high = min(low, chunk.min()), max(high, chunk.max())
+    return length, count, float(mean), float(m2), float(low), float(high)
+
+
+def _chunked_select(
+    chunks: ChunkFactory,
+    k: int,
+    low: float,
+    high: float,
+    max_buffer: int,
+    bins: int = 1024,
+) -> float:
+    """Exact k-th (0 based) smallest non missing value of chunked data with
+    bounded memory.
+
+    Each pass histograms the values in the current range and narrows the range
+    to the bin holding the k-th value, until the values left in the range fit
+    in `max_buffer` (or are all equal) and can be selected in memory.
+    """
+    closed = True  # Whether `high` itself belongs to the range
+    while True:
+        in_range = []
+        n_in_range = 0
+        range_low, range_high = np.inf, -np.inf
+        counts = np.zeros(bins, dtype=np.int64)
+        edges = np.linspace(low, high, bins + 1)
+        for chunk in chunks():
+            upper = chunk <= high if closed else chunk < high
+            chunk = chunk[(chunk >= low) & upper]
+            if not len(chunk):
+                continue
+            n_in_range += len(chunk)
+            range_low = min(range_low, chunk.min())
+            range_high = max(range_high, chunk.max())
+            if n_in_range <= max_buffer:
+                in_range.append(chunk)
+            else:
+                in_range = None
+            counts += np.histogram(chunk, bins=edges)[0]
+
+        if range_low == range_high:
+            return float(range_low)
+        if in_range is not None:
+            return float(np.partition(np.concatenate(in_range), k)[k])
+
+        cumulative = np.cumsum(counts)
+        b = int(np.searchsorted(cumulative, k, side="right"))
+        new_closed = closed and b == bins - 1
+        if (edges[b], edges[b + 1], new_closed) == (low, high, closed):
+            # The range can not be split any further (`low` and `high` are
+            # adjacent floats), so it only holds these two values
+            n_low = sum(int(np.sum(chunk == low)) for chunk in chunks())
+            return float(low if k < n_low else high)
+        k -= int(cumulative[b - 1]) if b > 0 else 0
+        low, high, closed = edges[b], edges[b + 1], new_closed
+
+
+def _chunked_median(
+    chunks: ChunkFactory, count: int, low: float, high: float, max_buffer: int
+) -> float:
+    """Exact median of chunked data with bounded memory."""
+    if count == 0:
+        return np.nan
+    middle = count // 2
+    upper = _chunked_select(chunks, middle, low, high, max_buffer)
+    if count % 2:
+        return upper
+    return (_chunked_select(chunks, middle - 1, low, high, max_buffer) + upper) / 2
@@ -1,13 +1,26 @@
+from __future__ import annotations
+
 import logging
 from abc import abstractmethod
-from typing import Optional
+from typing import Dict, Hashable, Optional, Sequence, Tuple, Union
 
-import pandas as pd
+import numpy as np
 
+from ds_lib_template.outlier import robust
 from ds_lib_template.outlier.base import BaseOutlierDetection
+from ds_lib_template.outlier.cache import StatisticsCache, fingerprint
+from ds_lib_template.utils import kernels
+from ds_lib_template.utils.lazy import LazyModule
+
+# Not needed (so not imported) when the data is a NumPy array
+pd = LazyModule("pandas")
 
 
 class BaseDeviationDetection(BaseOutlierDetection):
+    # Cache of the fitted statistics shared by the detectors, disabled (None)
+    # by default, see `set_statistics_cache`
+    statistics_cache: Optional[StatisticsCache] = None
+
     def __init__(
         self,
         data: pd.Series,
@@ -59,6 +72,19 @@ class BaseDeviationDetection(BaseOutlierDetection):
         BaseOutlierDetection
             Class object for chaining
         """
+        key = None
+        if self.statistics_cache is not None and (
+            self.center is None or self.deviation is None
+        ):
+            key = self._get_statistics_key()
+            statistics = self.statistics_cache.get(key) if key is not None else None
+            if statistics is not None:
+                self.center, self.deviation = map(self._wrap_statistic, statistics)
+                key = None
+
+        if self.center is None and self.deviation is None and kernels.is_compiled():
+            # Both statistics in a single pass of a compiled kernel
+            self._set_statistics()
         if self.center is None:
             self.logger.warning("Center has not been calculated. Calculating it now.")
             self.set_center()
@@ -67,15 +93,138 @@ class BaseDeviationDetection(BaseOutlierDetection):
                 "Deviation has not been calculated. Calculating it now."
             )
             self.set_deviation()
+        if key is not None:
+            self.statistics_cache.put(key, (self.center, self.deviation))
 
         self.ul = self.center + self.multiplier * self.deviation
         self.ll = self.center - self.multiplier * self.deviation
 
         return self
 
-    def correct_outliers(self) -> "BaseOutlierDetection":
+    def sweep(self, multipliers: Sequence[float]) -> Dict[float, pd.Series]:
+        """Corrects the outliers of the data for several multipliers. The center
+        and deviation are computed (or looked up in the statistics cache) only
+        once; only the limits are recomputed for each multiplier. The
+        `multiplier`, limits and corrected data of the detector are left
+        unchanged.
+
+        Parameters
+        ----------
+        multipliers : Sequence[float]
+            Multipliers for deviation calculations
+
+        Returns
+        -------
+        Dict[float, pd.Series]
+            The corrected data, by multiplier
+        """
+        state = (self.multiplier, self.ll, self.ul, self.corrected)
+        corrected = {}
+        try:
+            for multiplier in multipliers:
+                self.multiplier = multiplier
+                corrected[multiplier] = (
+                    self.set_limits().correct_outliers().get_corrected_data()
+                )
+        finally:
+            self.multiplier, self.ll, self.ul, self.corrected = state
+        return corrected
+
+    @classmethod
+    def set_statistics_cache(cls, cache: Optional[StatisticsCache]):
+        """Sets the cache of the fitted statistics used by this class (and its
+        subclasses).
+
+        Parameters
+        ----------
+        cache : Optional[StatisticsCache]
+            The cache, or None to disable caching
+        """
+        cls.statistics_cache = cache
+
+    def _get_statistics_params(self) -> Tuple:
+        """Parameters (other than `multiplier`) the statistics depend on."""
+        return ()
+
+    def _get_statistics_key(self) -> Optional[Hashable]:
+        """Key of the statistics of the data in the statistics cache, or None
+        if they can not be cached."""
+        data_fingerprint = fingerprint(self.data)
+        if data_fingerprint is None:
+            return None
+        detector = f"{type(self).__module__}.{type(self).__qualname__}"
+        return detector, self._get_statistics_params(), data_fingerprint
+
+    def _set_statistics(self) -> bool:
+        """Sets both the center and the deviation with a compiled kernel, when
+        the detector and its data support it. Returns whether they were set."""
+        return False
+
+    def _get_kernel_values(self) -> Optional[np.ndarray]:
+        """Returns the array backing `data` if the compiled kernels can use it
+        without a copy (1-D contiguous float64 array), otherwise None."""
+        values = self._get_values()
+        if (
+            values.ndim != 1
+            or values.dtype != np.float64
+            or not values.flags.c_contiguous
+        ):
+            return None
+        return values
+
+    def _get_output_buffer(
+        self, inplace: bool, out: Optional[np.ndarray]
+    ) -> Optional[np.ndarray]:
+        """Returns the validated buffer to write the corrected data into (None
+        for a new array), see `correct_outliers`."""
+        if inplace and out is not None:
+            raise ValueError("Only one of `inplace` and `out` can be provided.")
+        if inplace:
+            out = self._get_values()
+        if out is not None and (out.dtype.kind != "f" or not out.flags.writeable):
+            raise ValueError(
+                "Outliers can only be corrected into a writable float array, "
+                f"got dtype {out.dtype} (writeable={out.flags.writeable})."
+            )
+        return out
+
+    def _fuse_outliers(
+        self, inplace: bool, out: Optional[np.ndarray], packed: bool
+    ) -> bool:
+        """Detects and corrects the outliers in a single pass of the compiled
+        kernel, when the data and (scalar) limits support it."""
+        if not kernels.is_compiled():
+            return False
+        values = self._get_kernel_values()
+        ll, ul = self._get_limit_values()
+        if values is None or ll.ndim or ul.ndim:
+            return False
+        out = self._get_output_buffer(inplace=inplace, out=out)
+        mask, corrected = kernels.clip_mask(values, float(ll), float(ul), out=out)
+
+        self.outlier = np.packbits(mask, axis=0) if packed else self._wrap(mask)
+        self.corrected = self._wrap(corrected)
+        return True
+
+    def _wrap_statistic(self, values: np.ndarray) -> Union[float, pd.Series]:
+        """Wraps a cached center or deviation array like the statistics set by
+        `set_center` and `set_deviation`."""
+        return values.item() if values.ndim == 0 else values
+
+    def correct_outliers(
+        self, inplace: bool = False, out: Optional[np.ndarray] = None
+    ) -> "BaseOutlierDetection":
         """Corrects outliers in the data. Sets the `corrected` attribute.
 
+        Parameters
+        ----------
+        inplace : bool, optional
+            If True, outliers are corrected directly in the buffer backing
+            `data` (which must be a writable float array), by default False
+        out : Optional[np.ndarray], optional
+            Caller provided buffer (same shape as `data`) to write the
+            corrected data into, by default None
+
         Returns
         -------
         BaseOutlierDetection
@@ -84,15 +233,30 @@ class BaseDeviationDetection(BaseOutlierDetection):
         Raises
         ------
         ValueError
-            When method is called before `set_limits` method
+            When method is called before `set_limits` method, when both
+            `inplace` and `out` are provided or when the buffer to write into
+            is not a writable float array
         """
-        self.corrected = self.data.copy()
         if self.ul is None or self.ll is None:
             raise ValueError(
                 "Upper and Lower limits not available. Please run `set_limits` first."
             )
-        self.corrected[self.corrected > self.ul] = self.ul
-        self.corrected[self.corrected < self.ll] = self.ll
+
+        if not inplace and out is None:
+            if isinstance(self.data, np.ndarray):
+                self.corrected = np.clip(self.data, *self._get_limit_values())
+                return self
+            # Works with scalar limits as well as per point limits (aligned Series)
+            self.corrected = self.data.clip(lower=self.ll, upper=self.ul)
+            return self
+
+        values = self._get_values()
+        out = self._get_output_buffer(inplace=inplace, out=out)
+
+        # Single pass over the data, no intermediate masks or copies
+        ll, ul = self._get_limit_values()
+        np.clip(values, ll, ul, out=out)
+        self.corrected = self._wrap(out)
 
         return self
 
@@ -106,7 +270,11 @@ class StdDevOutlierDetection(BaseDeviationDetection):
         BaseOutlierDetection
             Class object for chaining
         """
-        self.center = self.data.mean()
+        if isinstance(self.data, np.ndarray):
+            # Missing values are skipped, as pandas does
+            self.center = np.nanmean(self.data)
+        else:
+            self.center = self.data.mean()
 
     def set_deviation(self) -> "BaseOutlierDetection":
         """Sets the deviation of the data. Sets the `deviation` attribute.
@@ -116,7 +284,19 @@ class StdDevOutlierDetection(BaseDeviationDetection):
         BaseOutlierDetection
             Class object for chaining
         """
-        self.deviation = self.data.std()
+        if isinstance(self.data, np.ndarray):
+            self.deviation = np.nanstd(self.data, ddof=1)
+        else:
+            self.deviation = self.data.std()
+
+    def _set_statistics(self) -> bool:
+        """Sets the mean and standard deviation in a single pass (Welford's
+        algorithm) with the compiled kernel."""
+        values = self._get_kernel_values()
+        if values is None:
+            return False
+        self.center, self.deviation = kernels.mean_std(values)
+        return True
 
 
 class MADOutlierDetection(BaseDeviationDetection):
@@ -128,14 +308,28 @@ class MADOutlierDetection(BaseDeviationDetection):
         BaseOutlierDetection
             Class object for chaining
         """
-        self.center = self.data.median()
+        self.center = robust.median(self._get_values())
+        return self
 
     def set_deviation(self) -> "BaseOutlierDetection":
-        """Sets the deviation of the data. Sets the `deviation` attribute.
+        """Sets the deviation of the data (median absolute deviation from the
+        median). Sets the `deviation` attribute.
 
         Returns
         -------
         BaseOutlierDetection
             Class object for chaining
         """
-        self.deviation = self.data.mad()
+        self.deviation = robust.median_abs_deviation(
+            self._get_values(), center=self.center
+        )
+        return self
+
+    def _set_statistics(self) -> bool:
+        """Sets the median and the median absolute deviation with the compiled
+        kernel, selecting both in a single buffer."""
+        values = self._get_kernel_values()
+        if values is None:
+            return False
+        self.center, self.deviation = kernels.median_mad(values)
+        return True
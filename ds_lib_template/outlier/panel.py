@@ -0,0 +1,224 @@
+"""Batched (panel) versions of the deviation based outlier detectors.
+
+Each column of a wide DataFrame is treated as an independent series and all
+the statistics are computed column-wise with vectorized NumPy operations,
+giving the same per-series results as the single series classes in
+`ds_lib_template.outlier.deviation` without building one object per series.
+"""
+
+import logging
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+
+from ds_lib_template.outlier import robust
+from ds_lib_template.outlier.base import BaseOutlierDetection
+from ds_lib_template.outlier.deviation import BaseDeviationDetection
+from ds_lib_template.utils.panel import long_to_wide
+
+
+class BasePanelDeviationDetection(BaseDeviationDetection):
+    def __init__(
+        self,
+        data: pd.DataFrame,
+        multiplier: int = 3,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """Initializes the panel outlier detection class. Every column of `data`
+        is treated as a separate series.
+
+        Parameters
+        ----------
+        data : pd.DataFrame
+            Wide data whose outliers needed to be detected (one column per
+            series). Series of unequal length can be padded with NaN.
+        multiplier : int, optional
+            Multiplier for deviation calculations, by default 3
+        logger : Optional[logging.Logger], optional
+            Logger object, by default None
+        """
+        super().__init__(data=data, multiplier=multiplier, logger=logger)
+        self._values = data.to_numpy(dtype=float)
+        self._valid = ~np.isnan(self._values)
+        self._counts = self._valid.sum(axis=0)
+
+        # Only populated when the object is created using `from_long`
+        self._long_index: Optional[pd.Index] = None
+        self._long_rows: Optional[np.ndarray] = None
+        self._long_cols: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_long(
+        cls,
+        data: pd.DataFrame,
+        group_col: str,
+        value_col: str,
+        index_col: Optional[str] = None,
+        **kwargs: Any,
+    ) -> "BasePanelDeviationDetection":
+        """Creates the detector from a long DataFrame with a group key.
+
+        Parameters
+        ----------
+        data : pd.DataFrame
+            Long data with one row per (series, time) observation
+        group_col : str
+            Column identifying the series each row belongs to
+        value_col : str
+            Column containing the values whose outliers needed to be detected
+        index_col : Optional[str], optional
+            Column identifying the time of each observation. If None, the
+            position of the row within its group is used, by default None
+        **kwargs : Any
+            Additional arguments passed to the class constructor
+
+        Returns
+        -------
+        BasePanelDeviationDetection
+            Detector working on the equivalent wide data
+
+        Raises
+        ------
+        ValueError
+            When the same (group, index) pair appears more than once
+        """
+        wide, row_codes, col_codes = long_to_wide(data, group_col, value_col, index_col)
+        detector = cls(data=wide, **kwargs)
+        detector._long_index = data.index
+        detector._long_rows = row_codes
+        detector._long_cols = col_codes
+        return detector
+
+    def _to_series(self, values: np.ndarray) -> pd.Series:
+        """Wraps per-series statistics in a Series indexed by the series names."""
+        return pd.Series(values, index=self.data.columns)
+
+    def _wrap_statistic(self, values: np.ndarray) -> pd.Series:
+        """Wraps a cached center or deviation array like `set_center`."""
+        return self._to_series(values)
+
+    def _column_mean(self, values: np.ndarray) -> np.ndarray:
+        """NaN aware column means (NaN for columns without any values)."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self._valid, values, 0.0).sum(axis=0) / self._counts
+
+    def _get_values(self) -> np.ndarray:
+        """Returns the 2-D (time x series) float array of the data."""
+        return self._values
+
+    def _wrap(self, values: np.ndarray) -> pd.DataFrame:
+        """Wraps a 2-D array of per point results in a DataFrame like `data`."""
+        return pd.DataFrame(values, index=self.data.index, columns=self.data.columns)
+
+    def correct_outliers(
+        self, inplace: bool = False, out: Optional[np.ndarray] = None
+    ) -> "BaseOutlierDetection":
+        """Corrects outliers in the data. Sets the `corrected` attribute.
+
+        Parameters
+        ----------
+        inplace : bool, optional
+            If True, outliers are corrected directly in the float array the
+            detector works on (which is shared with `data` when `data` is
+            backed by a single float block), by default False
+        out : Optional[np.ndarray], optional
+            Caller provided buffer (same shape as `data`) to write the
+            corrected data into, by default None
+
+        Returns
+        -------
+        BaseOutlierDetection
+            Class object for chaining
+
+        Raises
+        ------
+        ValueError
+            When method is called before `set_limits` method, when both
+            `inplace` and `out` are provided or when the buffer to write into
+            is not a writable float array
+        """
+        if not inplace and out is None:
+            out = np.empty_like(self._values)
+        return super().correct_outliers(inplace=inplace, out=out)
+
+    def get_corrected_long(self) -> pd.Series:
+        """Returns the corrected data aligned with the rows of the long data
+        used to create the detector (see `from_long`).
+
+        Returns
+        -------
+        pd.Series
+            Corrected data
+
+        Raises
+        ------
+        ValueError
+            When the detector was not created from long data or when method is
+            called before `correct_outliers` method
+        """
+        if self._long_index is None:
+            raise ValueError(
+                "Detector was not created from long data. Please use `from_long`."
+            )
+        corrected = self.get_corrected_data().to_numpy()
+        return pd.Series(
+            corrected[self._long_rows, self._long_cols], index=self._long_index
+        )
+
+
+class StdDevPanelOutlierDetection(BasePanelDeviationDetection):
+    def set_center(self) -> "BaseOutlierDetection":
+        """Sets the center of each series. Sets the `center` attribute.
+
+        Returns
+        -------
+        BaseOutlierDetection
+            Class object for chaining
+        """
+        self.center = self._to_series(self._column_mean(self._values))
+        return self
+
+    def set_deviation(self) -> "BaseOutlierDetection":
+        """Sets the deviation of each series. Sets the `deviation` attribute.
+
+        Returns
+        -------
+        BaseOutlierDetection
+            Class object for chaining
+        """
+        mean = self._column_mean(self._values)
+        squares = np.where(self._valid, (self._values - mean) ** 2, 0.0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            variance = squares.sum(axis=0) / (self._counts - 1)
+        variance[self._counts < 2] = np.nan
+        self.deviation = self._to_series(np.sqrt(variance))
+        return self
+
+
+class MADPanelOutlierDetection(BasePanelDeviationDetection):
+    def set_center(self) -> "BaseOutlierDetection":
+        """Sets the center of each series. Sets the `center` attribute.
+
+        Returns
+        -------
+        BaseOutlierDetection
+            Class object for chaining
+        """
+        self.center = self._to_series(robust.median(self._values, axis=0))
+        return self
+
+    def set_deviation(self) -> "BaseOutlierDetection":
+        """Sets the deviation of each series (median absolute deviation from the
+        median). Sets the `deviation` attribute.
+
+        Returns
+        -------
+        BaseOutlierDetection
+            Class object for chaining
+        """
+        center = None if self.center is None else self.center.to_numpy()
+        self.deviation = self._to_series(
+            robust.median_abs_deviation(self._values, axis=0, center=center)
+        )
+        return self
@@ -0,0 +1,150 @@
+"""Runs the outlier detection workflow on many series in parallel.
+
+The values of all the series are copied once into a shared memory block and
+the worker processes read from / write the corrected values to shared memory
+directly, so only the (small) batch descriptions are pickled between the
+processes. The series indexes never leave the main process.
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Type, Union
+
+import numpy as np
+import pandas as pd
+from pandas.core.groupby import DataFrameGroupBy, SeriesGroupBy
+
+from ds_lib_template.outlier.base import BaseOutlierDetection
+
+Bounds = Sequence[Tuple[int, int]]
+
+
+def run_workflow_parallel(
+    data: Union[Iterable[pd.Series], SeriesGroupBy, DataFrameGroupBy],
+    detector_class: Type[BaseOutlierDetection],
+    n_jobs: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    column: Optional[str] = None,
+    **kwargs: Any,
+) -> Union[List[pd.Series], pd.Series]:
+    """Runs `detector_class(data=series, **kwargs).run_workflow()` on each
+    series across a pool of processes.
+
+    Parameters
+    ----------
+    data : Union[Iterable[pd.Series], SeriesGroupBy, DataFrameGroupBy]
+        The series whose outliers needed to be detected, either as an iterable
+        of Series or as a grouped DataFrame / Series (one series per group)
+    detector_class : Type[BaseOutlierDetection]
+        The outlier detection class to use, e.g. `StdDevOutlierDetection`
+    n_jobs : Optional[int], optional
+        Number of processes to use. If 1, the series are processed in the main
+        process, by default None (number of CPUs)
+    batch_size : Optional[int], optional
+        Number of series sent to a process per task, by default None (about 4
+        tasks per process)
+    column : Optional[str], optional
+        Column containing the values when `data` is a grouped DataFrame,
+        by default None
+    **kwargs : Any
+        Additional arguments passed to `detector_class` (must be picklable)
+
+    Returns
+    -------
+    Union[List[pd.Series], pd.Series]
+        For an iterable of series, the list of corrected series in input
+        order. For grouped data, the corrected values aligned with the rows of
+        the original data.
+
+    Raises
+    ------
+    ValueError
+        When `data` is a grouped DataFrame and `column` is not provided
+    """
+    grouped = isinstance(data, (SeriesGroupBy, DataFrameGroupBy))
+    if isinstance(data, DataFrameGroupBy):
+        if column is None:
+            raise ValueError("`column` is required when `data` is a grouped DataFrame.")
+        data = data[column]
+    if grouped:
+        groups = list(data)
+        series = [group for _, group in groups]
+        positions = [data.indices[name] for name, _ in groups]
+    else:
+        series = list(data)
+
+    lengths = np.array([len(s) for s in series], dtype=np.int64)
+    ends = np.cumsum(lengths)
+    bounds = list(zip((ends - lengths).tolist(), ends.tolist()))
+    total = int(ends[-1]) if len(ends) else 0
+
+    n_jobs = n_jobs or os.cpu_count() or 1
+    if batch_size is None:
+        batch_size = max(1, math.ceil(len(series) / (n_jobs * 4)))
+    batches = [bounds[i : i + batch_size] for i in range(0, len(bounds), batch_size)]
+
+    # Shared memory blocks can not be empty
+    nbytes = max(total, 1) * np.dtype(np.float64).itemsize
+    shm_in = shared_memory.SharedMemory(create=True, size=nbytes)
+    shm_out = shared_memory.SharedMemory(create=True, size=nbytes)
+    try:
+        values = np.ndarray((total,), dtype=np.float64, buffer=shm_in.buf)
+        for s, (start, stop) in zip(series, bounds):
+            values[start:stop] = s.to_numpy(dtype=np.float64)
+
+        args = (shm_in.name, shm_out.name, total, detector_class, kwargs)
+        if n_jobs == 1:
+            for batch in batches:
+                _run_batch(*args, batch)
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                futures = [executor.submit(_run_batch, *args, b) for b in batches]
+                for future in futures:
+                    future.result()
+
+        corrected = np.ndarray((total,), dtype=np.float64, buffer=shm_out.buf)
+        results = [
+            pd.Series(corrected[start:stop].copy(), index=s.index, name=s.name)
+            for s, (start, stop) in zip(series, bounds)
+        ]
+        del values, corrected
+    finally:
+        for shm in (shm_in, shm_out):
+            shm.close()
+            shm.unlink()
+
+    if grouped:
+        # Rows not belonging to any group (missing group key) are left missing
+        aligned = np.full(len(data.obj), np.nan)
+        for result, rows in zip(results, positions):
+            aligned[rows] = result.to_numpy()
+        return pd.Series(aligned, index=data.obj.index, name=data.obj.name)
+    return results
+
+
+def _run_batch(
+    shm_in_name: str,
+    shm_out_name: str,
+    total: int,
+    detector_class: Type[BaseOutlierDetection],
+    kwargs: Dict[str, Any],
+    bounds: Bounds,
+):
+    """Runs the workflow on a batch of series stored in shared memory."""
+    shm_in = shared_memory.SharedMemory(name=shm_in_name)
+    shm_out = shared_memory.SharedMemory(name=shm_out_name)
+    try:
+        values = np.ndarray((total,), dtype=np.float64, buffer=shm_in.buf)
+        corrected = np.ndarray((total,), dtype=np.float64, buffer=shm_out.buf)
+        for start, stop in bounds:
+            series = pd.Series(values[start:stop])
+            detector_class(data=series, **kwargs).run_workflow(
+                out=corrected[start:stop]
+            )
+        # Views on the shared memory need to be released before closing it
+        del values, corrected, series
+    finally:
+        shm_in.close()
+        shm_out.close()
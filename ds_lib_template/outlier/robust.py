@@ -0,0 +1,247 @@
+"""Robust statistics on NaN aware float arrays.
+
+Medians and quantiles use `np.partition` based O(n) selection instead of a
+full sort whenever the data has no missing values. All the functions accept an
+`axis` argument so that many series (e.g. the columns of a 2-D array) can be
+processed in a single call.
+"""
+
+from typing import Optional, Union
+
+import numpy as np
+
+ArrayOrFloat = Union[float, np.ndarray]
+
+# Consistency constants making the estimators unbiased for normal data
+NORMAL_MAD_SCALE = 1.482602218505602
+NORMAL_QN_SCALE = 2.2219
+NORMAL_SN_SCALE = 1.1926
+
+# Finite sample corrections for n = 2..9 (Croux & Rousseeuw, 1992)
+_QN_SMALL_SAMPLE = [0.399, 0.994, 0.512, 0.844, 0.611, 0.857, 0.669, 0.872]
+_SN_SMALL_SAMPLE = [0.743, 1.851, 0.954, 1.351, 0.993, 1.198, 1.005, 1.131]
+
+
+def _quantile(
+    x: np.ndarray, q: float, axis: Optional[int], midpoint: bool = False
+) -> ArrayOrFloat:
+    """Linearly interpolated quantile ignoring missing values. With
+    `midpoint=True` the two order statistics around the quantile are averaged
+    instead (used for the median)."""
+    x = np.asarray(x, dtype=float)
+    if axis is None:
+        x, axis = x.ravel(), 0
+    x = np.moveaxis(x, axis, -1)
+
+    missing = np.isnan(x)
+    if missing.any() and x.ndim == 1:
+        x = x[~missing]
+        missing = np.zeros(len(x), dtype=bool)
+
+    n = x.shape[-1]
+    if not missing.any():
+        if n == 0:
+            return np.full(x.shape[:-1], np.nan)[()]
+        position = (n - 1) * q
+        lo = int(np.floor(position))
+        hi = min(lo + 1, n - 1)
+        partitioned = np.partition(x, sorted({lo, hi}), axis=-1)
+        lower, upper = partitioned[..., lo], partitioned[..., hi]
+        fraction = position - lo
+    else:
+        # The number of valid points differs between the series, so they are
+        # sorted (missing values last) and the order statistics gathered
+        counts = (~missing).sum(axis=-1)
+        ordered = np.sort(x, axis=-1)
+        position = (counts - 1).clip(0) * q
+        lo = np.floor(position).astype(np.int64)
+        hi = np.minimum(lo + 1, (counts - 1).clip(0))
+        lower = np.take_along_axis(ordered, lo[..., None], axis=-1)[..., 0]
+        upper = np.take_along_axis(ordered, hi[..., None], axis=-1)[..., 0]
+        fraction = position - lo
+
+    if midpoint:
+        result = np.where(fraction > 0, (lower + upper) / 2, lower)
+    else:
+        result = np.where(fraction > 0, lower + fraction * (upper - lower), lower)
+    if missing.any():
+        result = np.where(counts == 0, np.nan, result)
+    return result[()]
+
+
+def median(x: np.ndarray, axis: Optional[int] = None) -> ArrayOrFloat:
+    """Median ignoring missing values.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Input data
+    axis : Optional[int], optional
+        Axis along which the median is computed, by default None (flattened)
+
+    Returns
+    -------
+    ArrayOrFloat
+        The median (NaN for series without any value)
+    """
+    return _quantile(x, 0.5, axis=axis, midpoint=True)
+
+
+def quantile(x: np.ndarray, q: float, axis: Optional[int] = None) -> ArrayOrFloat:
+    """Quantile ignoring missing values (linear interpolation, same as
+    `np.nanquantile`).
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Input data
+    q : float
+        Quantile to compute, between 0 and 1
+    axis : Optional[int], optional
+        Axis along which the quantile is computed, by default None (flattened)
+
+    Returns
+    -------
+    ArrayOrFloat
+        The quantile (NaN for series without any value)
+    """
+    return _quantile(x, q, axis=axis)
+
+
+def median_abs_deviation(
+    x: np.ndarray,
+    axis: Optional[int] = None,
+    center: Optional[ArrayOrFloat] = None,
+    scale: float = 1.0,
+) -> ArrayOrFloat:
+    """Median absolute deviation from the median, ignoring missing values.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Input data
+    axis : Optional[int], optional
+        Axis along which the deviation is computed, by default None (flattened)
+    center : Optional[ArrayOrFloat], optional
+        Precomputed median(s) of the data, by default None (computed)
+    scale : float, optional
+        Factor the deviation is multiplied by. Use `NORMAL_MAD_SCALE` for a
+        consistent estimator of the standard deviation of normal data,
+        by default 1.0
+
+    Returns
+    -------
+    ArrayOrFloat
+        The median absolute deviation
+    """
+    x = np.asarray(x, dtype=float)
+    if center is None:
+        center = median(x, axis=axis)
+    if axis is not None:
+        center = np.expand_dims(center, axis)
+    return scale * median(np.abs(x - center), axis=axis)
+
+
+def iqr(x: np.ndarray, axis: Optional[int] = None) -> ArrayOrFloat:
+    """Interquartile range, ignoring missing values.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Input data
+    axis : Optional[int], optional
+        Axis along which the range is computed, by default None (flattened)
+
+    Returns
+    -------
+    ArrayOrFloat
+        The interquartile range
+    """
+    return quantile(x, 0.75, axis=axis) - quantile(x, 0.25, axis=axis)
+
+
+def _pairwise_scale(x: np.ndarray, axis: Optional[int], estimator) -> ArrayOrFloat:
+    """Applies a 1-D pairwise estimator to each series along `axis`."""
+    x = np.asarray(x, dtype=float)
+    if axis is None:
+        return estimator(x.ravel())
+    x = np.moveaxis(x, axis, -1)
+    result = np.empty(x.shape[:-1])
+    for index in np.ndindex(*x.shape[:-1]):
+        result[index] = estimator(x[index])
+    return result[()]
+
+
+def _qn_1d(x: np.ndarray) -> float:
+    """Qn estimator of a single series."""
+    x = x[~np.isnan(x)]
+    n = len(x)
+    if n < 2:
+        return np.nan
+    upper = np.triu_indices(n, k=1)
+    differences = np.abs(x[:, None] - x[None, :])[upper]
+    h = n // 2 + 1
+    k = h * (h - 1) // 2
+    statistic = np.partition(differences, k - 1)[k - 1]
+    if n <= 9:
+        correction = _QN_SMALL_SAMPLE[n - 2]
+    else:
+        correction = n / (n + 1.4) if n % 2 else n / (n + 3.8)
+    return NORMAL_QN_SCALE * correction * statistic
+
+
+def _sn_1d(x: np.ndarray) -> float:
+    """Sn estimator of a single series."""
+    x = x[~np.isnan(x)]
+    n = len(x)
+    if n < 2:
+        return np.nan
+    differences = np.abs(x[:, None] - x[None, :])
+    # High median over j for every i, then low median over i
+    inner = np.partition(differences, n // 2, axis=1)[:, n // 2]
+    statistic = np.partition(inner, (n + 1) // 2 - 1)[(n + 1) // 2 - 1]
+    if n <= 9:
+        correction = _SN_SMALL_SAMPLE[n - 2]
+    else:
+        correction = n / (n - 0.9) if n % 2 else 1.0
+    return NORMAL_SN_SCALE * correction * statistic
+
+
+def qn_scale(x: np.ndarray, axis: Optional[int] = None) -> ArrayOrFloat:
+    """Rousseeuw & Croux Qn scale estimator (consistent for the standard
+    deviation of normal data), ignoring missing values. Uses O(n^2) memory
+    per series, so it is meant for series of up to a few thousand points.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Input data
+    axis : Optional[int], optional
+        Axis along which the scale is computed, by default None (flattened)
+
+    Returns
+    -------
+    ArrayOrFloat
+        The Qn scale (NaN for series with less than 2 values)
+    """
+    return _pairwise_scale(x, axis, _qn_1d)
+
+
+def sn_scale(x: np.ndarray, axis: Optional[int] = None) -> ArrayOrFloat:
+    """Rousseeuw & Croux Sn scale estimator (consistent for the standard
+    deviation of normal data), ignoring missing values. Uses O(n^2) memory
+    per series, so it is meant for series of up to a few thousand points.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Input data
+    axis : Optional[int], optional
+        Axis along which the scale is computed, by default None (flattened)
+
+    Returns
+    -------
+    ArrayOrFloat
+        The Sn scale (NaN for series with less than 2 values)
+    """
+    return _pairwise_scale(x, axis, _sn_1d)
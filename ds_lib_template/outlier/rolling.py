@@ -0,0 +1,115 @@
+"""Rolling / expanding window versions of the deviation based detectors.
+
+Instead of one global pair of limits, these detectors compute one `ul` / `ll`
+per timestamp from the window ending at that timestamp, which makes them
+suitable for series whose level or spread drifts over time.
+"""
+
+import logging
+from abc import abstractmethod
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ds_lib_template.outlier.base import BaseOutlierDetection
+from ds_lib_template.outlier.deviation import BaseDeviationDetection
+from ds_lib_template.outlier.window import rolling_mean_std, rolling_median_mad
+
+
+class BaseRollingDeviationDetection(BaseDeviationDetection):
+    def __init__(
+        self,
+        data: pd.Series,
+        multiplier: int = 3,
+        window: Optional[int] = None,
+        min_periods: Optional[int] = None,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """Initializes the rolling outlier detection class. The `center`,
+        `deviation`, `ul` and `ll` attributes are Series aligned with `data`.
+
+        Parameters
+        ----------
+        data : pd.Series
+            Data whose outliers needed to be detected
+        multiplier : int, optional
+            Multiplier for deviation calculations, by default 3
+        window : Optional[int], optional
+            Number of points in each window, by default None (expanding window)
+        min_periods : Optional[int], optional
+            Minimum number of valid points needed in the window to set limits.
+            Points without limits are never flagged, by default None (`window`
+            for rolling and 1 for expanding windows)
+        logger : Optional[logging.Logger], optional
+            Logger object, by default None
+        """
+        self.window = window
+        self.min_periods = min_periods
+        self._statistics: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        super().__init__(data=data, multiplier=multiplier, logger=logger)
+
+    @abstractmethod
+    def _window_statistics(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Computes the per timestamp center and deviation."""
+
+    def _get_window_statistics(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the cached per timestamp center and deviation."""
+        if self._statistics is None:
+            self._statistics = self._window_statistics()
+        return self._statistics
+
+    def _get_statistics_params(self) -> Tuple:
+        """Parameters (other than `multiplier`) the statistics depend on."""
+        return self.window, self.min_periods
+
+    def _wrap_statistic(self, values: np.ndarray) -> pd.Series:
+        """Wraps a cached center or deviation array in a Series aligned with
+        `data`."""
+        return pd.Series(values, index=self.data.index)
+
+    def set_center(self) -> "BaseOutlierDetection":
+        """Sets the center of each window. Sets the `center` attribute.
+
+        Returns
+        -------
+        BaseOutlierDetection
+            Class object for chaining
+        """
+        center, _ = self._get_window_statistics()
+        self.center = pd.Series(center, index=self.data.index)
+        return self
+
+    def set_deviation(self) -> "BaseOutlierDetection":
+        """Sets the deviation of each window. Sets the `deviation` attribute.
+
+        Returns
+        -------
+        BaseOutlierDetection
+            Class object for chaining
+        """
+        _, deviation = self._get_window_statistics()
+        self.deviation = pd.Series(deviation, index=self.data.index)
+        return self
+
+
+class RollingStdDevOutlierDetection(BaseRollingDeviationDetection):
+    """Rolling mean and standard deviation, computed in O(n) from cumulative
+    sums."""
+
+    def _window_statistics(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Computes (once) the per timestamp center and deviation."""
+        return rolling_mean_std(
+            self.data.to_numpy(dtype=float), self.window, self.min_periods
+        )
+
+
+class RollingMADOutlierDetection(BaseRollingDeviationDetection):
+    """Rolling median and median absolute deviation, computed from a sorted
+    sliding window in O(n * window) (see `rolling_median_mad`)."""
+
+    def _window_statistics(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Computes (once) the per timestamp center and deviation."""
+        return rolling_median_mad(
+            self.data.to_numpy(dtype=float), self.window, self.min_periods
+        )
@@ -0,0 +1,273 @@
+"""Streaming (online) versions of the deviation based outlier detectors.
+
+Points are processed one at a time with O(1) work and constant memory. Each
+new point is checked against the limits learnt from the points seen before
+it and is then used to update the running statistics.
+"""
+
+import bisect
+import logging
+import math
+from abc import abstractmethod
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ds_lib_template.outlier.base import BaseOutlierDetection
+from ds_lib_template.outlier.deviation import BaseDeviationDetection
+
+
+class BaseStreamingDeviationDetection(BaseDeviationDetection):
+    def __init__(
+        self,
+        data: Optional[pd.Series] = None,
+        multiplier: int = 3,
+        min_periods: int = 10,
+        logger: Optional[logging.Logger] = None,
+    ):
+        """Initializes the streaming outlier detection class.
+
+        Parameters
+        ----------
+        data : Optional[pd.Series], optional
+            Historical data used to warm up the running statistics. Points
+            passed here are not flagged, by default None
+        multiplier : int, optional
+            Multiplier for deviation calculations, by default 3
+        min_periods : int, optional
+            Number of points that need to be seen before new points are
+            flagged, by default 10
+        logger : Optional[logging.Logger], optional
+            Logger object, by default None
+        """
+        if data is None:
+            data = pd.Series(dtype=float)
+        super().__init__(data=data, multiplier=multiplier, logger=logger)
+        self.min_periods = min_periods
+        self.n_seen = 0
+        for value in data.to_numpy(dtype=float):
+            self._learn(value)
+
+    @abstractmethod
+    def _update_state(self, value: float):
+        """Updates the running statistics with a new (non missing) point."""
+
+    def _learn(self, value: float):
+        """Adds a point to the running statistics, ignoring missing values."""
+        if math.isnan(value):
+            return
+        self._update_state(value)
+        self.n_seen += 1
+
+    def _get_statistics_key(self) -> None:
+        """The running statistics also depend on the points seen after `data`,
+        so they are never cached."""
+        return None
+
+    def _refresh_limits(self):
+        """Recomputes the limits from the current running statistics."""
+        self.set_center()
+        self.set_deviation()
+        self.set_limits()
+
+    def update(self, value: float) -> Tuple[bool, float]:
+        """Checks a new point against the current limits and then adds it to the
+        running statistics.
+
+        Parameters
+        ----------
+        value : float
+            The new point
+
+        Returns
+        -------
+        Tuple[bool, float]
+            Whether the point is an outlier and the (clipped) corrected point
+        """
+        value = float(value)
+        is_outlier = False
+        corrected = value
+        if self.n_seen >= self.min_periods:
+            self._refresh_limits()
+            if value > self.ul:
+                is_outlier, corrected = True, self.ul
+            elif value < self.ll:
+                is_outlier, corrected = True, self.ll
+        self._learn(value)
+        return is_outlier, corrected
+
+    def update_batch(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Processes an array of new points, in order, as if `update` was called
+        on each one of them.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            The new points
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            Boolean outlier mask and (clipped) corrected points
+        """
+        values = np.asarray(values, dtype=float).ravel()
+        outliers = np.zeros(len(values), dtype=bool)
+        corrected = np.empty(len(values))
+        for i, value in enumerate(values):
+            outliers[i], corrected[i] = self.update(value)
+        return outliers, corrected
+
+
+class StreamingStdDevOutlierDetection(BaseStreamingDeviationDetection):
+    """Uses Welford's algorithm to keep a running mean and standard deviation."""
+
+    def __init__(self, *args, **kwargs):
+        self._mean = 0.0
+        self._m2 = 0.0
+        super().__init__(*args, **kwargs)
+
+    def _update_state(self, value: float):
+        """Updates the running mean and sum of squared differences."""
+        delta = value - self._mean
+        self._mean += delta / (self.n_seen + 1)
+        self._m2 += delta * (value - self._mean)
+
+    def set_center(self) -> "BaseOutlierDetection":
+        """Sets the center of the data. Sets the `center` attribute.
+
+        Returns
+        -------
+        BaseOutlierDetection
+            Class object for chaining
+        """
+        self.center = self._mean if self.n_seen > 0 else np.nan
+        return self
+
+    def set_deviation(self) -> "BaseOutlierDetection":
+        """Sets the deviation of the data. Sets the `deviation` attribute.
+
+        Returns
+        -------
+        BaseOutlierDetection
+            Class object for chaining
+        """
+        if self.n_seen > 1:
+            self.deviation = math.sqrt(self._m2 / (self.n_seen - 1))
+        else:
+            self.deviation = np.nan
+        return self
+
+
+class StreamingMADOutlierDetection(BaseStreamingDeviationDetection):
+    """Uses the P-square algorithm to approximate the running median and the
+    running median absolute deviation from it. Exact for the first 5 points.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._median = _P2Quantile(0.5)
+        self._abs_deviation = _P2Quantile(0.5)
+        super().__init__(*args, **kwargs)
+
+    def _update_state(self, value: float):
+        """Updates the running median and median absolute deviation estimates."""
+        self._median.add(value)
+        self._abs_deviation.add(abs(value - self._median.value))
+
+    def set_center(self) -> "BaseOutlierDetection":
+        """Sets the center of the data. Sets the `center` attribute.
+
+        Returns
+        -------
+        BaseOutlierDetection
+            Class object for chaining
+        """
+        self.center = self._median.value
+        return self
+
+    def set_deviation(self) -> "BaseOutlierDetection":
+        """Sets the deviation of the data. Sets the `deviation` attribute.
+
+        Returns
+        -------
+        BaseOutlierDetection
+            Class object for chaining
+        """
+        self.deviation = self._abs_deviation.value
+        return self
+
+
+class _P2Quantile:
+    """Constant memory quantile estimator (Jain & Chlamtac P-square algorithm).
+
+    References
+    ----------
+    .. [1] https://www.cse.wustl.edu/~jain/papers/ftp/psqr.pdf
+    """
+
+    def __init__(self, p: float):
+        self.p = p
+        self._initial = []
+        self._heights = None
+        self._positions = None
+        self._desired = None
+        self._increments = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    @property
+    def value(self) -> float:
+        """Current estimate of the quantile (NaN when no point has been seen)."""
+        if self._heights is not None:
+            return self._heights[2]
+        if not self._initial:
+            return np.nan
+        rank = self.p * (len(self._initial) - 1)
+        lower = math.floor(rank)
+        upper = min(lower + 1, len(self._initial) - 1)
+        fraction = rank - lower
+        return self._initial[lower] + fraction * (
+            self._initial[upper] - self._initial[lower]
+        )
+
+    def add(self, value: float):
+        """Adds a point to the estimator."""
+        if self._heights is None:
+            bisect.insort(self._initial, value)
+            if len(self._initial) == 5:
+                p = self.p
+                self._heights = self._initial
+                self._positions = [0, 1, 2, 3, 4]
+                self._desired = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]
+            return
+
+        q, n = self._heights, self._positions
+        if value < q[0]:
+            q[0] = value
+            k = 0
+        elif value >= q[4]:
+            q[4] = value
+            k = 3
+        else:
+            k = bisect.bisect_right(q, value) - 1
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        for i in range(1, 4):
+            d = self._desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                step = 1 if d > 0 else -1
+                height = self._parabolic(i, step)
+                if not q[i - 1] < height < q[i + 1]:
+                    height = q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+                q[i] = height
+                n[i] += step
+
+    def _parabolic(self, i: int, step: int) -> float:
+        """Piecewise parabolic prediction of the height of marker `i`."""
+        q, n = self._heights, self._positions
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
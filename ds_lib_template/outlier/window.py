@@ -0,0 +1,210 @@
+"""Window kernels used by the rolling / expanding deviation based detectors.
+
+All kernels take a 1-D float array (missing values as NaN, which are ignored)
+and return one value per position, computed from the window ending at (and
+including) that position. `window=None` gives an expanding window.
+"""
+
+import bisect
+from typing import Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def _window_bounds(n: int, window: Optional[int]) -> Tuple[np.ndarray, np.ndarray]:
+    """Start (inclusive) and end (exclusive) positions of each window."""
+    end = np.arange(1, n + 1)
+    if window is None:
+        start = np.zeros(n, dtype=int)
+    else:
+        start = np.maximum(end - window, 0)
+    return start, end
+
+
+def _default_min_periods(window: Optional[int], min_periods: Optional[int]) -> int:
+    """Same defaults as pandas: full window for rolling, 1 for expanding."""
+    if min_periods is not None:
+        return min_periods
+    return 1 if window is None else window
+
+
+def _cumsum_rows(array: np.ndarray) -> np.ndarray:
+    """Cumulative sums of each row, starting with 0."""
+    zeros = np.zeros((len(array), 1), dtype=array.dtype)
+    return np.concatenate([zeros, np.cumsum(array, axis=1)], axis=1)
+
+
+def rolling_mean_std(
+    values: np.ndarray,
+    window: Optional[int] = None,
+    min_periods: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Rolling mean and (sample) standard deviation in O(n) using cumulative
+    sums. The sums of a rolling window are differences of cumulative sums
+    which only span the block of `window` points containing the window end
+    and the block before it, relative to the mean of these blocks, so that a
+    level shift elsewhere in the series does not cancel out the precision of
+    the sum of squares.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Data to compute the statistics on
+    window : Optional[int], optional
+        Size of the window, by default None (expanding window)
+    min_periods : Optional[int], optional
+        Minimum number of valid points in the window to produce a value,
+        by default None (`window` for rolling and 1 for expanding windows)
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        Rolling mean and standard deviation
+    """
+    values = np.asarray(values, dtype=float)
+    min_periods = _default_min_periods(window, min_periods)
+    n = len(values)
+    start, end = _window_bounds(n, window)
+    if window is None:
+        # Expanding windows all start at the first point: a single block, with
+        # the first valid point as anchor as the variance of the first windows
+        # is the smallest
+        blocks = values[None, :]
+        valid = ~np.isnan(blocks)
+        anchors = blocks[valid][:1] if valid.any() else np.zeros(1)
+        rows = np.zeros(n, dtype=int)
+    else:
+        # Row k holds the points [(k - 1) * window, (k + 1) * window), which
+        # contain all the windows ending in [k * window, (k + 1) * window)
+        n_blocks = -(-n // window)
+        padded = np.full((n_blocks + 1) * window, np.nan)
+        padded[window : window + n] = values
+        blocks = sliding_window_view(padded, 2 * window)[::window][:n_blocks]
+        rows = (end - 1) // window
+        offset = (rows - 1) * window
+        start, end = start - offset, end - offset
+        # Mean of each row as its anchor
+        valid = ~np.isnan(blocks)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            anchors = np.where(valid, blocks, 0.0).sum(axis=1) / valid.sum(axis=1)
+        anchors = np.nan_to_num(anchors)
+
+    shifted = np.where(valid, blocks - anchors[:, None], 0.0)
+
+    sums, squares, counts = map(_cumsum_rows, (shifted, shifted**2, valid.astype(int)))
+    total = sums[rows, end] - sums[rows, start]
+    total_squares = squares[rows, end] - squares[rows, start]
+    count = counts[rows, end] - counts[rows, start]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = total / count + anchors[rows]
+        variance = (total_squares - total**2 / count) / (count - 1)
+    variance = np.maximum(variance, 0.0)
+    std = np.sqrt(variance)
+
+    mean[count < max(min_periods, 1)] = np.nan
+    std[count < max(min_periods, 2)] = np.nan
+    return mean, std
+
+
+def rolling_median_mad(
+    values: np.ndarray,
+    window: Optional[int] = None,
+    min_periods: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Rolling median and (exact) median absolute deviation from the median.
+
+    The points in the window are kept in a sorted list which is updated with a
+    binary search insertion / deletion as the window slides. Finding the
+    position is O(log(window)), but inserting / deleting shifts the list, so
+    each step is O(window) (a memmove, small next to the per point Python
+    overhead for the usual window sizes): O(n * window) in total, and O(n**2)
+    for an expanding window. The median is then read in O(1), and the median
+    absolute deviation is found in O(log(window)) as a k-th smallest element
+    of the two sorted sequences of distances on either side of the median.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Data to compute the statistics on
+    window : Optional[int], optional
+        Size of the window, by default None (expanding window)
+    min_periods : Optional[int], optional
+        Minimum number of valid points in the window to produce a value,
+        by default None (`window` for rolling and 1 for expanding windows)
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        Rolling median and median absolute deviation
+    """
+    values = np.asarray(values, dtype=float)
+    min_periods = max(_default_min_periods(window, min_periods), 1)
+    n = len(values)
+    median = np.full(n, np.nan)
+    mad = np.full(n, np.nan)
+
+    points = values.tolist()
+    ordered = []
+    for i, value in enumerate(points):
+        if value == value:
+            bisect.insort(ordered, value)
+        if window is not None and i >= window:
+            old = points[i - window]
+            if old == old:
+                del ordered[bisect.bisect_left(ordered, old)]
+
+        count = len(ordered)
+        if count < min_periods:
+            continue
+
+        half = count // 2
+        if count % 2:
+            center = ordered[half]
+            deviation = _kth_abs_deviation(ordered, center, half)
+        else:
+            center = (ordered[half - 1] + ordered[half]) / 2
+            deviation = (
+                _kth_abs_deviation(ordered, center, half - 1)
+                + _kth_abs_deviation(ordered, center, half)
+            ) / 2
+        median[i] = center
+        mad[i] = deviation
+
+    return median, mad
+
+
+def _kth_abs_deviation(ordered: list, center: float, k: int) -> float:
+    """k-th (0 based) smallest value of |x - center| for a sorted list `x`.
+
+    The distances to the left of `center` (read right to left) and to its right
+    (read left to right) form two ascending sequences, so the k-th smallest
+    distance is found with a binary search on how many of them come from the
+    left sequence.
+    """
+    split = bisect.bisect_left(ordered, center)
+    n_left, n_right = split, len(ordered) - split
+
+    def left(i):
+        return center - ordered[split - 1 - i]
+
+    def right(i):
+        return ordered[split + i] - center
+
+    lo, hi = max(0, k + 1 - n_right), min(n_left, k + 1)
+    while True:
+        i = (lo + hi) // 2
+        j = k + 1 - i
+        if i < n_left and j > 0 and right(j - 1) > left(i):
+            lo = i + 1
+        elif i > 0 and j < n_right and left(i - 1) > right(j):
+            hi = i - 1
+        else:
+            break
+
+    if i == 0:
+        return right(j - 1)
+    if j == 0:
+        return left(i - 1)
+    return max(left(i - 1), right(j - 1))
@@ -0,0 +1,120 @@
+"""Costs of segments of a series, computed in O(1) per segment from prefix
+sums of the data (missing values are ignored)."""
+
+from abc import ABC, abstractmethod
+from typing import Dict, Tuple, Type
+
+import numpy as np
+
+
+class BaseCost(ABC):
+    # Number of parameters fitted on each segment (used by the default penalty)
+    n_params = 1
+
+    def __init__(self, values: np.ndarray):
+        """Precomputes the prefix sums of the data.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            The (1-D) data to segment
+        """
+        values = np.asarray(values, dtype=float)
+        valid = ~np.isnan(values)
+        # Centering limits the cancellation errors of the sums of squares
+        center = values[valid].mean() if valid.any() else 0.0
+        centered = np.where(valid, values - center, 0.0)
+
+        self.n_obs = len(values)
+        # Floats, as the arithmetic of the costs is much faster than mixing types
+        self._counts = np.concatenate([[0.0], np.cumsum(valid, dtype=float)])
+        self._sums = np.concatenate([[0.0], np.cumsum(centered)])
+        self._squares = np.concatenate([[0.0], np.cumsum(centered**2)])
+
+    def _get_squared_errors(
+        self, start: np.ndarray, stop: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Number of non missing points and sum of their squared differences
+        to the mean of the segments [start, stop)."""
+        counts = self._counts[stop] - self._counts[start]
+        sums = self._sums[stop] - self._sums[start]
+        # The sums of segments without any points are 0
+        errors = self._squares[stop] - self._squares[start]
+        errors -= sums**2 / np.maximum(counts, 1.0)
+        return counts, errors
+
+    @abstractmethod
+    def cost(self, start: np.ndarray, stop: int) -> np.ndarray:
+        """Costs of the segments [start, stop) (vectorized over `start`).
+
+        Parameters
+        ----------
+        start : np.ndarray
+            First position of each segment
+        stop : int
+            Position following the last position of the segments
+
+        Returns
+        -------
+        np.ndarray
+            The cost of each segment
+        """
+
+    @abstractmethod
+    def default_penalty(self) -> float:
+        """Penalty of a change point, by default (BIC like).
+
+        Returns
+        -------
+        float
+            The penalty
+        """
+
+
+class L2Cost(BaseCost):
+    """Sum of the squared differences to the segment mean: detects changes of
+    the mean of series with a constant variance."""
+
+    def __init__(self, values: np.ndarray):
+        super().__init__(values)
+        # The noise variance is estimated from the first differences, which
+        # are robust to the (few) changes of the mean
+        values = np.asarray(values, dtype=float)
+        differences = np.diff(values[~np.isnan(values)])
+        self._noise_variance = 0.0
+        if len(differences):
+            mad = np.median(np.abs(differences - np.median(differences)))
+            self._noise_variance = (mad / 0.6745) ** 2 / 2 or differences.var() / 2
+
+    def cost(self, start: np.ndarray, stop: int) -> np.ndarray:
+        return self._get_squared_errors(start, stop)[1]
+
+    def default_penalty(self) -> float:
+        n_obs = max(self._counts[-1], 2)
+        return (self.n_params + 1) * self._noise_variance * np.log(n_obs)
+
+
+class NormalCost(BaseCost):
+    """Negative Gaussian log-likelihood (up to constants) of the segment: detects
+    changes of the mean and / or the variance."""
+
+    n_params = 2
+
+    def __init__(self, values: np.ndarray):
+        super().__init__(values)
+        # Floor of the variance of a segment, so that constant segments do not
+        # have an infinitely negative cost
+        total_variance = self._squares[-1] / max(self._counts[-1], 1)
+        self._min_variance = 1e-8 * max(total_variance, 1e-8)
+
+    def cost(self, start: np.ndarray, stop: int) -> np.ndarray:
+        counts, errors = self._get_squared_errors(start, stop)
+        # Segments without any points have a cost of 0
+        variance = np.maximum(errors / np.maximum(counts, 1.0), self._min_variance)
+        return counts * np.log(variance)
+
+    def default_penalty(self) -> float:
+        return (self.n_params + 1) * np.log(max(self._counts[-1], 2))
+
+
+COSTS: Dict[str, Type[BaseCost]] = {"l2": L2Cost, "normal": NormalCost}
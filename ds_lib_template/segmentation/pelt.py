@@ -0,0 +1,214 @@
+"""Change point detection with PELT (Pruned Exact Linear Time).
+
+The optimal segmentation minimizes the sum of the segment costs plus a
+penalty per change point, by dynamic programming over the last change point
+before each position. Candidates which can never be the last change point of
+an optimal segmentation again are pruned, so the cost is close to linear in
+the length of the series (instead of quadratic) when the number of change
+points grows with it. The segment costs are O(1) from prefix sums.
+
+References
+----------
+.. [1] Killick, Fearnhead & Eckley, Optimal detection of changepoints with a
+   linear computational cost, JASA 107, 1590-1598 (2012),
+   https://doi.org/10.1080/01621459.2012.737745
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Hashable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from ds_lib_template.segmentation.cost import COSTS
+from ds_lib_template.segmentation.segments import Segmentation
+
+
+def pelt(
+    values: np.ndarray,
+    cost: str = "l2",
+    penalty: Optional[float] = None,
+    min_size: int = 2,
+) -> np.ndarray:
+    """Optimal change points of a series.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        The (1-D) data to segment. Missing values are ignored by the costs.
+    cost : str, optional
+        Cost of a segment: "l2" (changes of the mean) or "normal" (changes of
+        the mean and / or variance), by default "l2"
+    penalty : Optional[float], optional
+        Penalty of each change point, by default None (BIC like penalty of
+        the cost). Larger penalties give fewer segments.
+    min_size : int, optional
+        Minimum number of points of a segment, by default 2
+
+    Returns
+    -------
+    np.ndarray
+        The breakpoints: position following the last point of each segment
+
+    Raises
+    ------
+    ValueError
+        When the cost is unknown or `min_size` is less than 1
+    """
+    if cost not in COSTS:
+        raise ValueError(f"Unknown cost '{cost}', expected one of {list(COSTS)}.")
+    if min_size < 1:
+        raise ValueError("`min_size` must be at least 1.")
+    n_obs = len(values)
+    if n_obs < 2 * min_size:
+        return np.array([n_obs]) if n_obs else np.array([], dtype=int)
+
+    segment_cost = COSTS[cost](values)
+    penalty = segment_cost.default_penalty() if penalty is None else penalty
+
+    # Optimal penalized cost of the first t points and the last change point of
+    # the corresponding segmentation
+    optimal = np.full(n_obs + 1, np.inf)
+    optimal[0] = -penalty
+    last = np.zeros(n_obs + 1, dtype=int)
+    # Candidate last change points (the first `n_candidates` entries) and the
+    # position from which each one can be pruned
+    candidates = np.empty(n_obs + 1, dtype=int)
+    pruned_from = np.empty(n_obs + 1, dtype=int)
+    n_candidates = 0
+    for t in range(min_size, n_obs + 1):
+        # The segment (new_candidate, t] is the first one long enough
+        new_candidate = t - min_size
+        if new_candidate == 0 or new_candidate >= min_size:
+            candidates[n_candidates] = new_candidate
+            pruned_from[n_candidates] = n_obs + 1
+            n_candidates += 1
+        kept = pruned_from[:n_candidates] > t
+        if not kept.all():
+            n_kept = int(kept.sum())
+            candidates[:n_kept] = candidates[:n_candidates][kept]
+            pruned_from[:n_kept] = pruned_from[:n_candidates][kept]
+            n_candidates = n_kept
+
+        current = candidates[:n_candidates]
+        costs = segment_cost.cost(current, t)
+        costs += optimal[current]
+        best = costs.argmin()
+        optimal[t] = costs[best] + penalty
+        last[t] = current[best]
+        # Candidates which can not beat t as the last change point anymore. As
+        # the segment following t must have at least `min_size` points, they
+        # are only pruned `min_size` positions later.
+        pruned = pruned_from[:n_candidates]
+        pruned[(costs > optimal[t]) & (pruned > n_obs)] = t + min_size
+    breakpoints = [n_obs]
+    while last[breakpoints[-1]] > 0:
+        breakpoints.append(last[breakpoints[-1]])
+    return np.array(breakpoints[::-1])
+
+
+def segment(
+    data: pd.Series,
+    cost: str = "l2",
+    penalty: Optional[float] = None,
+    min_size: int = 2,
+) -> Segmentation:
+    """Segments a series into regimes.
+
+    Parameters
+    ----------
+    data : pd.Series
+        The series to segment
+    cost : str, optional
+        Cost of a segment, see `pelt`, by default "l2"
+    penalty : Optional[float], optional
+        Penalty of each change point, see `pelt`, by default None
+    min_size : int, optional
+        Minimum number of points of a segment, by default 2
+
+    Returns
+    -------
+    Segmentation
+        The segments of the series
+    """
+    breakpoints = pelt(
+        data.to_numpy(dtype=float), cost=cost, penalty=penalty, min_size=min_size
+    )
+    return Segmentation(data, breakpoints)
+
+
+def _strip_padding(data: pd.Series) -> pd.Series:
+    """Series without its leading and trailing missing values."""
+    valid = np.flatnonzero(data.notna().to_numpy())
+    if not len(valid):
+        return data.iloc[:0]
+    return data.iloc[valid[0] : valid[-1] + 1]
+
+
+def _pelt_batch(
+    values: List[np.ndarray], cost: str, penalty: Optional[float], min_size: int
+) -> List[np.ndarray]:
+    """Breakpoints of a batch of series."""
+    return [pelt(v, cost=cost, penalty=penalty, min_size=min_size) for v in values]
+
+
+def segment_panel(
+    data: pd.DataFrame,
+    cost: str = "l2",
+    penalty: Optional[float] = None,
+    min_size: int = 2,
+    n_jobs: int = 1,
+    batch_size: Optional[int] = None,
+) -> Dict[Hashable, Segmentation]:
+    """Segments many series into regimes, across a pool of processes. Only the
+    values of the series are sent to the processes.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        Wide data (one column per series). Series of unequal length can be
+        padded with NaN, the padding (leading and trailing missing values) is
+        not part of the segments. Missing values within a series are kept, as
+        in `segment`.
+    cost : str, optional
+        Cost of a segment, see `pelt`, by default "l2"
+    penalty : Optional[float], optional
+        Penalty of each change point (the same for all the series), by default
+        None (BIC like penalty of each series)
+    min_size : int, optional
+        Minimum number of points of a segment, by default 2
+    n_jobs : int, optional
+        Number of processes. If 1, the series are segmented in the main
+        process, by default 1. Use -1 for the number of CPUs.
+    batch_size : Optional[int], optional
+        Number of series sent to a process per task, by default None (about 4
+        tasks per process)
+
+    Returns
+    -------
+    Dict[Hashable, Segmentation]
+        The segments of each series (column)
+    """
+    series = [_strip_padding(data[column]) for column in data.columns]
+    values = [s.to_numpy(dtype=float) for s in series]
+    n_jobs = n_jobs if n_jobs != -1 else os.cpu_count() or 1
+    if n_jobs == 1:
+        breakpoints = _pelt_batch(values, cost, penalty, min_size)
+    else:
+        batch_size = batch_size or max(1, math.ceil(len(values) / (n_jobs * 4)))
+        batches = [
+            values[i : i + batch_size] for i in range(0, len(values), batch_size)
+        ]
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            futures = [
+                executor.submit(_pelt_batch, batch, cost, penalty, min_size)
+                for batch in batches
+            ]
+            breakpoints = [b for future in futures for b in future.result()]
+
+    return {
+        column: Segmentation(s, b)
+        for column, s, b in zip(data.columns, series, breakpoints)
+    }
@@ -0,0 +1,144 @@
+import copy
+from typing import Any, Iterator, List, Optional, Tuple, Type
+
+import numpy as np
+import pandas as pd
+
+from ds_lib_template.forecasting.model.base import BaseForecaster
+from ds_lib_template.outlier.base import BaseOutlierDetection
+from ds_lib_template.outlier.deviation import StdDevOutlierDetection
+
+
+class Segmentation:
+    def __init__(self, data: pd.Series, breakpoints: np.ndarray):
+        """Segments (regimes) of a series.
+
+        Parameters
+        ----------
+        data : pd.Series
+            The segmented series
+        breakpoints : np.ndarray
+            Position following the last point of each segment (the last
+            breakpoint is the length of the data)
+        """
+        self.data = data
+        self.breakpoints = np.asarray(breakpoints, dtype=int)
+
+    def __len__(self) -> int:
+        return len(self.breakpoints)
+
+    def __iter__(self) -> Iterator[pd.Series]:
+        return (self.data.iloc[start:stop] for start, stop in self.get_bounds())
+
+    def __repr__(self) -> str:
+        return f"Segmentation(n_segments={len(self)}, breakpoints={self.breakpoints})"
+
+    def get_bounds(self) -> List[Tuple[int, int]]:
+        """Returns the (start, stop) positions of each segment.
+
+        Returns
+        -------
+        List[Tuple[int, int]]
+            The bounds of each segment (stop excluded)
+        """
+        starts = np.concatenate([[0], self.breakpoints[:-1]])
+        return list(zip(starts.tolist(), self.breakpoints.tolist()))
+
+    def get_segment(self, segment: int = -1) -> pd.Series:
+        """Returns the data of a segment.
+
+        Parameters
+        ----------
+        segment : int, optional
+            Number of the segment, by default -1 (the last one)
+
+        Returns
+        -------
+        pd.Series
+            The data of the segment
+        """
+        start, stop = self.get_bounds()[segment]
+        return self.data.iloc[start:stop]
+
+    def get_change_points(self) -> pd.Index:
+        """Returns the index of the first point of each segment but the first.
+
+        Returns
+        -------
+        pd.Index
+            The change points
+        """
+        return self.data.index[self.breakpoints[:-1]]
+
+    def get_labels(self) -> pd.Series:
+        """Returns the segment of each point.
+
+        Returns
+        -------
+        pd.Series
+            The segment number of each point, aligned with the data
+        """
+        lengths = np.diff(np.concatenate([[0], self.breakpoints]))
+        return pd.Series(
+            np.repeat(np.arange(len(self)), lengths),
+            index=self.data.index,
+            name="segment",
+        )
+
+    def run_workflow(
+        self,
+        detector_class: Type[BaseOutlierDetection] = StdDevOutlierDetection,
+        **kwargs: Any,
+    ) -> pd.Series:
+        """Runs the outlier detection workflow on each segment separately, so
+        that the limits follow the regimes of the series.
+
+        Parameters
+        ----------
+        detector_class : Type[BaseOutlierDetection], optional
+            Outlier detection class, by default StdDevOutlierDetection
+        **kwargs : Any
+            Additional arguments passed to the detector (e.g. `multiplier`)
+
+        Returns
+        -------
+        pd.Series
+            The corrected data
+        """
+        corrected = [
+            detector_class(data=segment, **kwargs).run_workflow().get_corrected_data()
+            for segment in self
+        ]
+        return pd.concat(corrected) if corrected else self.data.copy()
+
+    def fit_forecaster(
+        self,
+        forecaster: BaseForecaster,
+        segment: int = -1,
+        X: Optional[pd.DataFrame] = None,
+        fh: Optional[int] = None,
+    ) -> BaseForecaster:
+        """Fits a copy of a forecaster on a single segment, by default the last
+        (current) regime of the series.
+
+        Parameters
+        ----------
+        forecaster : BaseForecaster
+            The (unfitted) forecaster
+        segment : int, optional
+            Number of the segment, by default -1 (the last one)
+        X : Optional[pd.DataFrame], optional
+            Exogenous variables (aligned with the data), by default None
+        fh : Optional[int], optional
+            The forecasters horizon with the steps ahead to to predict, by default None
+
+        Returns
+        -------
+        BaseForecaster
+            The forecaster fitted on the segment
+        """
+        start, stop = self.get_bounds()[segment]
+        X_segment = X.iloc[start:stop] if X is not None else None
+        return copy.deepcopy(forecaster).fit(
+            y=self.data.iloc[start:stop], X=X_segment, fh=fh
+        )
@@ -0,0 +1,80 @@
+"""In memory caches."""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class LRUCache:
+    """Mapping with a bounded number of entries, evicting the least recently
+    used entry when full. Safe to share between threads."""
+
+    def __init__(self, maxsize: int = 128):
+        """Initializes an empty cache.
+
+        Parameters
+        ----------
+        maxsize : int, optional
+            Maximum number of entries kept in the cache, by default 128
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        # The lookups reorder the entries, so they are guarded as well
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Returns the value stored for `key` (marking it as recently used),
+        or `default` if there is none.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key of the entry
+        default : Optional[Any], optional
+            Value returned when the key is not in the cache, by default None
+
+        Returns
+        -------
+        Any
+            The cached value or `default`
+        """
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        """Stores a value, evicting the least recently used entries if needed.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key of the entry
+        value : Any
+            Value to store
+        """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Removes all the entries and resets the hit / miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,270 @@
+"""Opt-in instrumentation of the hot paths of the base classes.
+
+The stages of the workflows (e.g. `set_center`, `detect_outliers`, `_fit`,
+`_predict`, `_set_component_trend`) are wrapped when their class is defined
+(see `instrument_methods`). While the instrumentation is disabled (the
+default), a wrapped stage only costs one extra function call and flag check.
+Once enabled, every call of a stage reports its wall time and the number of
+rows it processed to a metrics sink.
+
+Example
+-------
+>>> with instrument() as sink:
+...     StdDevOutlierDetection(data=data).run_workflow()
+>>> sink.get_stats()["StdDevOutlierDetection.set_center"]
+{'count': 1, 'total_time': 0.0004, 'mean_time': 0.0004, 'max_time': 0.0004,
+ 'rows': 1000}
+"""
+
+import functools
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+import numpy as np
+
+
+class MetricsSink(ABC):
+    @abstractmethod
+    def record(
+        self,
+        stage: str,
+        elapsed: float,
+        rows: Optional[int],
+        logger: Optional[logging.Logger] = None,
+    ):
+        """Records a call of an instrumented stage.
+
+        Parameters
+        ----------
+        stage : str
+            Name of the stage ("<class name>.<method name>")
+        elapsed : float
+            Wall time of the call (in seconds)
+        rows : Optional[int]
+            Number of rows processed by the call, if known
+        logger : Optional[logging.Logger], optional
+            Logger of the instrumented object, by default None
+        """
+
+
+class StatsSink(MetricsSink):
+    def __init__(self):
+        """Aggregates the call counts, times and rows of every stage."""
+        self._stats: Dict[str, Dict[str, float]] = defaultdict(
+            lambda: {"count": 0, "total_time": 0.0, "max_time": 0.0, "rows": 0}
+        )
+
+    def record(
+        self,
+        stage: str,
+        elapsed: float,
+        rows: Optional[int],
+        logger: Optional[logging.Logger] = None,
+    ):
+        stats = self._stats[stage]
+        stats["count"] += 1
+        stats["total_time"] += elapsed
+        stats["max_time"] = max(stats["max_time"], elapsed)
+        stats["rows"] += rows or 0
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Returns the aggregated metrics of each stage.
+
+        Returns
+        -------
+        Dict[str, Dict[str, float]]
+            The call count, total / mean / max time (in seconds) and total
+            number of rows processed, by stage
+        """
+        return {
+            stage: {
+                "count": stats["count"],
+                "total_time": stats["total_time"],
+                "mean_time": stats["total_time"] / stats["count"],
+                "max_time": stats["max_time"],
+                "rows": stats["rows"],
+            }
+            for stage, stats in self._stats.items()
+        }
+
+    def reset(self):
+        """Removes all the recorded metrics."""
+        self._stats.clear()
+
+    def report(
+        self, logger: Optional[logging.Logger] = None, level: int = logging.INFO
+    ):
+        """Logs the aggregated metrics of each stage, slowest stages first.
+
+        Parameters
+        ----------
+        logger : Optional[logging.Logger], optional
+            Logger object, by default None
+        level : int, optional
+            Logging level, by default logging.INFO
+        """
+        logger = logger or logging.getLogger()
+        stats = self.get_stats()
+        for stage in sorted(stats, key=lambda s: -stats[s]["total_time"]):
+            s = stats[stage]
+            logger.log(
+                level,
+                f"{stage}: {s['count']} calls, {s['total_time'] * 1e3:.3f} ms total, "
+                f"{s['mean_time'] * 1e3:.3f} ms mean, {s['rows']} rows",
+            )
+
+
+class LoggerSink(MetricsSink):
+    def __init__(
+        self, logger: Optional[logging.Logger] = None, level: int = logging.INFO
+    ):
+        """Logs every call of the instrumented stages.
+
+        Parameters
+        ----------
+        logger : Optional[logging.Logger], optional
+            Logger object, by default None (the logger of the instrumented
+            object)
+        level : int, optional
+            Logging level, by default logging.INFO
+        """
+        self.logger = logger
+        self.level = level
+
+    def record(
+        self,
+        stage: str,
+        elapsed: float,
+        rows: Optional[int],
+        logger: Optional[logging.Logger] = None,
+    ):
+        logger = self.logger or logger or logging.getLogger()
+        rows_info = f" ({rows} rows)" if rows is not None else ""
+        logger.log(self.level, f"{stage} took {elapsed * 1e3:.3f} ms{rows_info}")
+
+
+class _State:
+    __slots__ = ("enabled", "sink")
+
+    def __init__(self):
+        self.enabled = False
+        self.sink: Optional[MetricsSink] = None
+
+
+_STATE = _State()
+
+
+def enable(sink: Optional[MetricsSink] = None) -> MetricsSink:
+    """Enables the instrumentation.
+
+    Parameters
+    ----------
+    sink : Optional[MetricsSink], optional
+        Where to report the metrics, by default None (a new StatsSink)
+
+    Returns
+    -------
+    MetricsSink
+        The sink the metrics are reported to
+    """
+    _STATE.sink = sink or StatsSink()
+    _STATE.enabled = True
+    return _STATE.sink
+
+
+def disable():
+    """Disables the instrumentation."""
+    _STATE.enabled = False
+    _STATE.sink = None
+
+
+def is_enabled() -> bool:
+    """Whether the instrumentation is enabled."""
+    return _STATE.enabled
+
+
+@contextmanager
+def instrument(sink: Optional[MetricsSink] = None) -> Iterator[MetricsSink]:
+    """Enables the instrumentation within a `with` block.
+
+    Parameters
+    ----------
+    sink : Optional[MetricsSink], optional
+        Where to report the metrics, by default None (a new StatsSink)
+
+    Yields
+    ------
+    MetricsSink
+        The sink the metrics are reported to
+    """
+    previous = (_STATE.enabled, _STATE.sink)
+    try:
+        yield enable(sink)
+    finally:
+        _STATE.enabled, _STATE.sink = previous
+
+
+def _count_rows(instance: Any, args: tuple, kwargs: Dict[str, Any]) -> Optional[int]:
+    """Number of rows processed by a stage: the length of its first argument
+    (or the horizon if it is an integer), else the length of the data (or the
+    predictions) of the instrumented object."""
+    candidates = list(args[:1]) + [
+        kwargs[name] for name in ("y", "y_new", "fh", "data") if name in kwargs
+    ]
+    candidates += [getattr(instance, "data", None), getattr(instance, "y_pred", None)]
+    for value in candidates:
+        if isinstance(value, (int, np.integer)) and not isinstance(value, bool):
+            return int(value)
+        if hasattr(value, "__len__") and not isinstance(value, (str, bytes)):
+            return len(value)
+    return None
+
+
+def _instrumented(method: Callable, stage: str) -> Callable:
+    """Wraps a method with a timer, active only when instrumentation is
+    enabled."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not _STATE.enabled:
+            return method(self, *args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            sink = _STATE.sink
+            if sink is not None:
+                rows = _count_rows(self, args, kwargs)
+                sink.record(stage, elapsed, rows, getattr(self, "logger", None))
+
+    wrapper._instrumented = True
+    return wrapper
+
+
+def instrument_methods(cls: type, names: Iterable[str]):
+    """Wraps the (concrete) methods `names` defined by `cls` itself with timers
+    reporting to the metrics sink when the instrumentation is enabled. Meant to
+    be called from the `__init_subclass__` of base classes.
+
+    Parameters
+    ----------
+    cls : type
+        The class whose methods are instrumented
+    names : Iterable[str]
+        Names of the methods (stages) to instrument
+    """
+    for name in names:
+        method = cls.__dict__.get(name)
+        if (
+            method is None
+            or not callable(method)
+            or getattr(method, "__isabstractmethod__", False)
+            or getattr(method, "_instrumented", False)
+        ):
+            continue
+        setattr(cls, name, _instrumented(method, f"{cls.__name__}.{name}"))
@@ -0,0 +1,183 @@
+"""Chunked reading and writing of 1-D data which may not fit in memory.
+
+Supported sources / targets are NumPy arrays (including memory-mapped ones),
+`.npy` files (memory-mapped), `.parquet` files (requires `pyarrow`) and
+`.csv` files.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+import numpy as np
+
+from ds_lib_template.utils.lazy import LazyModule, lazy_isinstance
+
+# Only used for Series and `.csv` files
+pd = LazyModule("pandas")
+
+ChunkSource = Union[str, os.PathLike, np.ndarray, "pd.Series"]
+
+
+def _import_parquet():
+    """Imports `pyarrow` (optional dependency) on first use."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as error:
+        raise ImportError(
+            "Reading and writing parquet files requires `pyarrow`. Please "
+            "install it using `pip install pyarrow`."
+        ) from error
+    return pa, pq
+
+
+def _suffix(path: Union[str, os.PathLike]) -> str:
+    """Lower case extension of a file path."""
+    suffix = Path(path).suffix.lower()
+    if suffix not in (".npy", ".parquet", ".csv"):
+        raise ValueError(
+            f"Unsupported file type '{suffix}'. Supported file types are "
+            "'.npy', '.parquet' and '.csv'."
+        )
+    return suffix
+
+
+def iter_chunks(
+    source: ChunkSource,
+    chunksize: int = 1_000_000,
+    column: Optional[str] = None,
+) -> Iterator[np.ndarray]:
+    """Iterates over consecutive chunks of 1-D data as float arrays. Only one
+    chunk is materialized in memory at a time.
+
+    Parameters
+    ----------
+    source : ChunkSource
+        Array, Series or path to a `.npy`, `.parquet` or `.csv` file
+    chunksize : int, optional
+        Maximum number of points per chunk, by default 1_000_000
+    column : Optional[str], optional
+        Column to read from `.parquet` / `.csv` files, by default None (first
+        column)
+
+    Yields
+    ------
+    np.ndarray
+        Chunks of the data (missing values as NaN)
+    """
+    if lazy_isinstance(source, "pandas", ["Series"]):
+        source = source.to_numpy()
+
+    if isinstance(source, np.ndarray):
+        array = source
+    else:
+        suffix = _suffix(source)
+        if suffix == ".npy":
+            array = np.load(source, mmap_mode="r")
+        elif suffix == ".parquet":
+            _, pq = _import_parquet()
+            parquet_file = pq.ParquetFile(source)
+            columns = [column or parquet_file.schema_arrow.names[0]]
+            for batch in parquet_file.iter_batches(
+                batch_size=chunksize, columns=columns
+            ):
+                values = batch.column(0).to_numpy(zero_copy_only=False)
+                yield values.astype(float)
+            return
+        else:
+            usecols = [column] if column is not None else None
+            for chunk in pd.read_csv(source, usecols=usecols, chunksize=chunksize):
+                yield chunk.iloc[:, 0].to_numpy(dtype=float)
+            return
+
+    if array.ndim != 1:
+        raise ValueError(f"Expected 1-D data, got an array of shape {array.shape}.")
+    for start in range(0, len(array), chunksize):
+        yield np.asarray(array[start : start + chunksize], dtype=float)
+
+
+class ChunkWriter:
+    """Writes consecutive chunks of 1-D data to an array or to a `.npy`,
+    `.parquet` or `.csv` file. Use as a context manager."""
+
+    def __init__(
+        self,
+        target: Union[str, os.PathLike, np.ndarray],
+        length: int,
+        column: str = "value",
+    ):
+        """Initializes the writer.
+
+        Parameters
+        ----------
+        target : Union[str, os.PathLike, np.ndarray]
+            Writable array or path of the file to write
+        length : int
+            Total number of points that will be written
+        column : str, optional
+            Column name used for `.parquet` / `.csv` files, by default "value"
+        """
+        self.target = target
+        self.length = length
+        self.column = column
+        self._position = 0
+        self._array: Optional[np.ndarray] = None
+        self._writer = None
+        self._file = None
+
+        if isinstance(target, np.ndarray):
+            if len(target) != length:
+                raise ValueError(
+                    f"Output array has length {len(target)}, expected {length}."
+                )
+            self._array = target
+            return
+
+        suffix = _suffix(target)
+        if suffix == ".npy":
+            self._array = np.lib.format.open_memmap(
+                target, mode="w+", dtype=np.float64, shape=(length,)
+            )
+        elif suffix == ".parquet":
+            pa, pq = _import_parquet()
+            schema = pa.schema([(column, pa.float64())])
+            self._writer = pq.ParquetWriter(target, schema)
+        else:
+            self._file = open(target, "w", newline="")
+
+    def write(self, chunk: np.ndarray):
+        """Writes the next chunk.
+
+        Parameters
+        ----------
+        chunk : np.ndarray
+            Chunk to write
+        """
+        if self._array is not None:
+            self._array[self._position : self._position + len(chunk)] = chunk
+        elif self._writer is not None:
+            pa, _ = _import_parquet()
+            self._writer.write_table(pa.table({self.column: chunk}))
+        else:
+            pd.DataFrame({self.column: chunk}).to_csv(
+                self._file, header=self._position == 0, index=False
+            )
+        self._position += len(chunk)
+
+    def close(self):
+        """Flushes the data and closes the underlying file."""
+        if isinstance(self._array, np.memmap):
+            self._array.flush()
+        if self._writer is not None:
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+
+    def __enter__(self) -> "ChunkWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
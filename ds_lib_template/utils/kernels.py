@@ -0,0 +1,345 @@
+"""Compiled kernels of the hot loops, with a NumPy fallback.
+
+Each kernel has a vectorized NumPy implementation and a loop implementation
+compiled with Numba (optional dependency) on first use. The compiled kernels
+fuse work that takes several NumPy passes (and temporaries) into one pass
+over a contiguous array, and release the GIL, so threads can run them on
+different series in parallel.
+
+The backend is chosen at runtime with `set_backend` / `use_backend` or the
+`DS_LIB_KERNEL_BACKEND` environment variable: "auto" (the default) uses Numba
+when it is installed and NumPy otherwise.
+"""
+
+import os
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from ds_lib_template.outlier import robust
+
+BACKENDS = ("auto", "numba", "numpy")
+
+_STATE: Dict[str, Any] = {
+    "backend": os.environ.get("DS_LIB_KERNEL_BACKEND", "auto"),
+    "numba": None,
+}
+_COMPILED: Dict[str, Callable] = {}
+
+
+def _import_numba():
+    """Imports `numba` (optional dependency) on first use."""
+    try:
+        import numba
+    except ImportError as error:
+        raise ImportError(
+            "The numba kernel backend requires `numba`. Please install it using "
+            "`pip install numba`."
+        ) from error
+    return numba
+
+
+def _has_numba() -> bool:
+    """Whether numba can be imported (checked once)."""
+    if _STATE["numba"] is None:
+        try:
+            _import_numba()
+            _STATE["numba"] = True
+        except ImportError:
+            _STATE["numba"] = False
+    return _STATE["numba"]
+
+
+def available_backends() -> List[str]:
+    """Returns the backends which can be used.
+
+    Returns
+    -------
+    List[str]
+        "numpy", and "numba" when it is installed
+    """
+    return ["numba", "numpy"] if _has_numba() else ["numpy"]
+
+
+def set_backend(backend: str):
+    """Sets the backend of the kernels.
+
+    Parameters
+    ----------
+    backend : str
+        "auto" (Numba if installed, NumPy otherwise), "numba" or "numpy"
+
+    Raises
+    ------
+    ValueError
+        When the backend is unknown
+    ImportError
+        When the "numba" backend is requested but numba is not installed
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}', expected one of {BACKENDS}.")
+    if backend == "numba":
+        _import_numba()
+    _STATE["backend"] = backend
+
+
+def get_backend() -> str:
+    """Returns the backend used by the kernels.
+
+    Returns
+    -------
+    str
+        "numba" or "numpy" (the resolved "auto" backend)
+    """
+    if _STATE["backend"] == "auto":
+        return "numba" if _has_numba() else "numpy"
+    return _STATE["backend"]
+
+
+def is_compiled() -> bool:
+    """Whether the kernels are compiled (numba backend)."""
+    return get_backend() == "numba"
+
+
+@contextmanager
+def use_backend(backend: str) -> Iterator[str]:
+    """Uses a backend within a `with` block, see `set_backend`.
+
+    Parameters
+    ----------
+    backend : str
+        "auto", "numba" or "numpy"
+
+    Yields
+    ------
+    str
+        The backend used within the block ("numba" or "numpy")
+    """
+    previous = _STATE["backend"]
+    set_backend(backend)
+    try:
+        yield get_backend()
+    finally:
+        _STATE["backend"] = previous
+
+
+def _compiled(function: Callable) -> Callable:
+    """Returns (and compiles on first use) the numba version of a loop
+    kernel."""
+    if function.__name__ not in _COMPILED:
+        numba = _import_numba()
+        _COMPILED[function.__name__] = numba.njit(nogil=True, cache=True)(function)
+    return _COMPILED[function.__name__]
+
+
+def _mean_std_loop(values: np.ndarray) -> Tuple[float, float]:
+    """Mean and standard deviation (ddof=1) of the non missing values, in a
+    single pass (Welford's algorithm)."""
+    count = 0
+    mean = 0.0
+    m2 = 0.0
+    for value in values:
+        if not np.isnan(value):
+            count += 1
+            delta = value - mean
+            mean += delta / count
+            m2 += delta * (value - mean)
+    if count == 0:
+        return np.nan, np.nan
+    if count == 1:
+        return mean, np.nan
+    return mean, np.sqrt(m2 / (count - 1))
+
+
+def _compact_loop(values: np.ndarray, buffer: np.ndarray) -> int:
+    """Copies the non missing values to the start of `buffer` in a single
+    pass. Returns their number."""
+    count = 0
+    for value in values:
+        if not np.isnan(value):
+            buffer[count] = value
+            count += 1
+    return count
+
+
+def _clip_mask_loop(
+    values: np.ndarray, lower: float, upper: float, out: np.ndarray, mask: np.ndarray
+) -> int:
+    """Writes the values clipped to [lower, upper] to `out` and whether they
+    are outside of the limits to `mask`, in a single pass. Returns the number
+    of outliers."""
+    n_outliers = 0
+    for i in range(values.shape[0]):
+        value = values[i]
+        if value > upper:
+            out[i] = upper
+            mask[i] = True
+            n_outliers += 1
+        elif value < lower:
+            out[i] = lower
+            mask[i] = True
+            n_outliers += 1
+        else:
+            out[i] = value
+            mask[i] = False
+    return n_outliers
+
+
+def _naive_statistics_loop(
+    values: np.ndarray,
+    count: np.ndarray,
+    sums: np.ndarray,
+    first: np.ndarray,
+    first_pos: np.ndarray,
+    last: np.ndarray,
+    last_pos: np.ndarray,
+):
+    """Accumulates the naive statistics of each column of a 2-D (time x
+    series) array in a single pass."""
+    n_obs, n_series = values.shape
+    for t in range(n_obs):
+        for s in range(n_series):
+            value = values[t, s]
+            if np.isnan(value):
+                continue
+            if count[s] == 0:
+                first[s] = value
+                first_pos[s] = t
+            count[s] += 1
+            sums[s] += value
+            last[s] = value
+            last_pos[s] = t
+
+
+def mean_std(values: np.ndarray) -> Tuple[float, float]:
+    """Mean and standard deviation (ddof=1, as pandas) of the non missing
+    values.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        1-D float data
+
+    Returns
+    -------
+    Tuple[float, float]
+        The mean and standard deviation (NaN when there are too few values)
+    """
+    if is_compiled():
+        return _compiled(_mean_std_loop)(values)
+    valid = values[~np.isnan(values)]
+    if not len(valid):
+        return np.nan, np.nan
+    mean = valid.mean()
+    return mean, valid.std(ddof=1) if len(valid) > 1 else np.nan
+
+
+def median_mad(values: np.ndarray) -> Tuple[float, float]:
+    """Median and median absolute deviation from the median of the non
+    missing values.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        1-D float data
+
+    Returns
+    -------
+    Tuple[float, float]
+        The median and median absolute deviation (NaN without any value)
+    """
+    if is_compiled():
+        # One buffer for both selections: NumPy's introselect (which only
+        # reorders the buffer) is faster than a compiled one
+        buffer = np.empty_like(values)
+        buffer = buffer[: _compiled(_compact_loop)(values, buffer)]
+        if not len(buffer):
+            return np.nan, np.nan
+        center = np.median(buffer, overwrite_input=True)
+        np.abs(np.subtract(buffer, center, out=buffer), out=buffer)
+        return center, np.median(buffer, overwrite_input=True)
+    center = robust.median(values)
+    return center, robust.median_abs_deviation(values, center=center)
+
+
+def clip_mask(
+    values: np.ndarray, lower: float, upper: float, out: np.ndarray = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Clips values to limits and flags the values outside of them.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        1-D float data
+    lower : float
+        Lower limit (-inf for none)
+    upper : float
+        Upper limit (+inf for none)
+    out : np.ndarray, optional
+        Float buffer to write the clipped values into (can be `values`), by
+        default None (new array)
+
+    Returns
+    -------
+    Tuple[np.ndarray, np.ndarray]
+        The outlier mask and the clipped values. Missing values are kept and
+        are not outliers.
+    """
+    out = np.empty_like(values) if out is None else out
+    if is_compiled():
+        mask = np.empty(values.shape, dtype=bool)
+        _compiled(_clip_mask_loop)(values, lower, upper, out, mask)
+        return mask, out
+    with np.errstate(invalid="ignore"):
+        mask = np.greater(values, upper)
+        mask |= np.less(values, lower)
+    np.clip(values, lower, upper, out=out)
+    return mask, out
+
+
+def naive_statistics(values: np.ndarray) -> Dict[str, np.ndarray]:
+    """Per column number of non missing values, their sum and the first and
+    last ones (and their positions) of a 2-D (time x series) array.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        2-D float data
+
+    Returns
+    -------
+    Dict[str, np.ndarray]
+        count, sum, first, first_pos (n_obs without values), last and
+        last_pos (-1 without values) of each column
+    """
+    n_obs, n_series = values.shape
+    if is_compiled():
+        statistics = {
+            "count": np.zeros(n_series, dtype=np.int64),
+            "sum": np.zeros(n_series),
+            "first": np.full(n_series, np.nan),
+            "first_pos": np.full(n_series, n_obs, dtype=np.int64),
+            "last": np.full(n_series, np.nan),
+            "last_pos": np.full(n_series, -1, dtype=np.int64),
+        }
+        _compiled(_naive_statistics_loop)(values, *statistics.values())
+        return statistics
+
+    valid = ~np.isnan(values)
+    has_values = valid.any(axis=0)
+    positions = np.arange(n_obs)[:, None]
+    first_pos = np.where(valid, positions, n_obs).min(axis=0)
+    last_pos = np.where(valid, positions, -1).max(axis=0)
+
+    columns = np.arange(n_series)
+    first = values[first_pos.clip(max=max(n_obs - 1, 0)), columns]
+    last = values[last_pos.clip(min=0), columns]
+    return {
+        "count": valid.sum(axis=0),
+        "sum": np.where(valid, values, 0.0).sum(axis=0),
+        "first": np.where(has_values, first, np.nan),
+        "first_pos": first_pos,
+        "last": np.where(has_values, last, np.nan),
+        "last_pos": last_pos,
+    }
@@ -0,0 +1,110 @@
+"""Lazy imports.
+
+Importing the package (or only its NumPy based parts) should not pay for
+pandas and the other heavy dependencies. Packages expose their public
+attributes with `attach` (PEP 562 module `__getattr__`): the submodule
+defining an attribute is only imported when the attribute is first accessed.
+Modules which only need pandas in some code paths refer to it through a
+`LazyModule`, imported on first attribute access.
+"""
+
+import importlib
+import sys
+import types
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+class LazyModule(types.ModuleType):
+    def __init__(self, name: str):
+        """Placeholder of a module which is imported on first attribute access.
+        Use `from __future__ import annotations` in modules annotating with
+        its attributes, so that the annotations do not trigger the import.
+
+        Parameters
+        ----------
+        name : str
+            Absolute name of the module, e.g. "pandas"
+        """
+        super().__init__(name)
+
+    def __getattr__(self, name: str) -> Any:
+        module = importlib.import_module(self.__name__)
+        # Later accesses find the attributes without calling __getattr__
+        self.__dict__.update(module.__dict__)
+        return getattr(module, name)
+
+    def __repr__(self) -> str:
+        return f"<lazy module '{self.__name__}'>"
+
+
+def attach(
+    package: str,
+    submodules: Sequence[str] = (),
+    attributes: Optional[Dict[str, Sequence[str]]] = None,
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]], List[str]]:
+    """Lazily exposes the submodules and the public attributes of a package.
+
+    Parameters
+    ----------
+    package : str
+        Name of the package (`__name__` of its `__init__` module)
+    submodules : Sequence[str], optional
+        Submodules accessible as attributes of the package, by default ()
+    attributes : Dict[str, Sequence[str]], optional
+        Names of the attributes defined by each submodule (relative to the
+        package, e.g. "model.naive"), by default None
+
+    Returns
+    -------
+    Tuple[Callable[[str], Any], Callable[[], List[str]], List[str]]
+        The `__getattr__`, `__dir__` and `__all__` of the package
+    """
+    origins = {
+        name: submodule
+        for submodule, names in (attributes or {}).items()
+        for name in names
+    }
+    submodules = set(submodules)
+    names = sorted(submodules | set(origins))
+
+    def __getattr__(name: str) -> Any:
+        if name in submodules:
+            value = importlib.import_module(f"{package}.{name}")
+        elif name in origins:
+            module = importlib.import_module(f"{package}.{origins[name]}")
+            value = getattr(module, name)
+        else:
+            raise AttributeError(f"module '{package}' has no attribute '{name}'")
+        # Later accesses find the attribute without calling __getattr__
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return names
+
+    return __getattr__, __dir__, list(names)
+
+
+def lazy_isinstance(obj: Any, module: str, names: Sequence[str]) -> bool:
+    """`isinstance` check against classes of a module, which does not import
+    the module: objects can only be instances of classes of modules which have
+    already been imported.
+
+    Parameters
+    ----------
+    obj : Any
+        The object to check
+    module : str
+        Absolute name of the module defining the classes, e.g. "pandas"
+    names : Sequence[str]
+        Names of the classes
+
+    Returns
+    -------
+    bool
+        Whether the object is an instance of one of the classes
+    """
+    if module not in sys.modules:
+        return False
+    classes = tuple(getattr(sys.modules[module], name) for name in names)
+    return isinstance(obj, classes)
@@ -0,0 +1,57 @@
+"""Helpers to move panel data (many series) between long and wide layouts."""
+
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def long_to_wide(
+    data: pd.DataFrame,
+    group_col: str,
+    value_col: str,
+    index_col: Optional[str] = None,
+) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+    """Converts long data (one row per series and time) to a wide DataFrame
+    (one column per series), padding missing observations with NaN.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        Long data with one row per (series, time) observation
+    group_col : str
+        Column identifying the series each row belongs to
+    value_col : str
+        Column containing the values
+    index_col : Optional[str], optional
+        Column identifying the time of each observation. If None, the
+        position of the row within its group is used, by default None
+
+    Returns
+    -------
+    Tuple[pd.DataFrame, np.ndarray, np.ndarray]
+        The wide data, and the row and column positions of each long row in
+        the wide data
+
+    Raises
+    ------
+    ValueError
+        When the same (group, index) pair appears more than once
+    """
+    col_codes, groups = pd.factorize(data[group_col], sort=True)
+    if index_col is None:
+        row_codes = data.groupby(group_col, sort=False).cumcount().to_numpy()
+        rows = pd.RangeIndex(row_codes.max() + 1 if len(row_codes) else 0)
+    else:
+        row_codes, rows = pd.factorize(data[index_col], sort=True)
+
+    flat = row_codes * len(groups) + col_codes
+    if len(np.unique(flat)) != len(flat):
+        raise ValueError(
+            f"Duplicate ({group_col}, {index_col}) pairs found in long data."
+        )
+
+    wide = np.full((len(rows), len(groups)), np.nan)
+    wide[row_codes, col_codes] = data[value_col].to_numpy(dtype=float)
+    wide = pd.DataFrame(wide, index=rows, columns=groups)
+    return wide, row_codes, col_codes
@@ -0,0 +1,248 @@
+"""Mergeable, constant memory sketches of large data."""
+
+from __future__ import annotations
+
+from typing import Union
+
+import numpy as np
+
+from ds_lib_template.utils.lazy import LazyModule
+
+# Only used to hash the values of the distinct counts
+pd = LazyModule("pandas")
+
+
+class TDigest:
+    """Approximate quantiles of a stream of values (merging t-digest).
+
+    Values are summarized by at most about `compression / 2` weighted
+    centroids. Centroids are small near the tails and large near the median,
+    so extreme quantiles are more accurate than central ones. Two digests can
+    be merged, so partitions of the data can be sketched independently.
+
+    References
+    ----------
+    .. [1] Dunning & Ertl, Computing Extremely Accurate Quantiles Using
+       t-Digests, https://arxiv.org/abs/1902.04023
+    """
+
+    def __init__(self, compression: int = 200):
+        """Initializes an empty digest.
+
+        Parameters
+        ----------
+        compression : int, optional
+            Controls the size / accuracy trade-off of the digest, by default 200
+        """
+        self.compression = compression
+        self.count = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self._means = np.empty(0)
+        self._weights = np.empty(0)
+
+    def update(self, values: Union[float, np.ndarray]) -> "TDigest":
+        """Adds values to the digest. Missing values are ignored.
+
+        Parameters
+        ----------
+        values : Union[float, np.ndarray]
+            Values to add
+
+        Returns
+        -------
+        TDigest
+            Class object for chaining
+        """
+        values = np.asarray(values, dtype=float).ravel()
+        values = np.sort(values[~np.isnan(values)])
+        if len(values):
+            # The (sorted) values are compressed on their own first, so only
+            # their centroids are sorted with the existing ones
+            means, weights = self._compress(values, np.ones(len(values)))
+            self._add(means, weights, values[0], values[-1])
+        return self
+
+    def merge(self, other: "TDigest") -> "TDigest":
+        """Adds all the values summarized by another digest to this digest.
+
+        Parameters
+        ----------
+        other : TDigest
+            The digest to merge into this one
+
+        Returns
+        -------
+        TDigest
+            Class object for chaining
+        """
+        if other.count:
+            self._add(other._means, other._weights, other.min, other.max)
+        return self
+
+    def _add(self, means: np.ndarray, weights: np.ndarray, low: float, high: float):
+        """Merges weighted points into the centroids and compresses them."""
+        self.min = min(self.min, low)
+        self.max = max(self.max, high)
+        means = np.concatenate([self._means, means])
+        weights = np.concatenate([self._weights, weights])
+        order = np.argsort(means, kind="mergesort")
+        self._means, self._weights = self._compress(means[order], weights[order])
+        self.count = self._weights.sum()
+
+    def _compress(self, means: np.ndarray, weights: np.ndarray):
+        """Merges sorted weighted points into centroids."""
+        # Points whose left cumulative weight falls in the same unit interval
+        # of the k1 scale function are merged into the same centroid
+        total = weights.sum()
+        q_left = (np.cumsum(weights) - weights) / total
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * q_left - 1)
+        groups = np.floor(k + self.compression / 4).astype(np.int64)
+        starts = np.flatnonzero(np.diff(groups, prepend=groups[0] - 1))
+
+        weights_sum = np.add.reduceat(weights, starts)
+        return np.add.reduceat(means * weights, starts) / weights_sum, weights_sum
+
+    def _positions(self):
+        """Cumulative weight at the center of each centroid, with the minimum
+        and maximum as end points."""
+        centers = np.cumsum(self._weights) - self._weights / 2
+        positions = np.concatenate([[0.0], centers, [self.count]])
+        heights = np.concatenate([[self.min], self._means, [self.max]])
+        return positions, heights
+
+    def quantile(self, q: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """Approximate quantile(s) of the values added so far.
+
+        Parameters
+        ----------
+        q : Union[float, np.ndarray]
+            Quantile(s) to compute, between 0 and 1
+
+        Returns
+        -------
+        Union[float, np.ndarray]
+            Approximate quantile(s), NaN when the digest is empty
+        """
+        if not self.count:
+            return np.full(np.shape(q), np.nan)[()]
+        positions, heights = self._positions()
+        return np.interp(np.asarray(q) * self.count, positions, heights)
+
+    def cdf(self, x: Union[float, np.ndarray]) -> Union[float, np.ndarray]:
+        """Approximate fraction of the values added so far which are <= `x`.
+
+        Parameters
+        ----------
+        x : Union[float, np.ndarray]
+            Value(s) to compute the fraction for
+
+        Returns
+        -------
+        Union[float, np.ndarray]
+            Approximate fraction(s), NaN when the digest is empty
+        """
+        if not self.count:
+            return np.full(np.shape(x), np.nan)[()]
+        positions, heights = self._positions()
+        return np.interp(x, heights, positions) / self.count
+
+
+class HyperLogLog:
+    """Approximate number of distinct values of a stream (HyperLogLog).
+
+    Values are hashed to 64 bits: the first `precision` bits select one of
+    `2 ** precision` registers, which keeps the longest run of leading zeros
+    of the remaining bits. The relative error is about
+    `1.04 / sqrt(2 ** precision)` (1.6% by default) whatever the number of
+    values. Two sketches can be merged, so partitions of the data can be
+    sketched independently.
+
+    References
+    ----------
+    .. [1] Flajolet, Fusy, Gandouet & Meunier, HyperLogLog: the analysis of a
+       near-optimal cardinality estimation algorithm, AofA 2007,
+       https://algo.inria.fr/flajolet/Publications/FlFuGaMe07.pdf
+    """
+
+    def __init__(self, precision: int = 12):
+        """Initializes an empty sketch.
+
+        Parameters
+        ----------
+        precision : int, optional
+            Number of bits selecting the register (4 to 18), by default 12
+        """
+        if not 4 <= precision <= 18:
+            raise ValueError("`precision` must be between 4 and 18.")
+        self.precision = precision
+        self._registers = np.zeros(2**precision, dtype=np.uint8)
+
+    def update(self, values: Union[float, np.ndarray, pd.Series]) -> "HyperLogLog":
+        """Adds values (of any type) to the sketch. Missing values are ignored.
+
+        Parameters
+        ----------
+        values : Union[float, np.ndarray, pd.Series]
+            Values to add
+
+        Returns
+        -------
+        HyperLogLog
+            Class object for chaining
+        """
+        values = np.asarray(values).ravel()
+        values = values[~pd.isna(values)]
+        if not len(values):
+            return self
+        if values.dtype.kind == "f":
+            # -0.0 and 0.0 are the same value but have different bits
+            values = values + 0.0
+        hashes = pd.util.hash_array(values, categorize=False)
+
+        n_bits = 64 - self.precision
+        registers = (hashes >> np.uint64(n_bits)).astype(np.intp)
+        remainder = hashes & np.uint64(2**n_bits - 1)
+        # Position of the leftmost 1 bit of the remaining bits (n_bits + 1 when
+        # they are all 0), from the exponent of their float representation
+        _, bit_length = np.frexp(remainder.astype(float))
+        ranks = (n_bits + 1 - bit_length).astype(np.uint8)
+        np.maximum.at(self._registers, registers, ranks)
+        return self
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """Adds all the values summarized by another sketch to this sketch.
+
+        Parameters
+        ----------
+        other : HyperLogLog
+            The sketch to merge into this one, with the same precision
+
+        Returns
+        -------
+        HyperLogLog
+            Class object for chaining
+        """
+        if other.precision != self.precision:
+            raise ValueError("Only sketches with the same precision can be merged.")
+        np.maximum(self._registers, other._registers, out=self._registers)
+        return self
+
+    def count(self) -> float:
+        """Approximate number of distinct values added so far.
+
+        Returns
+        -------
+        float
+            Approximate number of distinct values
+        """
+        n_registers = len(self._registers)
+        alpha = 0.7213 / (1 + 1.079 / n_registers)
+        estimate = (
+            alpha * n_registers**2 / np.sum(2.0 ** -self._registers.astype(float))
+        )
+        n_empty = np.count_nonzero(self._registers == 0)
+        if estimate <= 2.5 * n_registers and n_empty:
+            # Linear counting is more accurate for small cardinalities
+            estimate = n_registers * np.log(n_registers / n_empty)
+        return float(estimate)
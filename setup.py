@@ -23,7 +23,7 @@ setup(
     description="Data Science Library Template",
     author="Nikhil Gupta",
     license="MIT",
-    packages=find_packages(include=["ds_lib_template"]),
+    packages=find_packages(include=["ds_lib_template", "ds_lib_template.*"]),
     include_package_data=True,
     install_requires=required,
     tests_require=required_test,
@@ -0,0 +1,92 @@
+"""Module to test backtesting functionality
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ds_lib_template.forecasting.evaluation.backtest import backtest
+from ds_lib_template.forecasting.evaluation.metrics import METRICS
+from ds_lib_template.forecasting.evaluation.splitters import (
+    ExpandingWindowSplitter,
+    SlidingWindowSplitter,
+)
+from ds_lib_template.forecasting.model.naive import NaiveForecaster
+from ds_lib_template.forecasting.model.panel import PanelNaiveForecaster
+
+splitters = [
+    ExpandingWindowSplitter(fh=3, initial_window=6, step_length=2),
+    SlidingWindowSplitter(fh=3, window_length=6, step_length=1),
+]
+
+
+def _load_panel_data() -> pd.DataFrame:
+    """Load monthly panel data with missing values."""
+    index = pd.period_range(start="2017-01-01", periods=30, freq="M")
+    rng = np.random.default_rng(42)
+    data = pd.DataFrame(rng.normal(10, 2, size=(30, 3)), index=index)
+    data.iloc[rng.random(data.shape) < 0.1] = np.nan
+    return data.add_prefix("sku_")
+
+
+@pytest.mark.parametrize("splitter", splitters)
+@pytest.mark.parametrize("strategy", ["mean", "drift"])
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_backtest(splitter, strategy, n_jobs):
+    """Tests the backtest against refitting the forecaster at each cutoff."""
+    data = _load_panel_data()
+    errors, predictions = backtest(
+        PanelNaiveForecaster(strategy=strategy, sp=2),
+        data,
+        splitter,
+        n_jobs=n_jobs,
+        return_predictions=True,
+    )
+    windows = splitter.split(len(data))
+    assert errors.shape == (3 * splitter.fh, 4)
+    assert predictions.shape == (len(windows) * splitter.fh, 3)
+
+    y_true, y_pred = [], []
+    for start, cutoff in windows:
+        forecaster = NaiveForecaster(strategy=strategy, sp=2)
+        y_pred.append(
+            [
+                forecaster.fit(y=data[name][start:cutoff]).predict(fh=splitter.fh)
+                for name in data.columns
+            ]
+        )
+        y_true.append(data[cutoff : cutoff + splitter.fh].to_numpy().T)
+        expected = pd.concat(y_pred[-1], axis=1).to_numpy()
+        np.testing.assert_allclose(predictions.loc[data.index[cutoff - 1]], expected)
+
+    # Errors per series and horizon ----
+    y_true, y_pred = np.array(y_true), np.array(y_pred)
+    for i, name in enumerate(data.columns):
+        for metric, function in METRICS.items():
+            np.testing.assert_allclose(
+                errors.loc[name, metric], function(y_true[:, i], y_pred[:, i], axis=0)
+            )
+
+    #### A single series gives the same errors ----
+    single = backtest(NaiveForecaster(strategy=strategy, sp=2), data["sku_1"], splitter)
+    pd.testing.assert_frame_equal(
+        single.droplevel("series"), errors.loc["sku_1"], check_names=False
+    )
+
+
+def test_metrics():
+    """Tests the error metrics (including missing and zero values)."""
+    y_true = np.array([[1.0, 2.0], [0.0, 4.0], [np.nan, 5.0]])
+    y_pred = np.array([[2.0, 2.0], [0.0, 2.0], [1.0, np.nan]])
+
+    np.testing.assert_allclose(METRICS["mae"](y_true, y_pred, axis=0), [0.5, 1.0])
+    np.testing.assert_allclose(
+        METRICS["rmse"](y_true, y_pred, axis=0), [0.5**0.5, 2**0.5]
+    )
+    np.testing.assert_allclose(METRICS["mape"](y_true, y_pred, axis=0), [0.5, 0.25])
+    np.testing.assert_allclose(METRICS["smape"](y_true, y_pred, axis=0), [1 / 3, 1 / 3])
+    assert METRICS["mae"](y_true, y_pred) == 0.75
+
+    #### The series must be longer than the first window ----
+    with pytest.raises(ValueError):
+        backtest(NaiveForecaster(), pd.Series(range(5)), splitters[0])
@@ -0,0 +1,150 @@
+"""Module to test time series clustering functionality
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from ds_lib_template.clustering.dtw import (
+    DTWKMedoids,
+    dtw_distance,
+    envelope,
+    lb_keogh,
+)
+from ds_lib_template.clustering.features import FEATURES, extract_features
+from ds_lib_template.clustering.kmeans import FeatureKMeans, MiniBatchKMeans
+from ds_lib_template.forecasting.model.base import NotFittedError
+
+
+def _load_shapes(n_series: int = 90, length: int = 48) -> pd.DataFrame:
+    """Wide panel of noisy series with 3 shapes (sine, square wave and trend),
+    shifted in time. The shape of column i is i % 3."""
+    rng = np.random.default_rng(42)
+    time = np.linspace(0, 4 * np.pi, length)
+    shapes = [np.sin(time), np.sign(np.sin(time)), time / 6 - 1]
+    columns = {
+        f"series_{i}": np.roll(shapes[i % 3], rng.integers(0, 3))
+        + rng.normal(scale=0.1, size=length)
+        for i in range(n_series)
+    }
+    return pd.DataFrame(columns)
+
+
+def _naive_dtw(x: np.ndarray, y: np.ndarray, window=None) -> float:
+    """Reference DTW distance (full cost matrix)."""
+    n, m = len(x), len(y)
+    window = max(n, m) if window is None else max(window, abs(n - m))
+    cost = np.full((n + 1, m + 1), np.inf)
+    cost[0, 0] = 0.0
+    for i in range(1, n + 1):
+        for j in range(max(1, i - window), min(m, i + window) + 1):
+            best = min(cost[i - 1, j], cost[i, j - 1], cost[i - 1, j - 1])
+            cost[i, j] = (x[i - 1] - y[j - 1]) ** 2 + best
+    return np.sqrt(cost[n, m])
+
+
+def _check_clusters(labels: np.ndarray, n_series: int):
+    """Checks that the clusters are the shapes (up to their numbering)."""
+    truth = np.arange(n_series) % 3
+    pairs = set(zip(truth, labels))
+    assert len(pairs) == 3 and len({label for _, label in pairs}) == 3
+
+
+def test_extract_features():
+    """Tests the features against their pandas equivalent."""
+    data = _load_shapes()
+    data.iloc[:5, 0] = np.nan
+    features = extract_features(data, sp=12, batch_size=7, n_jobs=2)
+    assert list(features.columns) == list(FEATURES) + ["seasonal_acf"]
+    assert features.index.equals(data.columns)
+
+    np.testing.assert_allclose(features["mean"], data.mean())
+    np.testing.assert_allclose(features["std"], data.std())
+    np.testing.assert_allclose(features["min"], data.min())
+    np.testing.assert_allclose(features["skewness"], data.skew(), rtol=0.1)
+    assert features["missing_rate"].iloc[0] == pytest.approx(5 / len(data))
+    # Trend series have a strong trend, all the shapes are smooth
+    assert (features["trend"].iloc[2::3] > 2).all()
+    assert (features["acf_1"] > 0.5).all()
+
+    assert list(extract_features(data, features=["std"]).columns) == ["std"]
+    with pytest.raises(ValueError):
+        extract_features(data, features=["seasonal_acf"])
+    with pytest.raises(ValueError):
+        extract_features(data, features=["entropy"])
+
+
+def test_mini_batch_kmeans():
+    """Tests that well separated blobs are recovered."""
+    rng = np.random.default_rng(0)
+    centers = np.array([[0.0, 0.0], [10.0, 0.0], [0.0, 10.0]])
+    samples = np.concatenate([center + rng.normal(size=(500, 2)) for center in centers])
+
+    model = MiniBatchKMeans(n_clusters=3, batch_size=64, random_state=0)
+    with pytest.raises(NotFittedError):
+        model.predict(samples)
+    labels = model.fit_predict(samples)
+    for i in range(3):
+        assert len(np.unique(labels[i * 500 : (i + 1) * 500])) == 1
+    for center in centers:
+        closest = np.abs(model.cluster_centers_ - center).max(axis=1).min()
+        assert closest < 0.3
+    np.testing.assert_array_equal(model.predict(centers), labels[[0, 500, 1000]])
+    assert model.inertia_ == pytest.approx(3000, rel=0.2)
+
+    # Streaming batches
+    streamed = MiniBatchKMeans(n_clusters=3, random_state=0)
+    for batch in np.array_split(rng.permutation(samples), 10):
+        streamed.partial_fit(batch)
+    assert len(np.unique(streamed.predict(centers))) == 3
+
+    with pytest.raises(ValueError):
+        MiniBatchKMeans(n_clusters=3).fit(np.full((10, 2), np.nan))
+
+
+def test_feature_kmeans():
+    """Tests the clustering of series by their features."""
+    data = _load_shapes()
+    model = FeatureKMeans(n_clusters=3, batch_size=16, random_state=0)
+    _check_clusters(model.fit_predict(data), data.shape[1])
+    np.testing.assert_array_equal(model.predict(data), model.labels_)
+    centers = model.get_cluster_centers()
+    assert centers.shape == (3, len(FEATURES))
+
+
+@pytest.mark.parametrize("window", [None, 0, 3])
+def test_dtw_distance(window):
+    """Tests the DTW distances and their lower bounds against a reference."""
+    rng = np.random.default_rng(1)
+    x, y = rng.normal(size=(20, 6)), rng.normal(size=(20, 6))
+    distances = dtw_distance(x, y, window=window)
+    expected = [_naive_dtw(x[:, i], y[:, i], window) for i in range(6)]
+    np.testing.assert_allclose(distances, expected)
+    if window == 0:
+        np.testing.assert_allclose(distances, np.sqrt(((x - y) ** 2).sum(axis=0)))
+
+    upper, lower = envelope(y, window)
+    bounds = lb_keogh(x, upper, lower)
+    assert bounds.shape == (6, 6)
+    assert (np.diag(bounds) <= distances + 1e-12).all()
+
+    # Series of different lengths
+    distance = dtw_distance(x[:15, 0], y[:, 0], window=window)
+    assert distance == pytest.approx(_naive_dtw(x[:15, 0], y[:, 0], window))
+    assert dtw_distance(np.arange(5.0), np.array([0, 0, 1, 2, 3, 4.0])) == 0.0
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_dtw_kmedoids(n_jobs):
+    """Tests that the shapes are recovered, with pruned distances."""
+    data = _load_shapes()
+    model = DTWKMedoids(
+        n_clusters=3, window=4, batch_size=32, n_jobs=n_jobs, random_state=0
+    )
+    _check_clusters(model.fit_predict(data), data.shape[1])
+    assert model.medoids_.shape == (len(data), 3)
+    assert 0 < model.pruning_rate_ < 1
+    np.testing.assert_array_equal(model.predict(data.to_numpy()), model.labels_)
+    np.testing.assert_array_equal(model.labels_[model.medoid_indices_], [0, 1, 2])
+
+    with pytest.raises(ValueError):
+        model.predict(data.iloc[:-1])
@@ -0,0 +1,66 @@
+"""Module to test batched (panel) component splitter functionality
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from ds_lib_template.forecasting.components.dummy import DummyForecastingComponent
+from ds_lib_template.forecasting.components.panel import PanelComponentSplitter
+from ds_lib_template.forecasting.model.naive import STRATEGIES, NaiveForecaster
+
+
+class _NaiveForecasterSubclass(NaiveForecaster):
+    """Forecaster the dummy splitters can not predict in bulk."""
+
+
+def _load_splitters(drivers=("A", "B", "C")):
+    """Dummy splitters over naive forecasters fitted on series of different
+    lengths."""
+    rng = np.random.default_rng(42)
+    splitters = {}
+    for i in range(6):
+        index = pd.period_range(start="2017-01-01", periods=12 + i, freq="M")
+        data = pd.Series(rng.normal(size=len(index)), index=index)
+        model = NaiveForecaster(strategy=STRATEGIES[i % len(STRATEGIES)], sp=2)
+        splitters[f"sku_{i}"] = DummyForecastingComponent(
+            model=model.fit(y=data), drivers=list(drivers), holidays=["USHols"]
+        )
+    return splitters
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_panel_component_splitter(n_jobs):
+    """Tests the bulk and one at a time predictions against the single series
+    splitters."""
+    splitters = _load_splitters()
+    panel = PanelComponentSplitter(splitters).predict(fh=4)
+    assert panel.values.shape == (6, 4, 6)
+    assert list(panel.components) == ["trend", "seasonality", "A", "B", "C", "USHols"]
+
+    for series_id, splitter in splitters.items():
+        y_pred, components = splitter.predict(fh=4)
+        pd.testing.assert_series_equal(panel.get_series(series_id)[0], y_pred)
+        pd.testing.assert_frame_equal(panel.get_series(series_id)[1], components)
+
+    # Splitters whose model can not be vectorized ----
+    for splitter in splitters.values():
+        model = splitter.model
+        splitter.model = _NaiveForecasterSubclass(strategy=model.strategy, sp=2)
+        splitter.model.fit(y=model._y)
+    other_panel = PanelComponentSplitter(splitters, n_jobs=n_jobs).predict(fh=4)
+    np.testing.assert_allclose(other_panel.values, panel.values)
+    np.testing.assert_allclose(other_panel.y_pred, panel.y_pred)
+
+    # Long format ----
+    long_data = panel.to_long()
+    assert long_data.shape == (24, 10)
+    assert long_data["series"].iloc[4] == "sku_1"
+    assert long_data["horizon"].tolist()[:5] == [1, 2, 3, 4, 1]
+
+
+def test_panel_component_splitter_mismatch():
+    """Tests that all the splitters must have the same components."""
+    splitters = _load_splitters()
+    splitters["other"] = _load_splitters(drivers=["A"])["sku_0"]
+    with pytest.raises(ValueError):
+        PanelComponentSplitter(splitters).predict(fh=4)
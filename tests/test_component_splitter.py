@@ -3,6 +3,7 @@
 
 import numpy as np
 import pandas as pd
+import pytest
 
 from ds_lib_template.forecasting.components.dummy import DummyForecastingComponent
 from ds_lib_template.forecasting.model.naive import NaiveForecaster
@@ -45,3 +46,52 @@ def test_component_splitter():
     assert len(y_pred) == 4
     assert components.shape[0] == 4
     assert components.shape[1] == 6
+
+
+def test_component_splitter_values():
+    """Tests the values and the order of the components."""
+    index = pd.period_range(start="2017-01-01", end="2017-12-01", freq="M")
+    model = NaiveForecaster(strategy="mean").fit(
+        y=pd.Series(np.arange(12), index=index)
+    )
+    drivers = [f"driver_{i}" for i in range(50)]
+
+    component_splitter = DummyForecastingComponent(
+        model=model, drivers=drivers, holidays=["USHols"]
+    )
+    y_pred, components = component_splitter.predict(fh=3)
+    assert list(components.columns) == ["trend", "seasonality", *drivers, "USHols"]
+    assert components.index.equals(y_pred.index)
+    assert np.allclose(components.to_numpy(), 5.5 / 53)
+    assert np.allclose(components.sum(axis=1), y_pred)
+    assert component_splitter.get_component_holidays().columns.tolist() == ["USHols"]
+    assert component_splitter.get_component_trend().name == "trend"
+
+
+def test_component_splitter_lazy():
+    """Tests that only the requested components are computed, until fetched."""
+    index = pd.period_range(start="2017-01-01", end="2017-12-01", freq="M")
+    model = NaiveForecaster().fit(y=pd.Series(np.arange(12), index=index))
+    component_splitter = DummyForecastingComponent(
+        model=model, drivers=["A", "B", "C"], holidays=["USHols"]
+    )
+    with pytest.raises(ValueError):
+        component_splitter.get_component_trend()
+
+    _, components = component_splitter.predict(fh=4, components=["trend", "holidays"])
+    assert list(components.columns) == ["trend", "USHols"]
+    assert component_splitter.component_drivers is None
+
+    # Components are computed on first access and cached ----
+    drivers = component_splitter.get_component_drivers()
+    assert drivers.shape == (4, 3)
+    assert component_splitter.get_component_drivers() is drivers
+
+    # And invalidated by the next prediction ----
+    y_pred, _ = component_splitter.predict(fh=2, components=["seasonality"])
+    assert component_splitter.component_drivers is None
+    assert len(component_splitter.get_component_drivers()) == 2
+    assert np.allclose(component_splitter.get_all_components().sum(axis=1), y_pred)
+
+    with pytest.raises(ValueError):
+        component_splitter.predict(fh=2, components=["unknown"])
@@ -0,0 +1,162 @@
+"""Module to test data profiling functionality
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from ds_lib_template.eda.profile import ColumnProfile, DataProfile, profile
+from ds_lib_template.utils.sketches import HyperLogLog
+
+
+def _load_data(length: int = 5_003) -> pd.DataFrame:
+    """Numeric column (autocorrelated, with missing values), integer column
+    and string column."""
+    rng = np.random.default_rng(42)
+    values = 1_000 + np.cumsum(rng.normal(size=length)) * 0.1
+    values += rng.standard_t(4, size=length)
+    values[rng.integers(0, length, 200)] = np.nan
+    values[100:130] = np.nan
+    return pd.DataFrame(
+        {
+            "value": values,
+            "integer": rng.integers(0, 50, size=length),
+            "category": rng.choice(["a", "b", "c"], size=length),
+        }
+    )
+
+
+def _autocorrelation(values: np.ndarray, lag: int) -> float:
+    """Reference autocorrelation, ignoring the pairs with missing values."""
+    centered = np.nan_to_num(values - np.nanmean(values))
+    return (centered[lag:] * centered[:-lag]).sum() / (centered**2).sum()
+
+
+def test_hyperloglog():
+    """Tests the distinct count estimates and merges."""
+    rng = np.random.default_rng(0)
+    values = rng.integers(0, 20_000, size=200_000)
+    n_distinct = len(np.unique(values))
+
+    sketch = HyperLogLog().update(values)
+    assert sketch.count() == pytest.approx(n_distinct, rel=0.05)
+    merged = (
+        HyperLogLog().update(values[:1000]).merge(HyperLogLog().update(values[1000:]))
+    )
+    assert merged.count() == sketch.count()
+
+    assert HyperLogLog().count() == 0
+    assert round(HyperLogLog().update([0.0, -0.0, np.nan]).count()) == 1
+    assert round(HyperLogLog().update(np.array(["a", "b", "a", None])).count()) == 2
+    with pytest.raises(ValueError):
+        HyperLogLog(precision=12).merge(HyperLogLog(precision=10))
+
+
+@pytest.mark.parametrize("chunksize", [1, 7, 1000, 10_000])
+def test_column_profile(chunksize):
+    """Tests that the chunked statistics match the in memory ones."""
+    values = _load_data()["value"].to_numpy()
+    lags = (1, 2, 12)
+    column_profile = ColumnProfile(lags=lags)
+    for start in range(0, len(values), chunksize):
+        column_profile.update(values[start : start + chunksize])
+    summary = column_profile.get_summary()
+
+    series = pd.Series(values)
+    assert summary["count"] == series.count()
+    assert summary["missing"] == series.isna().sum()
+    assert summary["min"] == series.min()
+    assert summary["max"] == series.max()
+    assert summary["mean"] == pytest.approx(series.mean())
+    assert summary["std"] == pytest.approx(series.std())
+    assert summary["skewness"] == pytest.approx(series.skew(), rel=1e-2)
+    assert summary["kurtosis"] == pytest.approx(series.kurt(), rel=1e-2, abs=1e-2)
+    assert summary["p50"] == pytest.approx(series.median(), abs=0.1)
+    assert summary["distinct"] == pytest.approx(series.nunique(), rel=0.05)
+    for lag in lags:
+        assert summary[f"acf_{lag}"] == pytest.approx(_autocorrelation(values, lag))
+
+
+def test_profile_merge_and_outlier_rates():
+    """Tests merging the profiles of partitions and the outlier rates."""
+    values = _load_data()["value"].to_numpy()
+    partitions = [
+        ColumnProfile(lags=(1, 3)).update(values[start : start + 1500])
+        for start in range(0, len(values), 1500)
+    ]
+    merged = ColumnProfile(lags=(1, 3))
+    for partition in partitions:
+        merged.merge(partition)
+    expected = ColumnProfile(lags=(1, 3)).update(values)
+    assert np.allclose(merged.get_acf(), expected.get_acf())
+    assert merged.get_summary()["mean"] == pytest.approx(np.nanmean(values))
+
+    finite = values[~np.isnan(values)]
+    mean, std = finite.mean(), finite.std(ddof=1)
+    rate = np.mean(np.abs(finite - mean) > 3 * std)
+    assert merged.get_outlier_rate("std") == pytest.approx(rate, abs=2e-3)
+    median = np.median(finite)
+    mad = np.median(np.abs(finite - median))
+    rate = np.mean(np.abs(finite - median) > 3 * mad)
+    assert merged.get_outlier_rate("mad") == pytest.approx(rate, abs=5e-3)
+    with pytest.raises(ValueError):
+        merged.get_outlier_rate("unknown")
+    with pytest.raises(ValueError):
+        merged.merge(ColumnProfile(lags=(1,)))
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_profile(n_jobs, tmp_path):
+    """Tests profiling tabular data from memory and from files."""
+    data = _load_data()
+    expected = DataProfile(lags=(1, 7)).update(data).get_summary()
+    assert list(expected.index) == list(data.columns)
+    assert expected.loc["category", "distinct"] == 3
+    assert np.isnan(expected.loc["category", "mean"])
+
+    summary = profile(data, lags=(1, 7), chunksize=999, n_jobs=n_jobs).get_summary()
+    # Quantiles and distinct counts are approximate
+    exact = ["count", "missing", "min", "max", "mean", "std", "acf_1", "acf_7"]
+    pd.testing.assert_frame_equal(summary[exact], expected[exact])
+
+    path = tmp_path / "data.csv"
+    data.to_csv(path, index=False)
+    summary = profile(path, columns=["value"], chunksize=999).get_summary()
+    assert list(summary.index) == ["value"]
+    assert summary.loc["value", "acf_1"] == pytest.approx(
+        expected.loc["value", "acf_1"]
+    )
+
+    path = tmp_path / "data.npy"
+    np.save(path, data["value"].to_numpy())
+    summary = profile(path, chunksize=999).get_summary()
+    assert summary.loc[0, "count"] == expected.loc["value", "count"]
+
+
+def test_profile_column_types(tmp_path):
+    """Tests that chunks without values do not fix the type of a column."""
+    path = tmp_path / "data.csv"
+    pd.DataFrame(
+        {
+            "text": [None, None, None, "x", "y", "z"],
+            "value": [None, None, None, 1.0, 2.0, 4.0],
+            "mixed": ["1", "2", "3", "x", "y", "x"],
+        }
+    ).to_csv(path, index=False)
+    summary = profile(path, lags=(1, 4), chunksize=3).get_summary()
+    assert summary.loc["text", "count"] == 3
+    assert summary.loc["text", "distinct"] == 3
+    assert np.isnan(summary.loc["text", "mean"])
+    assert summary.loc["value", "mean"] == pytest.approx(7 / 3)
+    assert summary.loc["value", "acf_1"] == pytest.approx(
+        _autocorrelation(np.array([np.nan, np.nan, np.nan, 1.0, 2.0, 4.0]), 1)
+    )
+    # Numbers followed by text
+    assert summary.loc["mixed", "count"] == 6
+    assert np.isnan(summary.loc["mixed", "mean"])
+
+    # Same as profiling the whole file, also when partitions are merged
+    expected = DataProfile(lags=(1, 4)).update(pd.read_csv(path)).get_summary()
+    exact = ["count", "missing", "mean", "acf_1", "acf_4"]
+    pd.testing.assert_frame_equal(summary[exact], expected[exact])
+    summary = profile(path, lags=(1, 4), chunksize=3, n_jobs=2).get_summary()
+    pd.testing.assert_frame_equal(summary[exact], expected[exact])
@@ -0,0 +1,88 @@
+"""Module to test the lazy imports of the package
+"""
+import re
+import subprocess
+import sys
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import ds_lib_template
+from ds_lib_template import forecasting, outlier
+
+# Cumulative import time (seconds) of the package and its lazy subpackages
+IMPORT_TIME_BUDGET = 0.1
+
+
+def _run(code: str) -> Tuple[str, str]:
+    """Runs code in a fresh interpreter and returns its output and the import
+    times."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout, result.stderr
+
+
+def test_import_time_budget():
+    """Tests that importing the packages is cheap and does not import pandas."""
+    output, import_times = _run(
+        "import sys\n"
+        "import ds_lib_template, ds_lib_template.outlier, ds_lib_template.forecasting\n"
+        "print('pandas' in sys.modules)\n"
+    )
+    assert output.strip() == "False"
+    # -X importtime lines: "import time: self [us] | cumulative | package"
+    match = re.search(r"\|\s*(\d+) \| ds_lib_template$", import_times, re.M)
+    cumulative = int(match.group(1))
+    assert 0 < cumulative / 1e6 < IMPORT_TIME_BUDGET
+
+
+def test_numpy_detectors_do_not_import_pandas():
+    """Tests that the detectors run on NumPy arrays without pandas."""
+    output, _ = _run(
+        "import sys\n"
+        "import numpy as np\n"
+        "from ds_lib_template.outlier import (\n"
+        "    ChunkedMADOutlierDetection, MADOutlierDetection, StdDevOutlierDetection\n"
+        ")\n"
+        "data = np.arange(20.0)\n"
+        "data[0] = 1000\n"
+        "for detector_class in (MADOutlierDetection, StdDevOutlierDetection):\n"
+        "    detector = detector_class(data).run_workflow()\n"
+        "    assert detector.get_corrected_data()[0] < 1000\n"
+        "ChunkedMADOutlierDetection(data, chunksize=8).run_workflow(out=data.copy())\n"
+        "print('pandas' in sys.modules)\n"
+    )
+    assert output.strip() == "False"
+
+
+@pytest.mark.parametrize("package", [ds_lib_template, outlier, forecasting])
+def test_lazy_attributes(package):
+    """Tests that all the public attributes can be loaded."""
+    assert sorted(dir(package)) == sorted(package.__all__)
+    for name in package.__all__:
+        assert getattr(package, name) is not None
+    with pytest.raises(AttributeError):
+        getattr(package, "unknown")
+
+
+def test_numpy_detectors():
+    """Tests that NumPy data gives the same results as a Series."""
+    rng = np.random.default_rng(0)
+    data = rng.normal(size=100)
+    data[[3, 50]] = [20.0, np.nan]
+    for detector_class in (outlier.StdDevOutlierDetection, outlier.MADOutlierDetection):
+        expected = detector_class(data=pd.Series(data))
+        expected.run_workflow()
+        detector = detector_class(data=data).run_workflow()
+        assert isinstance(detector.get_corrected_data(), np.ndarray)
+        assert detector.ul == pytest.approx(expected.ul)
+        np.testing.assert_array_equal(
+            detector.get_corrected_data(), expected.get_corrected_data().to_numpy()
+        )
+        np.testing.assert_array_equal(detector.outlier, expected.outlier.to_numpy())
@@ -0,0 +1,109 @@
+"""Module to test the instrumentation of the base classes
+"""
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ds_lib_template.forecasting.components.dummy import DummyForecastingComponent
+from ds_lib_template.forecasting.model.naive import NaiveForecaster
+from ds_lib_template.outlier.base import BaseOutlierDetection
+from ds_lib_template.outlier.deviation import StdDevOutlierDetection
+from ds_lib_template.utils import instrumentation, kernels
+from ds_lib_template.utils.instrumentation import (
+    LoggerSink,
+    StatsSink,
+    instrument,
+    instrument_methods,
+)
+
+
+def _load_series() -> pd.Series:
+    """Monthly series of 36 periods."""
+    index = pd.period_range(start="2017-01-01", periods=36, freq="M")
+    return pd.Series(np.random.default_rng(42).normal(size=36), index=index)
+
+
+def test_instrumentation_disabled():
+    """Tests that nothing is recorded unless the instrumentation is enabled."""
+    assert not instrumentation.is_enabled()
+    sink = StatsSink()
+    with instrument(sink):
+        assert instrumentation.is_enabled()
+    assert not instrumentation.is_enabled()
+
+    StdDevOutlierDetection(data=_load_series()).run_workflow()
+    assert sink.get_stats() == {}
+
+
+def test_instrumentation_outlier():
+    """Tests the stages recorded by an outlier detection workflow (the
+    compiled kernels fuse some of the stages)."""
+    data = _load_series()
+    with kernels.use_backend("numpy"), instrument() as sink:
+        detector = StdDevOutlierDetection(data=data).run_workflow()
+        detector.detect_outliers()
+
+    stats = sink.get_stats()
+    for stage in [
+        "StdDevOutlierDetection.set_center",
+        "BaseOutlierDetection.run_workflow",
+    ]:
+        assert stats[stage]["count"] == 1
+        assert stats[stage]["rows"] == len(data)
+    assert stats["BaseOutlierDetection.detect_outliers"]["count"] == 2
+    assert stats["BaseOutlierDetection.detect_outliers"]["rows"] == 2 * len(data)
+    # Stages are nested within the workflow
+    assert (
+        stats["BaseOutlierDetection.run_workflow"]["total_time"]
+        >= stats["StdDevOutlierDetection.set_center"]["total_time"]
+    )
+
+    sink.reset()
+    assert sink.get_stats() == {}
+
+
+def test_instrumentation_forecasting(caplog):
+    """Tests the stages recorded by forecasters and component splitters, and
+    their report through the logger."""
+    data = _load_series()
+    logger = logging.getLogger("instrumentation")
+    model = NaiveForecaster(strategy="last", sp=12)
+    with instrument(LoggerSink(logger=logger)), caplog.at_level(logging.INFO):
+        model.fit(y=data).predict(fh=6)
+    messages = [record.getMessage() for record in caplog.records]
+    assert messages[0].startswith("NaiveForecaster._fit took")
+    assert messages[0].endswith("(36 rows)")
+    assert messages[1].endswith("(6 rows)")
+
+    splitter = DummyForecastingComponent(model=model, drivers=["A", "B"])
+    with instrument() as sink:
+        splitter.predict(fh=6)
+        sink.report(logger)
+    stats = sink.get_stats()
+    assert stats["DummyForecastingComponent._predict"]["rows"] == 6
+    assert stats["NaiveForecaster._predict"]["count"] == 1
+
+
+def test_instrument_methods():
+    """Tests that abstract and already instrumented methods are left as is."""
+
+    class Stage:
+        def run(self, values):
+            return sum(values)
+
+    instrument_methods(Stage, ["run", "missing"])
+    run = Stage.run
+    instrument_methods(Stage, ["run"])
+    assert Stage.run is run
+    assert Stage.run.__name__ == "run"
+
+    with instrument() as sink:
+        assert Stage().run([1, 2, 3]) == 6
+    assert sink.get_stats()["Stage.run"]["rows"] == 3
+
+    # The abstract stages of the base classes are not wrapped
+    assert BaseOutlierDetection.set_limits.__isabstractmethod__
+    with pytest.raises(TypeError):
+        BaseOutlierDetection(data=_load_series())
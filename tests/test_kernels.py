@@ -0,0 +1,174 @@
+"""Module to test the compiled kernels and their NumPy fallback
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from ds_lib_template.forecasting.model.naive import NaiveForecaster
+from ds_lib_template.forecasting.model.panel import PanelNaiveForecaster
+from ds_lib_template.outlier import robust
+from ds_lib_template.outlier.deviation import (
+    MADOutlierDetection,
+    StdDevOutlierDetection,
+)
+from ds_lib_template.outlier.rolling import RollingStdDevOutlierDetection
+from ds_lib_template.utils import kernels
+
+BACKENDS = [
+    pytest.param(
+        backend,
+        marks=pytest.mark.skipif(
+            backend not in kernels.available_backends(),
+            reason=f"{backend} is not installed",
+        ),
+    )
+    for backend in ["numpy", "numba"]
+]
+
+
+def _load_data(length: int = 1_001) -> np.ndarray:
+    """Normal data with outliers and missing values."""
+    rng = np.random.default_rng(42)
+    values = rng.normal(size=length)
+    values[[10, 500, 900]] = [15.0, -12.0, 30.0]
+    values[[3, 700]] = np.nan
+    return values
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_statistics_kernels(backend):
+    """Tests the statistics kernels against the NumPy reference."""
+    values = _load_data()
+    valid = values[~np.isnan(values)]
+    with kernels.use_backend(backend):
+        mean, std = kernels.mean_std(values)
+        assert mean == pytest.approx(valid.mean())
+        assert std == pytest.approx(valid.std(ddof=1))
+        median, mad = kernels.median_mad(values)
+        assert median == np.median(valid)
+        assert mad == robust.median_abs_deviation(valid)
+
+        assert np.isnan(kernels.mean_std(np.array([1.0]))[1])
+        assert np.isnan(kernels.mean_std(np.array([np.nan]))).all()
+        assert np.isnan(kernels.median_mad(np.array([np.nan]))).all()
+
+        mask, clipped = kernels.clip_mask(values, -2.0, 2.0)
+        np.testing.assert_array_equal(mask, np.abs(values) > 2.0)
+        np.testing.assert_array_equal(clipped, np.clip(values, -2.0, 2.0))
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_naive_statistics_kernel(backend):
+    """Tests the naive statistics kernel, including empty series."""
+    values = np.stack([_load_data(), np.full(1_001, np.nan)], axis=1)
+    values[:5, 0] = np.nan
+    with kernels.use_backend(backend):
+        statistics = kernels.naive_statistics(values)
+    np.testing.assert_array_equal(
+        statistics["count"], [np.count_nonzero(~np.isnan(values[:, 0])), 0]
+    )
+    np.testing.assert_allclose(statistics["sum"], [np.nansum(values[:, 0]), 0.0])
+    np.testing.assert_array_equal(statistics["first_pos"], [5, 1_001])
+    np.testing.assert_array_equal(statistics["last_pos"], [1_000, -1])
+    np.testing.assert_array_equal(statistics["first"], [values[5, 0], np.nan])
+    np.testing.assert_array_equal(statistics["last"], [values[-1, 0], np.nan])
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize(
+    "detector_class", [StdDevOutlierDetection, MADOutlierDetection]
+)
+@pytest.mark.parametrize("as_series", [True, False])
+def test_detector_backends(backend, detector_class, as_series):
+    """Tests that the workflows give the same results with all the backends."""
+    values = _load_data()
+    data = pd.Series(values) if as_series else values
+    with kernels.use_backend("numpy"):
+        expected = detector_class(data=data).run_workflow()
+
+    with kernels.use_backend(backend):
+        detector = detector_class(data=data).run_workflow()
+        assert detector.ul == pytest.approx(expected.ul)
+        assert detector.ll == pytest.approx(expected.ll)
+        assert type(detector.outlier) is type(expected.outlier)
+        np.testing.assert_array_equal(
+            np.asarray(detector.outlier), np.asarray(expected.outlier)
+        )
+        np.testing.assert_allclose(
+            np.asarray(detector.get_corrected_data()),
+            np.asarray(expected.get_corrected_data()),
+        )
+
+        out = np.empty_like(values)
+        detector = detector_class(data=data).run_workflow(out=out, packed=True)
+        np.testing.assert_array_equal(
+            np.unpackbits(detector.outlier)[: len(values)], np.asarray(expected.outlier)
+        )
+        np.testing.assert_allclose(out, np.asarray(expected.get_corrected_data()))
+
+        inplace = values.copy()
+        detector_class(data=inplace).run_workflow(inplace=True)
+        np.testing.assert_allclose(inplace, out)
+        with pytest.raises(ValueError):
+            detector_class(data=data).run_workflow(inplace=True, out=out)
+        with pytest.raises(ValueError):
+            detector_class(data=data).run_workflow(out=np.empty(len(values), dtype=int))
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_unsupported_detectors_backends(backend):
+    """Tests that per point limits and non float data use the staged path."""
+    data = pd.Series(_load_data())
+    with kernels.use_backend(backend):
+        detector = RollingStdDevOutlierDetection(data=data, window=50).run_workflow()
+        corrected = detector.get_corrected_data()
+        integer = StdDevOutlierDetection(data=pd.Series(np.arange(100) ** 2))
+        assert integer.run_workflow().get_corrected_data().dtype == np.int64
+    with kernels.use_backend("numpy"):
+        expected = RollingStdDevOutlierDetection(data=data, window=50).run_workflow()
+    pd.testing.assert_series_equal(corrected, expected.get_corrected_data())
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("strategy", ["last", "mean", "drift", "seasonal_last"])
+def test_naive_forecaster_backends(backend, strategy):
+    """Tests that the naive forecasts are the same with all the backends."""
+    index = pd.period_range(start="2017-01-01", periods=48, freq="M")
+    values = _load_data(1_001)[:96].reshape(48, 2)
+    values[-3:, 1] = np.nan
+    data = pd.DataFrame(values, index=index, columns=["a", "b"])
+
+    def forecast():
+        forecaster = NaiveForecaster(strategy=strategy, sp=12)
+        forecaster.fit(data["a"].iloc[:40]).update(data["a"].iloc[40:])
+        panel = PanelNaiveForecaster(strategy=strategy, sp=12).fit(data)
+        return forecaster.predict(fh=6), panel.predict(fh=6)
+
+    with kernels.use_backend("numpy"):
+        expected = forecast()
+    with kernels.use_backend(backend):
+        y_pred, y_panel = forecast()
+    pd.testing.assert_series_equal(y_pred, expected[0])
+    pd.testing.assert_frame_equal(y_panel, expected[1])
+
+
+def test_backend_selection(monkeypatch):
+    """Tests the runtime selection of the backend."""
+    assert kernels.get_backend() in kernels.available_backends()
+    with kernels.use_backend("numpy") as backend:
+        assert backend == "numpy"
+        assert not kernels.is_compiled()
+    with pytest.raises(ValueError):
+        kernels.set_backend("unknown")
+
+    # Requesting numba when it is not installed
+    monkeypatch.setitem(kernels._STATE, "numba", False)
+    monkeypatch.setattr(kernels, "_import_numba", _raise_import_error)
+    with kernels.use_backend("auto") as backend:
+        assert backend == "numpy"
+    with pytest.raises(ImportError):
+        kernels.set_backend("numba")
+
+
+def _raise_import_error():
+    raise ImportError("numba is not installed")
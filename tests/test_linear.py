@@ -0,0 +1,107 @@
+"""Module to test the linear additive forecaster and its component splitter
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ds_lib_template.forecasting.components.linear import LinearForecastingComponent
+from ds_lib_template.forecasting.components.panel import PanelComponentSplitter
+from ds_lib_template.forecasting.model.linear import LinearAdditiveForecaster
+
+
+def _load_data(n_obs: int = 60, fh: int = 6):
+    """Monthly series with a linear trend, a yearly seasonality, a driver and a
+    holiday effect, and the regressors over the training data and horizon."""
+    index = pd.period_range(start="2015-01-01", periods=n_obs + fh, freq="M")
+    rng = np.random.default_rng(42)
+    t = np.arange(n_obs + fh)
+    X = pd.DataFrame(
+        {"price": rng.normal(size=n_obs + fh), "xmas": (index.month == 12) * 1.0},
+        index=index,
+    )
+    components = pd.DataFrame(
+        {
+            "trend": 10 + 0.5 * t,
+            "seasonality": 3 * np.sin(2 * np.pi * t / 12),
+            "price": -2 * X["price"].to_numpy(),
+            "xmas": 5 * X["xmas"].to_numpy(),
+        },
+        index=index,
+    )
+    y = components.sum(axis=1) + rng.normal(scale=0.01, size=n_obs + fh)
+    return y[:n_obs], X[:n_obs], X[n_obs:], components[n_obs:]
+
+
+def test_linear_component_splitter():
+    """Tests that the components of the fitted model recover the true ones."""
+    y, X, X_future, expected = _load_data()
+    # A full set of harmonics would also explain the (yearly) holiday effect
+    model = LinearAdditiveForecaster(sp=12, n_harmonics=2).fit(y=y, X=X)
+    component_splitter = LinearForecastingComponent(
+        model=model, drivers=["price"], holidays=["xmas"]
+    )
+    y_pred, components = component_splitter.predict(fh=6, X=X_future)
+
+    pd.testing.assert_series_equal(y_pred, model.predict(fh=6, X=X_future))
+    assert np.allclose(y_pred, expected.sum(axis=1), atol=0.05)
+    assert list(components.columns) == ["trend", "seasonality", "price", "xmas"]
+    assert np.allclose(components, expected, atol=0.05)
+
+    # Regressors which are neither drivers nor holidays ----
+    component_splitter = LinearForecastingComponent(model=model, drivers=["price"])
+    _, components = component_splitter.predict(fh=6, X=X_future)
+    assert np.allclose(components["xmas"], expected["xmas"], atol=0.05)
+    assert np.allclose(components.sum(axis=1), y_pred)
+
+    #### The regressors are needed to predict ----
+    with pytest.raises(ValueError):
+        model.predict(fh=6)
+
+
+def test_linear_panel():
+    """Tests fitting many series at once (shared design matrix) against
+    fitting each series, including series with missing values."""
+    y, _, _, _ = _load_data()
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame(
+        {
+            f"sku_{i}": y * rng.uniform(0.5, 2) + rng.normal(size=len(y))
+            for i in range(6)
+        }
+    )
+    data.iloc[:5, 1] = np.nan
+    data.iloc[[7, 30], 4] = np.nan
+
+    model = LinearAdditiveForecaster(trend_degree=2, sp=12, n_harmonics=3)
+    y_pred = model.fit(y=data).predict(fh=6)
+    assert model.coef_.shape == (3 + 6, 6)
+    splitters = {}
+    for name in data.columns:
+        single = LinearAdditiveForecaster(trend_degree=2, sp=12, n_harmonics=3)
+        single.fit(y=data[name])
+        np.testing.assert_allclose(y_pred[name], single.predict(fh=6))
+        splitters[name] = LinearForecastingComponent(model=single)
+
+    # The component splitters are predicted in bulk ----
+    panel = PanelComponentSplitter(splitters).predict(fh=6)
+    np.testing.assert_allclose(panel.y_pred, y_pred.to_numpy().T)
+    for name, splitter in splitters.items():
+        _, components = splitter.predict(fh=6)
+        np.testing.assert_allclose(panel.get_series(name)[1], components)
+
+
+def test_linear_panel_underdetermined():
+    """Tests that the series whose observations do not determine the
+    coefficients get NaN coefficients and forecasts."""
+    y, _, _, _ = _load_data()
+    data = pd.DataFrame({"full": y, "short": y, "empty": np.nan, "gap": y})
+    data.iloc[:-5, 1] = np.nan
+    # Only the observations of January and July: the sine terms are always 0
+    data.iloc[np.arange(len(data)) % 6 != 0, 3] = np.nan
+
+    model = LinearAdditiveForecaster(trend_degree=1, sp=12, n_harmonics=2)
+    y_pred = model.fit(y=data).predict(fh=3)
+    assert np.isfinite(model.coef_[:, 0]).all()
+    assert np.isnan(model.coef_[:, 1:]).all()
+    assert y_pred["full"].notna().all() and y_pred.iloc[:, 1:].isna().all().all()
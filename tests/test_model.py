@@ -1,10 +1,17 @@
 """Module to test modeling capability
 """
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import pandas as pd
 import pytest
 
 from ds_lib_template.forecasting.model.naive import NaiveForecaster
+from ds_lib_template.forecasting.model.panel import PanelNaiveForecaster
+from ds_lib_template.utils.cache import LRUCache
+
+strategies = ["last", "mean", "seasonal_last", "drift"]
 
 
 @pytest.mark.parametrize("strategy", ["last", "mean"])
@@ -22,3 +29,117 @@ def test_model(strategy):
         assert np.all(y_pred == data[-1])
     if strategy == "mean":
         assert np.all(y_pred == data.mean())
+
+
+def test_model_seasonal_last_and_drift():
+    """Tests the seasonal last and drift strategies."""
+    index = pd.period_range(start="2017-01-01", end="2017-12-01", freq="M")
+    data = pd.Series(np.arange(12) % 4 + np.arange(12), index=index)
+
+    forecaster = NaiveForecaster(strategy="seasonal_last", sp=4).fit(y=data)
+    y_pred = forecaster.predict(fh=6)
+    assert np.all(y_pred.to_numpy() == data.to_numpy()[[8, 9, 10, 11, 8, 9]])
+    assert y_pred.index[0] == pd.Period("2018-01", freq="M")
+
+    forecaster = NaiveForecaster(strategy="drift").fit(y=data)
+    slope = (data.iloc[-1] - data.iloc[0]) / 11
+    expected = data.iloc[-1] + slope * np.arange(1, 4)
+    assert np.allclose(forecaster.predict(fh=3), expected)
+
+
+@pytest.mark.parametrize("strategy", strategies)
+def test_panel_model(strategy):
+    """Tests that the panel forecaster matches the single series forecaster."""
+    index = pd.period_range(start="2017-01-01", end="2017-12-01", freq="M")
+    rng = np.random.default_rng(42)
+    data = pd.DataFrame(rng.normal(size=(12, 5)), index=index).add_prefix("sku_")
+
+    forecaster = PanelNaiveForecaster(strategy=strategy, sp=3).fit(y=data)
+    y_pred = forecaster.predict(fh=5)
+
+    assert y_pred.shape == (5, 5)
+    assert y_pred.columns.equals(data.columns)
+    for name in data.columns:
+        single = NaiveForecaster(strategy=strategy, sp=3).fit(y=data[name])
+        expected = single.predict(fh=5)
+        assert y_pred.index.equals(expected.index)
+        assert np.allclose(y_pred[name], expected)
+
+    # Long data gives the same forecasts ----
+    long_data = data.rename_axis("month").melt(ignore_index=False).reset_index()
+    forecaster = PanelNaiveForecaster(strategy=strategy, sp=3).fit_long(
+        long_data, group_col="variable", value_col="value", index_col="month"
+    )
+    assert np.allclose(forecaster.predict(fh=5), y_pred)
+
+
+def test_future_index_cache():
+    """Tests that the future indexes are cached and shared across forecasters."""
+    NaiveForecaster.clear_future_index_cache()
+    index = pd.period_range(start="2017-01-01", end="2017-12-01", freq="M")
+    data = pd.Series(np.arange(12), index=index)
+
+    y_pred = NaiveForecaster().fit(y=data).predict(fh=5)
+    other = NaiveForecaster(strategy="mean").fit(y=data).predict(fh=5)
+    assert other.index is y_pred.index
+    assert NaiveForecaster._future_index_cache.hits == 1
+
+    # Another horizon or frequency gives another index ----
+    assert len(NaiveForecaster().fit(y=data).predict(fh=3)) == 3
+    daily = pd.Series(np.arange(12), index=pd.period_range("2017-01-01", periods=12))
+    assert NaiveForecaster().fit(y=daily).predict(fh=5).index.freqstr == "D"
+    assert len(NaiveForecaster._future_index_cache) == 3
+    NaiveForecaster.clear_future_index_cache()
+
+
+def test_lru_cache_threads():
+    """Tests concurrent lookups and evictions of a shared cache."""
+    cache = LRUCache(maxsize=4)
+
+    def use(worker: int):
+        for i in range(20_000):
+            key = (worker + i) % 8
+            if cache.get(key) is None:
+                cache.put(key, key)
+
+    # Frequent thread switches, to interleave the lookups and evictions
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(4) as executor:
+            list(executor.map(use, range(4)))
+    finally:
+        sys.setswitchinterval(interval)
+    assert len(cache) == 4
+    assert cache.hits + cache.misses == 80_000
+
+
+@pytest.mark.parametrize("strategy", strategies)
+def test_model_update(strategy):
+    """Tests that updating a forecaster gives the same forecasts as fitting it
+    on the full history, with and without storing the history."""
+    index = pd.period_range(start="2017-01-01", end="2018-12-01", freq="M")
+    rng = np.random.default_rng(42)
+    data = pd.DataFrame(rng.normal(size=(24, 4)), index=index).add_prefix("sku_")
+    data.iloc[:14, 0] = np.nan
+    data.iloc[20:, 1] = np.nan
+
+    for name in data.columns:
+        expected = NaiveForecaster(strategy=strategy, sp=3).fit(y=data[name])
+        forecaster = NaiveForecaster(strategy=strategy, sp=3, store_history=False)
+        forecaster.fit(y=data[name][:12])
+        forecaster.update(data[name][12:18]).update(data[name][18:])
+        assert forecaster._y is None
+        pd.testing.assert_series_equal(
+            forecaster.predict(fh=5), expected.predict(fh=5)
+        )
+
+    expected = PanelNaiveForecaster(strategy=strategy, sp=3).fit(y=data)
+    forecaster = PanelNaiveForecaster(strategy=strategy, sp=3).fit(y=data[:12])
+    forecaster.update(data[12:])
+    assert forecaster._y.equals(data)
+    pd.testing.assert_frame_equal(forecaster.predict(fh=5), expected.predict(fh=5))
+
+    #### The new data must follow the training data ----
+    with pytest.raises(ValueError):
+        forecaster.update(data[-1:])
@@ -0,0 +1,79 @@
+"""Module to test the model store functionality
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from ds_lib_template.forecasting.model.naive import STRATEGIES, NaiveForecaster
+from ds_lib_template.forecasting.model.panel import PanelNaiveForecaster
+from ds_lib_template.forecasting.model.store import ModelStore, save_models
+
+
+def _fit_models():
+    """Fits naive forecasters with all the strategies on monthly and daily
+    series (with missing values)."""
+    rng = np.random.default_rng(42)
+    models = {}
+    for i in range(20):
+        freq = "M" if i % 2 else "D"
+        index = pd.period_range(start="2017-01-01", periods=15 + i, freq=freq)
+        data = pd.Series(rng.normal(size=len(index)), index=index)
+        data[rng.random(len(data)) < 0.2] = np.nan
+        strategy = STRATEGIES[i % len(STRATEGIES)]
+        models[f"sku_{i}"] = NaiveForecaster(strategy=strategy, sp=1 + i % 5).fit(
+            y=data
+        )
+    return models
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_model_store(mmap, tmp_path):
+    """Tests that the stored models give the same forecasts as the original
+    models."""
+    models = _fit_models()
+    save_models(models, tmp_path / "store")
+    store = ModelStore(tmp_path / "store", mmap=mmap)
+
+    assert len(store) == len(models)
+    assert list(store) == list(models)
+    assert "sku_3" in store and "sku_99" not in store
+
+    loaded = store.load()
+    for series_id, model in models.items():
+        pd.testing.assert_series_equal(
+            loaded[series_id].predict(fh=7), model.predict(fh=7)
+        )
+        assert loaded[series_id]._y is None
+
+    # Models can be read one at a time and updated ----
+    model = store["sku_5"]
+    assert model.strategy == models["sku_5"].strategy
+    new_index = pd.period_range(start=model._cutoff + 1, periods=3)
+    model.update(pd.Series([1.0, 2.0, 3.0], index=new_index))
+    assert model.predict(fh=1).index[0] == new_index[-1] + 1
+    with pytest.raises(KeyError):
+        store["sku_99"]
+
+    #### Only fitted naive forecasters with a period index can be stored ----
+    index = pd.period_range(start="2017-01-01", periods=5)
+    with pytest.raises(TypeError):
+        panel = PanelNaiveForecaster().fit(y=pd.DataFrame({"a": range(5)}, index=index))
+        save_models({"a": panel}, tmp_path / "other")
+
+
+def test_model_store_ids(tmp_path):
+    """Tests that non string series ids are read back with the same type."""
+    models = list(_fit_models().values())
+    ids = [np.int64(7), 3, ("store_1", np.int32(2)), (("a", 1), 2.5), None]
+    save_models(dict(zip(ids, models)), tmp_path / "store")
+    store = ModelStore(tmp_path / "store")
+
+    assert store.ids == [7, 3, ("store_1", 2), (("a", 1), 2.5), None]
+    assert type(store.ids[0]) is int and type(store.ids[2]) is tuple
+    assert np.int64(7) in store and ("store_1", 2) in store
+    pd.testing.assert_series_equal(
+        store[("store_1", 2)].predict(fh=3), models[2].predict(fh=3)
+    )
+
+    with pytest.raises(TypeError):
+        save_models({pd.Timestamp("2017-01-01"): models[0]}, tmp_path / "other")
@@ -1,5 +1,6 @@
 """Module to test outlier detection functionality
 """
+import numpy as np
 import pytest
 from pandas.testing import assert_series_equal
 
@@ -57,7 +58,7 @@ def test_deviation(detector_class, data):
         assert outlier_detector.deviation == data.std()
     elif isinstance(outlier_detector, MADOutlierDetection):
         assert outlier_detector.center == data.median()
-        assert outlier_detector.deviation == data.mad()
+        assert outlier_detector.deviation == (data - data.median()).abs().median()
 
     # Test points that are not outliers ----
     for i in range(len(data) - 1):
@@ -65,3 +66,29 @@ def test_deviation(detector_class, data):
 
     # Test outlier ----
     assert corrected.iloc[-1] != data.iloc[-1]
+
+
+@pytest.mark.parametrize("detector_class", deviation_classes)
+@pytest.mark.parametrize("data", datasets)
+def test_correct_outliers_into_buffer(detector_class, data):
+    """Tests correcting outliers into a caller provided buffer / in place."""
+    expected = detector_class(data=data).run_workflow()
+    expected_corrected = expected.get_corrected_data().astype(float)
+
+    # Caller provided buffer and packed outlier mask ----
+    out = np.empty(len(data))
+    outlier_detector = detector_class(data=data).run_workflow(out=out, packed=True)
+    corrected = outlier_detector.get_corrected_data()
+    assert np.shares_memory(corrected.to_numpy(), out)
+    assert_series_equal(corrected, expected_corrected)
+    outliers = np.unpackbits(outlier_detector.outlier, count=len(data))
+    assert np.array_equal(outliers.astype(bool), expected.outlier.to_numpy())
+
+    # In place correction ----
+    float_data = data.astype(float)
+    detector_class(data=float_data).run_workflow(inplace=True)
+    assert_series_equal(float_data, expected_corrected)
+
+    #### Integer data can not hold the corrected values ----
+    with pytest.raises(ValueError):
+        detector_class(data=data).run_workflow(inplace=True)
@@ -0,0 +1,157 @@
+"""Module to test the statistics cache of the deviation based detectors
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_series_equal
+
+from ds_lib_template.outlier.cache import StatisticsCache, fingerprint
+from ds_lib_template.outlier.chunked import ChunkedMADOutlierDetection
+from ds_lib_template.outlier.deviation import BaseDeviationDetection
+from ds_lib_template.outlier.panel import StdDevPanelOutlierDetection
+from ds_lib_template.outlier.rolling import RollingMADOutlierDetection
+from ds_lib_template.outlier.streaming import StreamingStdDevOutlierDetection
+
+from .utils import _load_deviation_classes, _load_ll_ul_outlier_data
+
+deviation_classes = _load_deviation_classes()
+datasets = _load_ll_ul_outlier_data()
+
+
+@pytest.fixture(name="statistics_cache")
+def statistics_cache():
+    """Sets a statistics cache for the duration of a test."""
+    cache = StatisticsCache(maxsize=4)
+    BaseDeviationDetection.set_statistics_cache(cache)
+    yield cache
+    BaseDeviationDetection.set_statistics_cache(None)
+
+
+def test_fingerprint():
+    """Tests that the fingerprint only depends on the data content."""
+    data = datasets[0]
+    assert fingerprint(data) == fingerprint(data.copy())
+    assert fingerprint(data) == fingerprint(data.set_axis(data.index + 1))
+    assert fingerprint(data) != fingerprint(datasets[1])
+    assert fingerprint(data) != fingerprint(data.astype(float))
+    assert fingerprint(pd.Series(["a", "b"])) == fingerprint(pd.Series(["a", "b"]))
+    assert fingerprint("data.npy") is None
+
+
+@pytest.mark.parametrize("deviation_class", deviation_classes)
+@pytest.mark.parametrize("data", datasets)
+def test_statistics_cache(statistics_cache, deviation_class, data):
+    """Tests that cached statistics give the same results as computed ones."""
+    expected = deviation_class(data=data, multiplier=2).run_workflow()
+    assert statistics_cache.misses == 1 and len(statistics_cache) == 1
+
+    detector = deviation_class(data=data.copy(), multiplier=2).run_workflow()
+    assert statistics_cache.hits == 1
+    assert detector.center == expected.center
+    assert detector.deviation == expected.deviation
+    assert_series_equal(detector.get_corrected_data(), expected.get_corrected_data())
+
+    # Different data or detector type
+    deviation_class(data=data * 2).run_workflow()
+    assert statistics_cache.misses == 2
+
+
+def test_statistics_cache_disk(tmp_path):
+    """Tests that the statistics are persisted across cache instances."""
+    data = pd.DataFrame({"A": datasets[0], "B": datasets[1]})
+    cache = StatisticsCache(path=tmp_path)
+    StdDevPanelOutlierDetection.set_statistics_cache(cache)
+    try:
+        expected = StdDevPanelOutlierDetection(data=data).run_workflow()
+        StdDevPanelOutlierDetection.set_statistics_cache(
+            StatisticsCache(path=tmp_path)
+        )
+        detector = StdDevPanelOutlierDetection(data=data).run_workflow()
+        assert StdDevPanelOutlierDetection.statistics_cache.hits == 1
+    finally:
+        del StdDevPanelOutlierDetection.statistics_cache
+    assert BaseDeviationDetection.statistics_cache is None
+    assert_series_equal(detector.center, expected.center)
+    assert_series_equal(detector.ul, expected.ul)
+
+    cache.clear()
+    assert not list(tmp_path.glob("*.npy"))
+
+
+def test_statistics_cache_params(statistics_cache):
+    """Tests that the statistics of different parameters are cached apart and
+    that running statistics are not cached."""
+    data = pd.Series(np.random.default_rng(42).normal(size=50))
+    RollingMADOutlierDetection(data=data, window=10).run_workflow()
+    detector = RollingMADOutlierDetection(data=data, window=20).run_workflow()
+    expected = RollingMADOutlierDetection(data=data, window=20)
+    expected.statistics_cache = None
+    expected.run_workflow()
+    assert statistics_cache.misses == 2
+    assert_series_equal(detector.ll, expected.ll)
+
+    StreamingStdDevOutlierDetection(data=data).set_limits()
+    assert len(statistics_cache) == 2
+
+
+def test_statistics_cache_chunked(statistics_cache):
+    """Tests that the chunked detectors of different configurations sharing a
+    cache do not reuse each other's statistics."""
+    data = np.random.default_rng(42).normal(size=10_000)
+    approximate = ChunkedMADOutlierDetection(
+        data, chunksize=1_000, median_method="tdigest", compression=20
+    ).set_limits()
+    detector = ChunkedMADOutlierDetection(data, chunksize=1_000).set_limits()
+    assert statistics_cache.misses == 2
+    assert detector.center == np.median(data)
+    assert detector.center != approximate.center
+
+    ChunkedMADOutlierDetection(data, chunksize=1_000).set_limits()
+    assert statistics_cache.hits == 1
+
+
+@pytest.mark.parametrize("deviation_class", deviation_classes)
+def test_sweep(statistics_cache, deviation_class):
+    """Tests that a sweep gives the same results as separate runs."""
+    data = datasets[0]
+    detector = deviation_class(data=data, multiplier=3)
+    corrected = detector.sweep(multipliers=[1, 2.5, 3])
+    assert list(corrected) == [1, 2.5, 3]
+    for multiplier, values in corrected.items():
+        expected = deviation_class(data=data, multiplier=multiplier).run_workflow()
+        assert_series_equal(values, expected.get_corrected_data())
+    # The statistics were computed once
+    assert statistics_cache.misses == 1
+    assert detector.multiplier == 3
+    assert detector.ul is None
+    assert detector.corrected is None
+
+    # The state of a detector which already ran is kept
+    detector.run_workflow()
+    ul, corrected = detector.ul, detector.get_corrected_data()
+    detector.sweep(multipliers=[1])
+    assert detector.multiplier == 3 and detector.ul == ul
+    assert detector.get_corrected_data() is corrected
+
+
+def test_sweep_chunked(statistics_cache, tmp_path):
+    """Tests that a chunked sweep writes the corrected data of each multiplier
+    to its own output."""
+    data = np.random.default_rng(42).standard_t(df=3, size=10_000)
+    detector = ChunkedMADOutlierDetection(data, chunksize=1_000)
+    out = {1: np.empty_like(data), 2.5: str(tmp_path / "corrected.npy")}
+    corrected = detector.sweep(multipliers=[1, 2.5], out=out)
+    assert corrected == out
+    for multiplier, target in [(1, out[1]), (2.5, np.load(out[2.5]))]:
+        expected = ChunkedMADOutlierDetection(
+            data, multiplier=multiplier, chunksize=1_000
+        ).run_workflow(out=np.empty_like(data))
+        np.testing.assert_array_equal(target, expected.get_corrected_data())
+    assert statistics_cache.misses == 1
+    assert detector.multiplier == 3 and detector.ul is None
+    assert detector.corrected is None and detector.n_outliers is None
+
+    with pytest.raises(ValueError):
+        detector.sweep(multipliers=[1, 2])
+    with pytest.raises(ValueError):
+        detector.sweep(multipliers=[1, 2], out={1: np.empty_like(data)})
@@ -0,0 +1,102 @@
+"""Module to test out-of-core outlier detection functionality
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from ds_lib_template.outlier.chunked import (
+    ChunkedMADOutlierDetection,
+    ChunkedStdDevOutlierDetection,
+)
+from ds_lib_template.outlier.deviation import (
+    MADOutlierDetection,
+    StdDevOutlierDetection,
+)
+
+from .utils import _load_ll_ul_outlier_data
+
+chunked_classes = [
+    (ChunkedStdDevOutlierDetection, StdDevOutlierDetection),
+    (ChunkedMADOutlierDetection, MADOutlierDetection),
+]
+datasets = _load_ll_ul_outlier_data()
+
+
+def _write(data: pd.Series, path) -> str:
+    """Writes the data to a file of the type given by the path extension."""
+    path = str(path)
+    if path.endswith(".npy"):
+        np.save(path, data.to_numpy(dtype=float))
+    elif path.endswith(".csv"):
+        data.rename("value").to_csv(path, index=False)
+    else:
+        data.rename("value").to_frame().to_parquet(path, index=False)
+    return path
+
+
+def _read(path) -> np.ndarray:
+    """Reads back data written by the chunked detectors."""
+    path = str(path)
+    if path.endswith(".npy"):
+        return np.load(path)
+    if path.endswith(".csv"):
+        return pd.read_csv(path)["value"].to_numpy()
+    return pd.read_parquet(path)["value"].to_numpy()
+
+
+@pytest.mark.parametrize("chunked_class, single_class", chunked_classes)
+@pytest.mark.parametrize("data", datasets)
+@pytest.mark.parametrize("extension", [".npy", ".csv", ".parquet"])
+def test_chunked_matches_in_memory(
+    chunked_class, single_class, data, extension, tmp_path
+):
+    """Tests that the out-of-core detectors give the same results as the in
+    memory detectors, using chunks smaller than the data."""
+    if extension == ".parquet":
+        pytest.importorskip("pyarrow")
+    source = _write(data, tmp_path / f"data{extension}")
+    target = str(tmp_path / f"corrected{extension}")
+
+    expected = single_class(data=data).run_workflow()
+    outlier_detector = chunked_class(data=source, chunksize=3)
+    outlier_detector.run_workflow(out=target, packed=True)
+
+    assert np.isclose(outlier_detector.center, expected.center)
+    assert np.isclose(outlier_detector.deviation, expected.deviation)
+    np.testing.assert_allclose(_read(target), expected.get_corrected_data())
+
+    # Outliers are counted and their mask can be stored packed ----
+    assert outlier_detector.n_outliers == expected.outlier.sum()
+    outliers = np.unpackbits(outlier_detector.outlier, count=len(data))
+    np.testing.assert_array_equal(outliers.astype(bool), expected.outlier)
+
+
+def test_chunked_inplace(tmp_path):
+    """Tests correcting a memory-mapped `.npy` file in place."""
+    data = datasets[0]
+    source = _write(data, tmp_path / "data.npy")
+    expected = StdDevOutlierDetection(data=data).run_workflow()
+
+    ChunkedStdDevOutlierDetection(data=source, chunksize=4).run_workflow(
+        inplace=True
+    )
+    np.testing.assert_allclose(np.load(source), expected.get_corrected_data())
+
+    #### An output (or in place correction) is required ----
+    with pytest.raises(ValueError):
+        ChunkedStdDevOutlierDetection(data=source).run_workflow()
+
+
+def test_chunked_median_methods():
+    """Tests the exact and approximate (t-digest) median with missing values."""
+    rng = np.random.default_rng(42)
+    data = rng.normal(size=20_001)
+    data[rng.random(len(data)) < 0.01] = np.nan
+
+    exact = ChunkedMADOutlierDetection(data=data, chunksize=1_000).set_center()
+    assert exact.center == np.nanmedian(data)
+
+    approximate = ChunkedMADOutlierDetection(
+        data=data, chunksize=1_000, median_method="tdigest"
+    ).set_center()
+    assert abs(approximate.center - np.nanmedian(data)) < 0.01
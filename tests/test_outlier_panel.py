@@ -0,0 +1,83 @@
+"""Module to test batched (panel) outlier detection functionality
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.testing import assert_series_equal
+
+from .utils import _load_ll_ul_outlier_data, _load_panel_deviation_classes
+
+panel_classes = _load_panel_deviation_classes()
+
+
+@pytest.fixture(name="panel_data")
+def panel_data(no_outlier_data):
+    """Wide data containing series of unequal lengths (padded with NaN)."""
+    series = [no_outlier_data, *_load_ll_ul_outlier_data(), pd.Series([5.0])]
+    return pd.concat(series, axis=1, keys=["none", "upper", "lower", "single"])
+
+
+@pytest.mark.parametrize("panel_class, single_class", panel_classes)
+def test_panel_matches_single_series(panel_class, single_class, panel_data):
+    """Tests that the panel detectors give the same per-series results as the
+    single series detectors."""
+    panel_detector = panel_class(data=panel_data).run_workflow()
+    corrected = panel_detector.get_corrected_data()
+
+    assert corrected.shape == panel_data.shape
+    for name in panel_data.columns:
+        data = panel_data[name].dropna()
+        single_detector = single_class(data=data).run_workflow()
+
+        assert np.isclose(
+            panel_detector.center[name], single_detector.center, equal_nan=True
+        )
+        assert np.isclose(
+            panel_detector.deviation[name], single_detector.deviation, equal_nan=True
+        )
+        assert_series_equal(
+            corrected[name].dropna(),
+            single_detector.get_corrected_data().astype(float),
+            check_names=False,
+        )
+        assert panel_detector.outlier[name].sum() == single_detector.outlier.sum()
+
+
+@pytest.mark.parametrize("panel_class, single_class", panel_classes)
+def test_panel_from_long(panel_class, single_class, panel_data):
+    """Tests creating the panel detectors from a long DataFrame."""
+    long_data = (
+        panel_data.rename_axis("time")
+        .melt(ignore_index=False, var_name="sku", value_name="sales")
+        .dropna()
+        .reset_index()
+        .sample(frac=1, random_state=42)
+    )
+    detector = panel_class.from_long(
+        long_data, group_col="sku", value_col="sales", index_col="time"
+    ).run_workflow()
+    expected = panel_class(data=panel_data).run_workflow().get_corrected_data()
+
+    corrected = detector.get_corrected_long()
+    assert corrected.index.equals(long_data.index)
+    for row, value in zip(long_data.itertuples(), corrected):
+        assert value == expected.loc[row.time, row.sku]
+
+    # Without a time column, position within the group is used ----
+    detector = panel_class.from_long(
+        long_data.sort_values("time"), group_col="sku", value_col="sales"
+    ).run_workflow()
+    assert_series_equal(
+        detector.get_corrected_long().sort_index(),
+        corrected.sort_index(),
+    )
+
+    # Duplicate observations are not allowed ----
+    with pytest.raises(ValueError):
+        panel_class.from_long(
+            pd.concat([long_data, long_data]),
+            group_col="sku",
+            value_col="sales",
+            index_col="time",
+        )
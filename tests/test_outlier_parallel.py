@@ -0,0 +1,53 @@
+"""Module to test parallel outlier detection functionality
+"""
+import pandas as pd
+import pytest
+from pandas.testing import assert_series_equal
+
+from ds_lib_template.outlier.parallel import run_workflow_parallel
+
+from .utils import _load_deviation_classes, _load_ll_ul_outlier_data
+
+deviation_classes = _load_deviation_classes()
+
+
+@pytest.mark.parametrize("detector_class", deviation_classes)
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_parallel_series(detector_class, n_jobs, no_outlier_data):
+    """Tests running the workflow on an iterable of series."""
+    series = [no_outlier_data, *_load_ll_ul_outlier_data()] * 3
+    series = [s.rename(f"series_{i}") for i, s in enumerate(series)]
+
+    results = run_workflow_parallel(
+        iter(series), detector_class, n_jobs=n_jobs, batch_size=2, multiplier=2
+    )
+
+    # Results are returned in input order ----
+    assert len(results) == len(series)
+    for result, data in zip(results, series):
+        expected = detector_class(data=data, multiplier=2).run_workflow()
+        assert_series_equal(result, expected.get_corrected_data().astype(float))
+
+
+@pytest.mark.parametrize("detector_class", deviation_classes)
+def test_parallel_grouped(detector_class):
+    """Tests running the workflow on a grouped DataFrame."""
+    series = _load_ll_ul_outlier_data()
+    data = pd.concat(
+        [s.to_frame("sales").assign(sku=sku) for sku, s in zip("BA", series)],
+        ignore_index=True,
+    ).sample(frac=1, random_state=42)
+
+    result = run_workflow_parallel(
+        data.groupby("sku"), detector_class, n_jobs=2, column="sales"
+    )
+    assert result.index.equals(data.index)
+    for sku, group in data.groupby("sku"):
+        expected = detector_class(data=group["sales"]).run_workflow()
+        assert_series_equal(
+            result[group.index], expected.get_corrected_data().astype(float)
+        )
+
+    #### Value column is required for grouped DataFrames ----
+    with pytest.raises(ValueError):
+        run_workflow_parallel(data.groupby("sku"), detector_class)
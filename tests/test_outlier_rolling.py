@@ -0,0 +1,89 @@
+"""Module to test rolling window outlier detection functionality
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from ds_lib_template.outlier.deviation import StdDevOutlierDetection
+from ds_lib_template.outlier.rolling import (
+    RollingMADOutlierDetection,
+    RollingStdDevOutlierDetection,
+)
+from ds_lib_template.outlier.window import rolling_mean_std, rolling_median_mad
+
+rolling_classes = [RollingStdDevOutlierDetection, RollingMADOutlierDetection]
+
+
+def _exact_mad(window: np.ndarray) -> float:
+    """Median absolute deviation of the non missing values in the window."""
+    window = window[~np.isnan(window)]
+    return np.median(np.abs(window - np.median(window)))
+
+
+@pytest.mark.parametrize("window", [None, 1, 4, 7])
+@pytest.mark.parametrize("min_periods", [1, 3])
+def test_window_kernels(window, min_periods):
+    """Tests the window kernels against pandas rolling / expanding windows."""
+    rng = np.random.default_rng(42)
+    data = pd.Series(rng.integers(0, 10, size=50).astype(float))
+    data[rng.random(len(data)) < 0.1] = np.nan
+    if window is None:
+        windows = data.expanding(min_periods=min_periods)
+    else:
+        windows = data.rolling(window, min_periods=min(min_periods, window))
+        min_periods = min(min_periods, window)
+
+    mean, std = rolling_mean_std(data.to_numpy(), window, min_periods)
+    np.testing.assert_allclose(mean, windows.mean())
+    np.testing.assert_allclose(std, windows.std(), atol=1e-9)
+
+    median, mad = rolling_median_mad(data.to_numpy(), window, min_periods)
+    np.testing.assert_allclose(median, windows.median())
+    np.testing.assert_allclose(mad, windows.apply(_exact_mad, raw=True))
+
+
+@pytest.mark.parametrize("window", [None, 1, 50])
+def test_rolling_std_level_shift(window):
+    """Tests that the rolling standard deviation stays accurate after a level
+    shift and along a strong drift (precision of the sums of squares)."""
+    rng = np.random.default_rng(42)
+    length = 200_000
+    shifted = rng.normal(size=length)
+    shifted[length // 2 :] += 1e6
+    drifting = np.cumsum(np.full(length, 10.0)) + rng.normal(size=length)
+    for values in (shifted, drifting):
+        windows = (
+            pd.Series(values).expanding()
+            if window is None
+            else pd.Series(values).rolling(window, min_periods=1)
+        )
+        mean, std = rolling_mean_std(values, window, min_periods=1)
+        np.testing.assert_allclose(mean, windows.mean(), rtol=1e-9, atol=1e-6)
+        np.testing.assert_allclose(std, windows.std(), rtol=1e-3, atol=1e-6)
+
+    detector = RollingStdDevOutlierDetection(data=pd.Series(shifted), window=50)
+    # About 0.3% of normal points are beyond 3 (sample) standard deviations
+    assert detector.run_workflow().outlier.mean() < 0.01
+
+
+@pytest.mark.parametrize("detector_class", rolling_classes)
+def test_rolling_drifting_series(detector_class):
+    """Tests that a local outlier in a drifting series is caught by the rolling
+    detectors even though it is within the global limits."""
+    data = pd.Series(np.arange(100, dtype=float) + np.tile([0.0, 0.5], 50))
+    data[50] = 80.0
+
+    global_detector = StdDevOutlierDetection(data=data).run_workflow()
+    assert not global_detector.outlier.any()
+
+    outlier_detector = detector_class(data=data, window=30)
+    corrected = outlier_detector.run_workflow().get_corrected_data()
+
+    # Limits are per timestamp and missing until the window is full ----
+    assert outlier_detector.ul.index.equals(data.index)
+    assert outlier_detector.ul.iloc[:29].isna().all()
+
+    # Only the local outlier is flagged and corrected ----
+    assert list(outlier_detector.outlier[outlier_detector.outlier].index) == [50]
+    assert corrected[50] == outlier_detector.ul[50]
+    assert (corrected.drop(50) == data.drop(50)).all()
@@ -0,0 +1,61 @@
+"""Module to test streaming outlier detection functionality
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from ds_lib_template.outlier.streaming import (
+    StreamingMADOutlierDetection,
+    StreamingStdDevOutlierDetection,
+)
+
+from .utils import _load_ll_ul_outlier_data
+
+streaming_classes = [StreamingStdDevOutlierDetection, StreamingMADOutlierDetection]
+datasets = _load_ll_ul_outlier_data()
+
+
+@pytest.mark.parametrize("detector_class", streaming_classes)
+@pytest.mark.parametrize("data", datasets)
+def test_streaming(detector_class, data):
+    """Tests the streaming detectors with both positive and negative outliers."""
+    outlier_detector = detector_class()
+    outliers, corrected = outlier_detector.update_batch(data.to_numpy())
+
+    # General checks ----
+    assert len(corrected) == len(data)
+    assert outlier_detector.n_seen == len(data)
+
+    # Test points that are not outliers ----
+    assert not outliers[:-1].any()
+    np.testing.assert_array_equal(corrected[:-1], data.to_numpy()[:-1])
+
+    # Test outlier ----
+    assert outliers[-1]
+    assert corrected[-1] != data.iloc[-1]
+
+
+def test_streaming_std_dev_matches_batch(no_outlier_data):
+    """Tests that the running statistics match the batch statistics."""
+    outlier_detector = StreamingStdDevOutlierDetection(data=no_outlier_data)
+    corrected = outlier_detector.run_workflow().get_corrected_data()
+
+    assert np.isclose(outlier_detector.center, no_outlier_data.mean())
+    assert np.isclose(outlier_detector.deviation, no_outlier_data.std())
+    assert np.all(corrected == no_outlier_data)
+
+
+def test_streaming_mad_approximation():
+    """Tests that the running median / MAD estimates are close to exact ones."""
+    data = pd.Series(np.random.default_rng(42).normal(size=10_000))
+    outlier_detector = StreamingMADOutlierDetection(data=data)
+    outlier_detector.set_center().set_deviation()
+
+    exact_mad = (data - data.median()).abs().median()
+    assert abs(outlier_detector.center - data.median()) < 0.05
+    assert abs(outlier_detector.deviation - exact_mad) < 0.05
+
+    # Missing values are neither flagged nor learnt from ----
+    outlier, corrected = outlier_detector.update(np.nan)
+    assert not outlier and np.isnan(corrected)
+    assert outlier_detector.n_seen == len(data)
@@ -0,0 +1,56 @@
+"""Module to test robust statistics functionality
+"""
+import warnings
+
+import numpy as np
+import pytest
+
+from ds_lib_template.outlier import robust
+
+
+def _load_arrays():
+    """Load 2-D arrays with and without missing values (incl. an all missing
+    column)."""
+    rng = np.random.default_rng(42)
+    complete = rng.normal(size=(25, 4))
+    missing = complete.copy()
+    missing[rng.random(missing.shape) < 0.2] = np.nan
+    missing[:, -1] = np.nan
+    return [complete, missing]
+
+
+@pytest.mark.parametrize("data", _load_arrays())
+@pytest.mark.parametrize("axis", [None, 0, 1])
+def test_selection_statistics(data, axis):
+    """Tests the partition based statistics against NumPy's NaN functions."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        expected_median = np.nanmedian(data, axis=axis)
+        expected_iqr = np.nanquantile(data, 0.75, axis=axis) - np.nanquantile(
+            data, 0.25, axis=axis
+        )
+        center = (
+            expected_median if axis is None else np.expand_dims(expected_median, axis)
+        )
+        expected_mad = np.nanmedian(np.abs(data - center), axis=axis)
+
+    np.testing.assert_allclose(robust.median(data, axis=axis), expected_median)
+    np.testing.assert_allclose(robust.iqr(data, axis=axis), expected_iqr)
+    np.testing.assert_allclose(
+        robust.median_abs_deviation(data, axis=axis), expected_mad
+    )
+
+
+@pytest.mark.parametrize("estimator", [robust.qn_scale, robust.sn_scale])
+def test_pairwise_scale_estimators(estimator):
+    """Tests that Qn / Sn estimate the standard deviation of normal data and
+    are not affected by a few outliers."""
+    data = np.random.default_rng(42).normal(scale=2, size=(3, 1_000))
+    scale = estimator(data, axis=1)
+    assert scale.shape == (3,)
+    assert np.all(np.abs(scale - 2) < 0.2)
+
+    contaminated = data[0].copy()
+    contaminated[:10] = 1e6
+    assert abs(estimator(contaminated) - scale[0]) < 0.2
+    assert np.isnan(estimator(np.array([1.0, np.nan])))
@@ -0,0 +1,151 @@
+"""Module to test change point segmentation functionality
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from ds_lib_template.forecasting.model.naive import NaiveForecaster
+from ds_lib_template.segmentation.cost import COSTS
+from ds_lib_template.segmentation.pelt import pelt, segment, segment_panel
+
+
+def _optimal_partitioning(values, cost, penalty, min_size):
+    """Reference (quadratic) optimal segmentation, without pruning."""
+    segment_cost = COSTS[cost](values)
+    n_obs = len(values)
+    optimal = np.full(n_obs + 1, np.inf)
+    optimal[0] = -penalty
+    last = np.zeros(n_obs + 1, dtype=int)
+    for t in range(min_size, n_obs + 1):
+        starts = np.array(
+            [s for s in range(t - min_size + 1) if s == 0 or s >= min_size]
+        )
+        costs = optimal[starts] + segment_cost.cost(starts, t) + penalty
+        optimal[t] = costs.min()
+        last[t] = starts[costs.argmin()]
+    breakpoints = [n_obs]
+    while last[breakpoints[-1]] > 0:
+        breakpoints.append(last[breakpoints[-1]])
+    return np.array(breakpoints[::-1])
+
+
+def _load_regimes() -> pd.Series:
+    """Monthly series with 3 regimes of different means."""
+    rng = np.random.default_rng(42)
+    values = np.concatenate(
+        [rng.normal(mean, 1.0, size=40) for mean in [0.0, 8.0, -4.0]]
+    )
+    index = pd.period_range(start="2000-01", periods=len(values), freq="M")
+    return pd.Series(values, index=index)
+
+
+@pytest.mark.parametrize("cost", list(COSTS))
+@pytest.mark.parametrize("min_size", [1, 2, 5])
+def test_pelt_is_exact(cost, min_size):
+    """Tests that pruning does not change the optimal segmentation."""
+    rng = np.random.default_rng(0)
+    for _ in range(10):
+        values = np.concatenate(
+            [
+                rng.normal(rng.normal(0, 3), rng.uniform(0.5, 2), rng.integers(5, 30))
+                for _ in range(4)
+            ]
+        )
+        values[rng.integers(0, len(values), 3)] = np.nan
+        penalty = COSTS[cost](values).default_penalty()
+        expected = _optimal_partitioning(values, cost, penalty, min_size)
+        breakpoints = pelt(values, cost=cost, min_size=min_size)
+        assert np.array_equal(breakpoints, expected)
+        assert np.all(np.diff(np.concatenate([[0], breakpoints])) >= min_size)
+
+
+def test_pelt_changes():
+    """Tests the detection of changes of the mean and of the variance."""
+    values = _load_regimes().to_numpy()
+    assert np.array_equal(pelt(values), [40, 80, 120])
+    # A large penalty gives a single segment
+    assert np.array_equal(pelt(values, penalty=1e6), [120])
+
+    rng = np.random.default_rng(0)
+    values = np.concatenate([rng.normal(0, 1, 100), rng.normal(0, 10, 100)])
+    breakpoints = pelt(values, cost="normal", min_size=5)
+    assert len(breakpoints) == 2
+    assert abs(breakpoints[0] - 100) <= 3
+
+    with pytest.raises(ValueError):
+        pelt(values, cost="unknown")
+    with pytest.raises(ValueError):
+        pelt(values, min_size=0)
+    assert np.array_equal(pelt(values[:3], min_size=2), [3])
+
+
+def test_segmentation():
+    """Tests the segments of a series and the per segment workflows."""
+    data = _load_regimes()
+    segmentation = segment(data)
+    assert len(segmentation) == 3
+    assert segmentation.get_bounds() == [(0, 40), (40, 80), (80, 120)]
+    assert list(segmentation.get_change_points()) == [data.index[40], data.index[80]]
+    assert segmentation.get_segment().equals(data.iloc[80:])
+    assert segmentation.get_labels().value_counts().to_dict() == {0: 40, 1: 40, 2: 40}
+    assert [len(s) for s in segmentation] == [40, 40, 40]
+
+    # Outliers are relative to the regime, not to the whole series
+    data_outlier = data.copy()
+    data_outlier.iloc[20] = 5.0
+    corrected = segment(data_outlier, penalty=50).run_workflow(multiplier=3)
+    assert corrected.index.equals(data.index)
+    assert corrected.iloc[20] < 5.0
+    assert np.allclose(corrected.iloc[40:], data.iloc[40:])
+
+    forecaster = NaiveForecaster(strategy="mean")
+    fitted = segmentation.fit_forecaster(forecaster)
+    y_pred = fitted.predict(fh=3)
+    assert np.allclose(y_pred, data.iloc[80:].mean())
+    assert forecaster is not fitted
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_segment_panel(n_jobs):
+    """Tests the segmentation of many series (of unequal length)."""
+    data = _load_regimes()
+    panel = pd.DataFrame(
+        {
+            "full": data,
+            "short": data.where(np.arange(len(data)) >= 40),
+            "constant": 1.0,
+        }
+    )
+    segmentations = segment_panel(panel, n_jobs=n_jobs, batch_size=1)
+
+    assert list(segmentations) == list(panel.columns)
+    assert np.array_equal(segmentations["full"].breakpoints, [40, 80, 120])
+    assert np.array_equal(segmentations["short"].breakpoints, [40, 80])
+    assert segmentations["short"].data.index[0] == data.index[40]
+    assert len(segmentations["constant"]) == 1
+
+
+def test_segment_panel_missing_values():
+    """Tests that only the padding of the series is removed, the missing
+    values within a series are kept as in `segment`."""
+    data = _load_regimes()
+    gaps = data.copy()
+    gaps.iloc[[10, 50, 51, 90]] = np.nan
+    panel = pd.DataFrame(
+        {
+            "gaps": gaps,
+            "padded": gaps.where(np.arange(len(data)) < 100),
+            "empty": np.nan,
+        }
+    )
+    segmentations = segment_panel(panel)
+
+    expected = segment(gaps)
+    assert segmentations["gaps"].data.equals(gaps)
+    assert np.array_equal(segmentations["gaps"].breakpoints, expected.breakpoints)
+    assert segmentations["gaps"].get_bounds() == [(0, 40), (40, 80), (80, 120)]
+    assert segmentations["padded"].data.equals(gaps.iloc[:100])
+    assert segmentations["padded"].get_change_points().equals(
+        expected.get_change_points()
+    )
+    assert segmentations["empty"].data.empty
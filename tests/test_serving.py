@@ -0,0 +1,106 @@
+"""Module to test prediction serving functionality
+"""
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ds_lib_template.forecasting.components.dummy import DummyForecastingComponent
+from ds_lib_template.forecasting.model.naive import STRATEGIES, NaiveForecaster
+from ds_lib_template.forecasting.serving import LocalClient, PredictionServer
+
+
+def _load_models():
+    """Fitted naive forecasters (all the strategies) and a component splitter."""
+    index = pd.period_range(start="2017-01-01", end="2017-12-01", freq="M")
+    rng = np.random.default_rng(42)
+    models = {}
+    for i in range(8):
+        data = pd.Series(rng.normal(size=12), index=index)
+        strategy = STRATEGIES[i % len(STRATEGIES)]
+        models[f"sku_{i}"] = NaiveForecaster(strategy=strategy, sp=3).fit(y=data)
+    models["components"] = DummyForecastingComponent(
+        model=models["sku_0"], drivers=["A", "B"]
+    )
+    return models
+
+
+def test_serving():
+    """Tests that concurrent requests are batched and give the same results as
+    calling the models directly."""
+    models = _load_models()
+    requests = [(f"sku_{i % 8}", 1 + i % 5) for i in range(40)] + [
+        ("components", 2),
+        ("components", 4),
+    ]
+
+    async def serve():
+        async with PredictionServer(models, max_wait=0.01) as server:
+            client = LocalClient(server)
+            results = await client.predict_many(requests)
+            with pytest.raises(KeyError):
+                await client.predict("unknown", fh=2)
+            return results, server.get_metrics()
+
+    results, metrics = asyncio.run(serve())
+    for (model_id, fh), result in zip(requests, results):
+        expected = models[model_id].predict(fh=fh)
+        if model_id == "components":
+            pd.testing.assert_series_equal(result[0], expected[0])
+            pd.testing.assert_frame_equal(result[1], expected[1])
+        else:
+            pd.testing.assert_series_equal(result, expected)
+
+    # Queue depth and latency metrics ----
+    assert metrics["n_requests"] == len(requests) + 1
+    assert metrics["n_batches"] < metrics["n_requests"]
+    assert metrics["max_queue_depth"] >= len(requests) - 1
+    assert metrics["queue_depth"] == 0
+    assert 0 < metrics["latency_p50"] <= metrics["latency_p99"]
+
+
+def test_serving_not_running():
+    """Tests that requests are only accepted by a running server."""
+    server = PredictionServer(_load_models())
+    with pytest.raises(RuntimeError):
+        asyncio.run(server.predict("sku_1", fh=2))
+
+
+def test_serving_bad_requests():
+    """Tests that the failing requests of a batch do not fail the others."""
+    models = _load_models()
+    # A corrupted naive forecaster fails when forecasted with the other ones
+    index = pd.period_range(start="2017-01-01", end="2017-12-01", freq="M")
+    models["broken"] = NaiveForecaster(strategy="seasonal_last", sp=3).fit(
+        y=pd.Series(np.arange(12.0), index=index)
+    )
+    models["broken"].sp = 6
+    requests = [
+        ("sku_0", 3),
+        ("sku_1", 0),
+        ("sku_1", 2),
+        ("sku_2", -1),
+        ("sku_3", "4"),
+        ("sku_4", 2.5),
+        ("broken", 5),
+        ("unknown", 2),
+        ("sku_5", 4),
+        ("components", 2),
+    ]
+
+    async def serve():
+        async with PredictionServer(models, max_wait=0.01) as server:
+            return await LocalClient(server).predict_many(
+                requests, return_exceptions=True
+            )
+
+    results = asyncio.run(serve())
+    for i in (1, 3, 4, 5):
+        assert isinstance(results[i], ValueError)
+    assert isinstance(results[6], IndexError)
+    assert isinstance(results[7], KeyError)
+    for i in (0, 2, 8):
+        model_id, fh = requests[i]
+        pd.testing.assert_series_equal(results[i], models[model_id].predict(fh=fh))
+    pd.testing.assert_frame_equal(results[9][1], models["components"].predict(fh=2)[1])
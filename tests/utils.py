@@ -4,6 +4,10 @@ from ds_lib_template.outlier.deviation import (
     MADOutlierDetection,
     StdDevOutlierDetection,
 )
+from ds_lib_template.outlier.panel import (
+    MADPanelOutlierDetection,
+    StdDevPanelOutlierDetection,
+)
 
 
 def _load_deviation_classes():
@@ -20,3 +24,12 @@ def _load_ll_ul_outlier_data():
         pd.Series([1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 1000]),
         pd.Series([1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, -1000]),
     ]
+
+
+def _load_panel_deviation_classes():
+    """Load the various panel deviation classes along with their single
+    series counterparts."""
+    return [
+        (StdDevPanelOutlierDetection, StdDevOutlierDetection),
+        (MADPanelOutlierDetection, MADOutlierDetection),
+    ]